@@ -0,0 +1,75 @@
+"""Compare reading a glob of daily csv files with FileDataSource using one
+process and using a process pool:
+
+    $ python benchmarks/bench_file_glob.py
+
+With enough CPUs, the pool should take about as long as parsing the
+slowest file (plus process startup) instead of the sum over all files.
+"""
+
+# Stdlib imports
+import os
+import tempfile
+from time import time
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from mllaunchpad.datasources import FileDataSource
+
+
+N_FILES = 30
+ROWS_PER_FILE = 100_000
+
+
+def write_files(directory):
+    rng = np.random.default_rng(42)
+    for day in range(1, N_FILES + 1):
+        pd.DataFrame(
+            {
+                "id": np.arange(ROWS_PER_FILE),
+                "score": rng.random(ROWS_PER_FILE),
+                "label": rng.choice(["a", "b", "c"], ROWS_PER_FILE),
+            }
+        ).to_csv(
+            os.path.join(directory, "2026-10-{:02d}.csv".format(day)),
+            index=False,
+        )
+
+
+def bench(directory, workers):
+    ds = FileDataSource(
+        "bench",
+        {
+            "type": "csv",
+            "path": os.path.join(directory, "2026-10-*.csv"),
+            "workers": workers,
+            "partition_column": "date",
+        },
+    )
+    start = time()
+    df = ds.get_dataframe()
+    assert len(df) == N_FILES * ROWS_PER_FILE
+    return time() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(directory)
+        print(
+            "Reading {} files of {} rows ({} CPUs):".format(
+                N_FILES, ROWS_PER_FILE, os.cpu_count()
+            )
+        )
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            print(
+                "  workers={:>2}: {:.2f} s".format(
+                    workers, bench(directory, workers)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare the speed of serializing typical prediction outputs to JSON using
+`json.dumps(to_plain_python_obj(obj))` (used for API responses up to now)
+and `to_json_bytes(obj)`, with and without orjson (if installed):
+
+    $ python benchmarks/bench_json_serialization.py
+"""
+
+# Stdlib imports
+import json
+import timeit
+from unittest import mock
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from mllaunchpad import resource
+from mllaunchpad.resource import to_json_bytes, to_plain_python_obj
+
+
+def make_examples():
+    rng = np.random.default_rng(42)
+    n_rows = 10_000
+    df = pd.DataFrame(
+        {
+            "id": np.arange(n_rows),
+            "score": rng.random(n_rows),
+            "label": rng.choice(["a", "b", "c"], n_rows),
+            "flag": rng.random(n_rows) > 0.5,
+        }
+    )
+    return {
+        "single prediction": {
+            "prediction": np.int64(1),
+            "probability": np.float32(0.87),
+            "classes": ["a", "b", "c"],
+        },
+        "DataFrame 10k rows": df,
+        "dict of arrays 10k rows": {c: df[c].to_numpy() for c in df.columns},
+        "list of 1k dicts": [
+            {"id": np.int64(i), "score": np.float32(s)}
+            for i, s in zip(range(1000), rng.random(1000))
+        ],
+    }
+
+
+def old_way(obj):
+    return json.dumps(to_plain_python_obj(obj)).encode("utf-8")
+
+
+def main():
+    with_orjson = resource._import_orjson() is not None
+    for name, obj in make_examples().items():
+        number = 10000 if name == "single prediction" else 10
+        times = {
+            "old": timeit.timeit(lambda: old_way(obj), number=number),
+        }
+        with mock.patch.object(resource, "_import_orjson", new=lambda: None):
+            times["json"] = timeit.timeit(
+                lambda: to_json_bytes(obj), number=number
+            )
+        if with_orjson:
+            times["orjson"] = timeit.timeit(
+                lambda: to_json_bytes(obj), number=number
+            )
+        print(
+            "{:25}".format(name),
+            "  ".join(
+                "{}: {:8.1f} µs ({:4.1f}x)".format(
+                    key, t / number * 1e6, times["old"] / t
+                )
+                for key, t in times.items()
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare size, save and load times of a model in the ModelStore using
+different serialization settings:
+
+    $ python benchmarks/bench_model_store.py
+
+Settings needing packages which are not installed (joblib, lz4,
+zstandard) are skipped.
+"""
+
+# Stdlib imports
+import tempfile
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from mllaunchpad.resource import ModelStore
+
+
+SETTINGS = [
+    ("dill", "none", False),
+    ("dill", "none", True),
+    ("dill", "zlib", False),
+    ("dill", "lz4", False),
+    ("dill", "zstd", False),
+    ("joblib", "none", False),
+    ("joblib", "zlib", False),
+    ("joblib", "lz4", False),
+]
+
+
+def make_model():
+    """Something like a model with embeddings and an encoding table"""
+    rng = np.random.default_rng(42)
+    return {
+        "embeddings": rng.normal(size=(200_000, 100)).astype(np.float32),
+        "vocabulary": pd.DataFrame(
+            {
+                "token_id": np.arange(1_000_000),
+                "count": rng.poisson(3, 1_000_000),
+            }
+        ),
+        "params": {"alpha": 0.1},
+    }
+
+
+def bench(model, serializer, compression, mmap_arrays):
+    model_conf = {"name": "bench", "version": "1.0.0"}
+    with tempfile.TemporaryDirectory() as location:
+        store = ModelStore(
+            {
+                "model_store": {
+                    "location": location,
+                    "serializer": serializer,
+                    "compression": compression,
+                    "mmap_arrays": mmap_arrays,
+                }
+            }
+        )
+        store.dump_trained_model({"model": model_conf}, model, {})
+        _, meta = store.load_trained_model(model_conf)
+    return meta["serialization"]
+
+
+def main():
+    model = make_model()
+    print("serializer compression mmap  size (MB)  save (s)  load (s)")
+    for serializer, compression, mmap_arrays in SETTINGS:
+        try:
+            result = bench(model, serializer, compression, mmap_arrays)
+        except ModuleNotFoundError as e:
+            print(
+                "{:<10} {:<11} {!s:<5} skipped: {}".format(
+                    serializer, compression, mmap_arrays, e
+                )
+            )
+            continue
+        print(
+            "{:<10} {:<11} {!s:<5} {:>9.1f} {:>9.2f} {:>9.2f}".format(
+                serializer,
+                compression,
+                mmap_arrays,
+                result["size_bytes"] / 1e6,
+                result["dump_seconds"],
+                result["load_seconds"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Compare fetch throughput of OracleDataSource for different settings.
+
+No Oracle database is needed: the benchmark registers a stand-in DB-API
+driver module backed by an in-memory SQLite database, which sleeps for a
+simulated network round trip whenever a batch of `arraysize` rows is
+fetched (and once on executing the query, which also returns the first
+`prefetchrows` rows), like a real Oracle driver does:
+
+    $ python benchmarks/bench_oracle_fetch.py
+
+The second part compares the client-side cost of creating a DataFrame from
+Python row tuples (what pandas does with a DB-API cursor) to creating it
+from Arrow columns (what `fetch: arrow` does with python-oracledb, whose
+driver builds the columns without creating Python objects per row). The
+stand-in driver can't do the latter, so this uses rows/columns which have
+already been fetched.
+"""
+
+# Stdlib imports
+import math
+import os
+import sqlite3
+import sys
+import types
+import warnings
+from time import sleep, time
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from mllaunchpad.datasources import OracleDataSource
+
+
+N_ROWS = 200_000
+ROUND_TRIP_SECONDS = 0.0005
+
+
+def make_data(n_rows):
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        {
+            "id": np.arange(n_rows),
+            "score": rng.random(n_rows),
+            "label": rng.choice(["a", "b", "c"], n_rows),
+        }
+    )
+
+
+class StandInCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self._prefetched = []
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, query, params=None):
+        self._cursor.execute(query, params or {})
+        sleep(ROUND_TRIP_SECONDS)
+        self._prefetched = self._cursor.fetchmany(self.prefetchrows)
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows, self._prefetched = (
+            self._prefetched[:size],
+            self._prefetched[size:],
+        )
+        missing = size - len(rows)
+        if missing > 0:
+            fetched = self._cursor.fetchmany(missing)
+            sleep(ROUND_TRIP_SECONDS * math.ceil(missing / self.arraysize))
+            rows += fetched
+        return rows
+
+    def fetchall(self):
+        rows = self._prefetched + self._cursor.fetchall()
+        self._prefetched = []
+        sleep(ROUND_TRIP_SECONDS * math.ceil(len(rows) / self.arraysize))
+        return rows
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandInConnection:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self):
+        return StandInCursor(self._connection.cursor())
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StandInPool:
+    def __init__(self, db):
+        self._db = db
+
+    def acquire(self):
+        return StandInConnection(self._db)
+
+    def release(self, connection):
+        pass
+
+    def close(self, force=False):
+        pass
+
+
+def install_stand_in_driver(data):
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    data.to_sql("bench", con=db, index=False)
+    driver = types.ModuleType("standin_oracle")
+    driver.makedsn = lambda host, port, service_name: "standin"
+    driver.create_pool = lambda **kwargs: StandInPool(db)
+    sys.modules["standin_oracle"] = driver
+    os.environ["BENCH_USER"] = "bench"
+    os.environ["BENCH_PW"] = "bench"
+
+
+def bench(arraysize, prefetchrows):
+    ds_config = {"type": "dbms.bench", "query": "SELECT * FROM bench"}
+    if arraysize:
+        ds_config["arraysize"] = arraysize
+    if prefetchrows:
+        ds_config["prefetchrows"] = prefetchrows
+    ds = OracleDataSource(
+        "bench",
+        ds_config,
+        {
+            "type": "oracle",
+            "driver": "standin_oracle",
+            "host": "localhost",
+            "port": 1521,
+            "service_name": "bench",
+            "user_var": "BENCH_USER",
+            "password_var": "BENCH_PW",
+        },
+    )
+    start = time()
+    df = ds.get_dataframe()
+    assert len(df) == N_ROWS
+    return N_ROWS / (time() - start)
+
+
+def bench_conversion(data):
+    import pyarrow as pa
+
+    rows = list(data.itertuples(index=False, name=None))
+    start = time()
+    pd.DataFrame.from_records(rows, columns=list(data.columns))
+    from_rows = time() - start
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    start = time()
+    table.to_pandas()
+    from_arrow = time() - start
+    return N_ROWS / from_rows, N_ROWS / from_arrow
+
+
+def main():
+    warnings.simplefilter("ignore", UserWarning)  # pandas' DB-API warning
+    data = make_data(N_ROWS)
+    install_stand_in_driver(data)
+
+    print(
+        "Fetching {} rows, {} ms per simulated round trip:".format(
+            N_ROWS, ROUND_TRIP_SECONDS * 1000
+        )
+    )
+    for arraysize, prefetchrows in [
+        (None, None),
+        (1000, None),
+        (10000, None),
+        (10000, 10001),
+    ]:
+        rate = bench(arraysize, prefetchrows)
+        print(
+            "  arraysize={!s:>5}, prefetchrows={!s:>5}: {:>10,.0f} rows/s".format(
+                arraysize or "(100)", prefetchrows or "(2)", rate
+            )
+        )
+
+    from_rows, from_arrow = bench_conversion(data)
+    print("Creating the DataFrame only:")
+    print("  from row tuples (pandas): {:>12,.0f} rows/s".format(from_rows))
+    print("  from Arrow columns:       {:>12,.0f} rows/s".format(from_arrow))
+
+
+if __name__ == "__main__":
+    main()
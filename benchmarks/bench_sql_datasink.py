@@ -0,0 +1,87 @@
+"""Compare write throughput of SqlDataSink's insertion methods.
+
+Uses a local SQLite database as a stand-in for a "real" DBMS, or the
+database given by the connection string in the first argument, e.g.:
+
+    $ python benchmarks/bench_sql_datasink.py
+    $ python benchmarks/bench_sql_datasink.py postgresql://user:pw@localhost/db
+
+Note that the results very much depend on the database and its driver.
+SQLite runs in-process, so it mostly shows the overhead of statement
+handling in SQLAlchemy and pandas.
+"""
+
+# Stdlib imports
+import os
+import sys
+import tempfile
+from time import time
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+# Project imports
+from mllaunchpad.datasources import SqlDataSink
+
+
+N_ROWS = 200_000
+CHUNKSIZE = 10_000
+
+
+def make_data(n_rows):
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        {
+            "id": np.arange(n_rows),
+            "score": rng.random(n_rows),
+            "label": rng.choice(["a", "b", "c"], n_rows),
+        }
+    )
+
+
+def bench(connection_string, data, method, chunksize, as_generator):
+    options = {"if_exists": "replace"}
+    if method:
+        options["method"] = method
+    sink = SqlDataSink(
+        "bench",
+        {"type": "dbms.bench", "table": "bench", "options": options},
+        {"type": "sql", "connection_string": connection_string},
+    )
+    if as_generator:
+        data = (df for _, df in data.groupby(data.index // chunksize))
+    start = time()
+    sink.put_dataframe(data, chunksize=chunksize)
+    return N_ROWS / (time() - start)
+
+
+def main():
+    data = make_data(N_ROWS)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if len(sys.argv) > 1:
+            connection_string = sys.argv[1]
+        else:
+            connection_string = "sqlite:///{}".format(
+                os.path.join(tmp_dir, "bench.db")
+            )
+        methods = [(None, None, False)]
+        # SQLite allows at most 32766 variables per statement
+        methods += [(None, CHUNKSIZE, False), ("multi", 5_000, False)]
+        methods += [(None, CHUNKSIZE, True)]
+        if connection_string.startswith("postgresql"):
+            methods += [("copy", CHUNKSIZE, False)]
+        for method, chunksize, as_generator in methods:
+            rows_per_sec = bench(
+                connection_string, data, method, chunksize, as_generator
+            )
+            print(
+                "method={!s:6} chunksize={!s:6} generator={!s:5} "
+                "{:>10,.0f} rows/s".format(
+                    method, chunksize, as_generator, rows_per_sec
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
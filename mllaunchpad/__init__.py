@@ -5,7 +5,12 @@ import pkg_resources
 
 # Project imports
 from mllaunchpad.config import get_validated_config, get_validated_config_str
-from mllaunchpad.model_actions import predict, retest, train_model
+from mllaunchpad.model_actions import (
+    batch_predict,
+    predict,
+    retest,
+    train_model,
+)
 from mllaunchpad.model_interface import ModelInterface, ModelMakerInterface
 from mllaunchpad.resource import order_columns
 
@@ -18,6 +23,7 @@ __all__ = [
     "train_model",
     "retest",
     "predict",
+    "batch_predict",
     "get_validated_config",
     "get_validated_config_str",
     "ModelInterface",
@@ -5,13 +5,20 @@
 """
 
 # Stdlib imports
+import json
 import logging
+import queue
 import re
+import threading
+import time
 from collections import OrderedDict
+from concurrent.futures import Future
 
 # Third-party imports
+import pandas as pd
 import ramlfications
-from flask_restful import Api, Resource, reqparse
+from flask import current_app, make_response, request
+from flask_restful import Api, Resource, abort, reqparse
 from werkzeug.datastructures import FileStorage
 
 # Project imports
@@ -151,6 +158,125 @@ def _get_resources(raml):
     return res_normal, res_with_id, res_file
 
 
+_batch_dtype_lookup = {
+    float: "float64",
+    int: "int64",
+    str: str,
+    bool: "bool",
+}
+
+_ndjson_mime_types = ["application/x-ndjson", "application/jsonl"]
+
+
+def _parse_batch_body(req) -> pd.DataFrame:
+    """Create a DataFrame from a batch request's body. The body can either
+    be columnar JSON (``{"col1": [1, 2], "col2": ["a", "b"]}``) or, if
+    sent with mime type ``application/x-ndjson``, newline-delimited JSON
+    with one JSON object per row.
+    """
+    body = req.get_data(as_text=True)
+    try:
+        if req.mimetype in _ndjson_mime_types:
+            rows = [json.loads(line) for line in body.splitlines() if line]
+            if not all(isinstance(row, dict) for row in rows):
+                raise ValueError(
+                    "Each line of a newline-delimited JSON batch request "
+                    "body must be a JSON object"
+                )
+            return pd.DataFrame.from_records(rows)
+        columns = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError("Could not parse batch request body: {}".format(e))
+    if not isinstance(columns, dict) or not all(
+        isinstance(c, list) for c in columns.values()
+    ):
+        raise ValueError(
+            "Batch request body must be a JSON object with one list of values "
+            "per parameter, or newline-delimited JSON (mime type {})".format(
+                _ndjson_mime_types[0]
+            )
+        )
+    if len(set(len(c) for c in columns.values())) > 1:
+        raise ValueError(
+            "All parameter lists in batch request must have the same length"
+        )
+    return pd.DataFrame(columns)
+
+
+def _validate_batch_dataframe(parser, df: pd.DataFrame) -> pd.DataFrame:
+    """Validate and convert the columns of a batch request's DataFrame
+    according to the arguments of the resource's request parser (which are
+    derived from the RAML), column by column instead of row by row.
+    """
+    errors = {}
+    known = set()
+    for arg in parser.args:
+        known.add(arg.name)
+        if arg.name not in df.columns:
+            if arg.required:
+                errors[arg.name] = "Missing required parameter"
+            else:
+                df[arg.name] = arg.default
+            continue
+        series = df[arg.name]
+        if arg.required and series.isna().any():
+            errors[arg.name] = "Missing required value in {} row(s)".format(
+                series.isna().sum()
+            )
+            continue
+        if arg.action == "append" or arg.type not in _batch_dtype_lookup:
+            continue
+        if arg.default is not None:
+            series = series.fillna(arg.default)
+        missing = series.isna()
+        try:
+            if arg.type in (float, int):
+                series = pd.to_numeric(series, errors="raise")
+                if arg.type is int and not (series[~missing] % 1 == 0).all():
+                    raise ValueError("non-integer values")
+            if missing.any():
+                # Optional values without default are None, just like
+                # in single requests
+                df[arg.name] = (
+                    series.map(arg.type, na_action="ignore")
+                    .astype(object)
+                    .where(~missing, None)
+                )
+            else:
+                df[arg.name] = series.astype(_batch_dtype_lookup[arg.type])
+        except (TypeError, ValueError) as e:
+            errors[arg.name] = "Could not convert to {}: {}".format(
+                arg.type.__name__, e
+            )
+            continue
+        if (
+            arg.choices
+            and not df.loc[~missing, arg.name].isin(arg.choices).all()
+        ):
+            errors[arg.name] = "Values must be one of {}".format(
+                list(arg.choices)
+            )
+    unknown = [c for c in df.columns if c not in known]
+    if unknown:
+        errors["unknown"] = "Unknown parameter(s): {}".format(unknown)
+    if errors:
+        raise ValueError(errors)
+    return df
+
+
+def _output_json(data, code, headers=None):
+    """Write JSON responses using :func:`mllaunchpad.resource.to_json_bytes`,
+    which converts numpy arrays and DataFrames without copying them into
+    plain python objects first.
+    """
+    response = make_response(
+        resource.to_json_bytes(data, indent=current_app.debug), code
+    )
+    response.mimetype = "application/json"
+    response.headers.extend(headers or {})
+    return response
+
+
 class QueryResource(Resource):
     # Adapted from https://flask-restful.readthedocs.io/en/latest/quickstart.html
 
@@ -214,6 +340,172 @@ class QueryOrFileUploadResource(Resource):
         return self.model_api.predict_using_model(args)
 
 
+class BatchResource(Resource):
+    """Resource for predicting many sets of parameters with one request."""
+
+    def __init__(self, model_api_obj, parser):
+        self.model_api = model_api_obj
+        self.parser = parser
+
+    def post(self):
+        try:
+            df = _validate_batch_dataframe(
+                self.parser, _parse_batch_body(request)
+            )
+        except ValueError as e:
+            logger.debug("Invalid batch request: %s", e)
+            abort(400, message=e.args[0])
+        logger.debug("Received POST batch request with %s rows", len(df))
+        return self.model_api.predict_dataframe_using_model(df)
+
+
+class PredictionBatcher:
+    """Collects concurrent prediction requests into micro-batches.
+
+    Requests are queued by the request threads calling :meth:`predict`.
+    A single worker thread takes the first waiting request and then waits
+    up to ``max_wait_ms`` milliseconds for more requests to arrive (but for
+    no more than ``max_batch_size`` requests in total). The whole batch is
+    then handed to ``predict_batch_func`` at once, and its results are
+    returned to the respective waiting request threads.
+
+    The worker thread is started lazily on the first prediction, so that
+    the batcher survives pre-forking WSGI servers like gunicorn.
+    """
+
+    def __init__(self, predict_batch_func, max_batch_size=32, max_wait_ms=5):
+        """
+        Params:
+            predict_batch_func: function taking a list of args dicts and returning a list of results
+            max_batch_size:     maximum number of requests to predict at once
+            max_wait_ms:        maximum time in milliseconds to wait for more requests
+        """
+        if max_batch_size < 1:
+            raise ValueError(
+                "api:batching:max_batch_size must be at least 1, got {}".format(
+                    max_batch_size
+                )
+            )
+        self.predict_batch_func = predict_batch_func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def predict(self, args_dict):
+        """Queue args_dict for prediction and block until its result is available.
+        Any exception raised when predicting the batch is raised here, too.
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((args_dict, future))
+        return future.result()
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="mllaunchpad-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            args_dicts = [args_dict for args_dict, _ in batch]
+            logger.debug("Predicting batch of size %s", len(batch))
+            try:
+                results = self.predict_batch_func(args_dicts)
+                if len(results) != len(batch):
+                    raise ValueError(
+                        "predict_batch returned {} results for a batch of {} "
+                        "requests".format(len(results), len(batch))
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache for prediction outputs.
+
+    The cache key consists of the model's name, version and creation time
+    and of the request's arguments, so cached outputs of a previously loaded
+    model are never returned. Requests with uploaded files are not cached.
+    """
+
+    def __init__(self, size=1024, ttl=None):
+        """
+        Params:
+            size:  maximum number of outputs to cache
+            ttl:   optional number of seconds after which cached outputs expire
+        """
+        if size < 1:
+            raise ValueError(
+                "api:response_cache:size must be at least 1, got {}".format(
+                    size
+                )
+            )
+        self.ttl = ttl
+        self._cache = resource.CacheDict(maxsize=size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_meta, args_dict):
+        """Create cache key, or return None if the request cannot be cached."""
+        if any(isinstance(v, FileStorage) for v in args_dict.values()):
+            return None
+        return (
+            model_meta["name"],
+            model_meta["version"],
+            model_meta["created"],
+            json.dumps(args_dict, sort_keys=True, default=str),
+        )
+
+    def get(self, key):
+        """Return a tuple of whether the key was found and the cached output."""
+        with self._lock:
+            entry = self._cache.lookup(key, is_valid=self._is_fresh)
+        if entry is None:
+            return False, None
+        return True, entry[0]
+
+    def _is_fresh(self, entry):
+        return self.ttl is None or time.time() <= entry[1] + self.ttl
+
+    def put(self, key, output):
+        with self._lock:
+            self._cache[key] = (output, time.time())
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = self._cache.stats()
+        del stats["bytes"]
+        return stats
+
+
 class ModelApi:
     """Class to plug a Data-Scientist-created model into.
 
@@ -236,36 +528,51 @@ class ModelApi:
             debug:        use current prediction code instead of that of persisted model
         """
         self.model_config = config["model"]
-        model_store = resource.ModelStore(config)
-        self.model_wrapper = self._load_model(model_store, self.model_config)
-        if debug:
-            # TODO: Hacky, should use model_actions functionality for a lot of API functionality instead of duplicating.
-            # Create a fresh model object from current code and transplant existing contents
-            m_cls = model_actions._get_model_class(config, cache=True)
-            curr_model_wrapper = m_cls(contents=self.model_wrapper.contents)
-            self.model_wrapper = curr_model_wrapper
-
-        # Workaround (tensorflow has problem with spontaneously created threads such as with Flask):
-        # https://kobkrit.com/tensor-something-is-not-an-element-of-this-graph-error-in-keras-on-flask-web-server-4173a8fe15e1
-        try:
-            import tensorflow as tf
+        self._config = config
+        self._debug = debug
+        self._model_store = resource.ModelStore(config)
+        model_conf = self._get_model_to_serve()
+        self._model_mtime = self._model_store.get_model_mtime(model_conf)
+        # Model wrapper, its metadata and model config, replaced as a whole
+        # on reloading, so requests never see parts of different models
+        self._model = (
+            *self._prepare_model(
+                *self._load_model(self._model_store, model_conf)
+            ),
+            model_conf,
+        )
+        self.datasources, self.datasinks = self._init_datasources(config)
 
-            graph = tf.get_default_graph()
-            self.model_wrapper.__graph = graph
-        except Exception as e:
-            logger.debug(
-                'Optional tensorflow/flask workaround for "<tensor> is not an element of this graph" problem'
-                + "resulted in: %s",
-                e,
+        self.response_cache = None
+        response_cache_config = config["api"].get("response_cache")
+        if response_cache_config:
+            logger.info("Enabling caching of prediction responses")
+            self.response_cache = ResponseCache(**response_cache_config)
+
+        self.batcher = None
+        batching_config = config["api"].get("batching")
+        if batching_config:
+            logger.info("Enabling micro-batching of predictions")
+            self.batcher = PredictionBatcher(
+                self.predict_batch_using_model, **batching_config
             )
-        else:
-            logger.info(
-                'Stored tensorflow model\'s graph - tensorflow/flask workaround for "<tensor> is not an element of this graph" problem'
-            )
-        self.datasources, self.datasinks = self._init_datasources(config)
+
+        self._watcher = None
+        self._watcher_lock = threading.Lock()
+        self._watcher_stop = threading.Event()
+        reload_config = config["api"].get("model_reload") or {}
+        self._warmup_args = reload_config.get("warmup")
+        # The watcher is started lazily on the first request, so that it
+        # survives pre-forking WSGI servers like gunicorn --preload
+        self._watcher_interval = (
+            reload_config.get("interval", 10) if reload_config else None
+        )
 
         logger.debug("Initializing RESTful API")
+        # Endpoints are named after their URLs, so that several models
+        # can be served by the same application
         api = Api(application)
+        api.representation("application/json")(_output_json)
 
         api_name = config["api"]["name"]
         api_version = _get_major_api_version(config)
@@ -300,6 +607,7 @@ class ModelApi:
                 api.add_resource(
                     QueryOrFileUploadResource,  # QueryResource,
                     resource_urls["query"],
+                    endpoint=resource_urls["query"],
                     resource_class_kwargs={
                         "model_api_obj": self,
                         "query_parser": parsers["query"],
@@ -313,6 +621,7 @@ class ModelApi:
                     api.add_resource(
                         QueryOrFileUploadResource,  # QueryResource,
                         res_url,
+                        endpoint=res_url,
                         resource_class_kwargs={
                             "model_api_obj": self,
                             "query_parser": parsers["query"]
@@ -324,6 +633,21 @@ class ModelApi:
                         },
                     )
 
+        if res_normal:
+            batch_url = resource_urls["query"] + "/batch"
+            logger.debug(
+                "Adding batch resource %s to api %s", batch_url, api_url
+            )
+            api.add_resource(
+                BatchResource,
+                batch_url,
+                endpoint=batch_url,
+                resource_class_kwargs={
+                    "model_api_obj": self,
+                    "parser": parsers["query"],
+                },
+            )
+
         if res_with_id:
             logger.debug(
                 "Adding url-id resource %s to api %s",
@@ -340,6 +664,7 @@ class ModelApi:
             api.add_resource(
                 GetByIdResource,
                 resource_url,
+                endpoint=resource_url,
                 resource_class_kwargs={
                     "model_api_obj": self,
                     "parser": parser,
@@ -347,27 +672,279 @@ class ModelApi:
                 },
             )
 
+    @property
+    def model_wrapper(self):
+        """The currently served model (see :meth:`reload_model`)."""
+        return self._model[0]
+
+    @property
+    def model_meta(self):
+        """Metadata of the currently served model."""
+        return self._model[1]
+
+    @property
+    def _served_model_conf(self):
+        return self._model[2]
+
+    def _prepare_model(self, model_wrapper, model_meta):
+        if self._debug:
+            # TODO: Hacky, should use model_actions functionality for a lot of API functionality instead of duplicating.
+            # Create a fresh model object from current code and transplant existing contents
+            m_cls = model_actions._get_model_class(self._config, cache=True)
+            curr_model_wrapper = m_cls(contents=model_wrapper.contents)
+            model_wrapper = curr_model_wrapper
+
+        # Workaround (tensorflow has problem with spontaneously created threads such as with Flask):
+        # https://kobkrit.com/tensor-something-is-not-an-element-of-this-graph-error-in-keras-on-flask-web-server-4173a8fe15e1
+        try:
+            import tensorflow as tf
+
+            graph = tf.get_default_graph()
+            model_wrapper.__graph = graph
+        except Exception as e:
+            logger.debug(
+                'Optional tensorflow/flask workaround for "<tensor> is not an element of this graph" problem'
+                + "resulted in: %s",
+                e,
+            )
+        else:
+            logger.info(
+                'Stored tensorflow model\'s graph - tensorflow/flask workaround for "<tensor> is not an element of this graph" problem'
+            )
+
+        return model_wrapper, model_meta
+
+    def _get_model_to_serve(self):
+        """Get the model config of the model to serve: the configured model,
+        or with ``api: serve_best_model:``, the model in the model store's
+        registry with the best value of the configured metric which serves
+        this API.
+        """
+        best_model_config = self._config["api"].get("serve_best_model")
+        if not best_model_config:
+            return self.model_config
+        best = self._model_store.get_best_model(
+            self._config["api"]["name"],
+            best_model_config["metric"],
+            best_model_config.get("higher_is_better", True),
+        )
+        if best is None:
+            logger.warning(
+                "No model in the model store has metric %s, serving the "
+                "configured model",
+                best_model_config["metric"],
+            )
+            return self.model_config
+        return {
+            **self.model_config,
+            "name": best["name"],
+            "version": best["version"],
+        }
+
+    def reload_model(self):
+        """Load the model from the model store if it has changed since it was
+        last loaded, and serve it from now on. Requests which are in progress
+        finish using the previous model. With ``api: serve_best_model:``,
+        this also switches to another model once it has the best metric.
+
+        If ``api: model_reload: warmup:`` is configured, a prediction using
+        these arguments is made with the new model first. If loading or
+        warming up fails, the previous model continues to be served.
+
+        Returns:
+            True if a new model has been loaded, False otherwise
+        """
+        model_conf = self._get_model_to_serve()
+        mtime = self._model_store.get_model_mtime(model_conf)
+        if mtime is None or (
+            model_conf == self._served_model_conf
+            and mtime == self._model_mtime
+        ):
+            return False
+
+        try:
+            model = (
+                *self._prepare_model(
+                    *self._load_model(self._model_store, model_conf)
+                ),
+                model_conf,
+            )
+            if self._model_store.get_model_mtime(model_conf) != mtime:
+                # Stored again while loading, metadata and model might differ
+                logger.info("Model changed while loading it, retrying later")
+                return False
+            if self._warmup_args:
+                logger.info("Warming up new model...")
+                self._predict(model, self._warmup_args)
+        except Exception:
+            logger.exception("Failed to load new model, keeping old one")
+            return False
+
+        self._model = model
+        self._model_mtime = mtime
+        if self.response_cache is not None:
+            self.response_cache.clear()
+        logger.info(
+            "Now serving model %s version %s",
+            model_conf["name"],
+            model_conf["version"],
+        )
+        return True
+
+    def start_model_watcher(self, interval=10):
+        """Start a daemon thread which checks the model store for a new
+        model every `interval` seconds and serves it once it has been
+        loaded and warmed up (see :meth:`reload_model`). With
+        ``api: model_reload:``, this happens on the first request.
+        """
+        with self._watcher_lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            logger.info(
+                "Checking the model store for new models every %s seconds",
+                interval,
+            )
+            self._watcher_stop.clear()
+            self._watcher = threading.Thread(
+                target=self._run_model_watcher,
+                args=(interval,),
+                name="model-watcher",
+                daemon=True,
+            )
+            self._watcher.start()
+
+    def _ensure_model_watcher(self):
+        if self._watcher_interval is not None and (
+            self._watcher is None or not self._watcher.is_alive()
+        ):
+            self.start_model_watcher(self._watcher_interval)
+
+    def stop_model_watcher(self):
+        """Stop the thread started by :meth:`start_model_watcher`. It is not
+        started again by further requests.
+        """
+        self._watcher_interval = None
+        self._watcher_stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _run_model_watcher(self, interval):
+        while not self._watcher_stop.wait(interval):
+            self.reload_model()
+
     def predict_using_model(self, args_dict):
+        self._ensure_model_watcher()
+        if self.response_cache is not None:
+            key = self.response_cache.make_key(self.model_meta, args_dict)
+            if key is not None:
+                found, output = self.response_cache.get(key)
+                if found:
+                    logger.debug("Returning cached prediction output")
+                    return output
+                output = self._predict_using_model(args_dict)
+                self.response_cache.put(key, output)
+                return output
+        return self._predict_using_model(args_dict)
+
+    def response_cache_stats(self):
+        """Get statistics about the response cache (``api: response_cache:``):
+        number of `hits`, `misses` and `evictions`, and number of cached
+        `items`. Returns None if the response cache is not enabled.
+        """
+        if self.response_cache is None:
+            return None
+        return self.response_cache.stats()
+
+    def _predict_using_model(self, args_dict):
+        if self.batcher is not None:
+            return self.batcher.predict(args_dict)
+
         logger.debug("Prediction input %s", dict(args_dict))
         logger.info("Starting prediction")
+        output = self._predict(self._model, args_dict)
+
+        logger.debug("Prediction output %s", output)
+        return output
+
+    def _predict(self, model, args_dict):
+        model_wrapper, _, model_conf = model
         args_ordered_dict = OrderedDict(sorted(args_dict.items()))
-        inner_model = self.model_wrapper.contents
         predict_args = [
-            self.model_config,
+            model_conf,
             self.datasources,
             self.datasinks,
-            inner_model,
+            model_wrapper.contents,
             args_ordered_dict,
         ]
-        if hasattr(self.model_wrapper, "__graph"):
-            with self.model_wrapper.__graph.as_default():
+        output = self._call_model(
+            model_wrapper, model_wrapper.predict, predict_args
+        )
+        self._check_ordered_columns(model_wrapper)
+        return output
+
+    def predict_batch_using_model(self, args_dicts):
+        logger.debug(
+            "Prediction input batch %s", [dict(a) for a in args_dicts]
+        )
+        logger.info("Starting prediction of batch of size %s", len(args_dicts))
+        args_ordered_dicts = [
+            OrderedDict(sorted(args_dict.items())) for args_dict in args_dicts
+        ]
+        raw_outputs = self._predict_batch(args_ordered_dicts)
+        if isinstance(raw_outputs, pd.DataFrame):
+            raw_outputs = raw_outputs.to_dict(orient="records")
+        outputs = list(raw_outputs)
+
+        logger.debug("Prediction output batch %s", outputs)
+        return outputs
+
+    def predict_dataframe_using_model(self, df):
+        self._ensure_model_watcher()
+        logger.info("Starting prediction of DataFrame with %s rows", len(df))
+        raw_outputs = self._predict_batch(df.loc[:, sorted(df.columns)])
+
+        if isinstance(raw_outputs, pd.DataFrame):
+            # Columnar, just like the input
+            return {
+                col: raw_outputs[col].to_numpy() for col in raw_outputs.columns
+            }
+        return raw_outputs
+
+    def _predict_batch(self, batch_args):
+        model_wrapper, _, model_conf = self._model
+        predict_args = [
+            model_conf,
+            self.datasources,
+            self.datasinks,
+            model_wrapper.contents,
+            batch_args,
+        ]
+        raw_outputs = self._call_model(
+            model_wrapper, model_wrapper.predict_batch, predict_args
+        )
+        self._check_ordered_columns(model_wrapper)
+
+        if len(raw_outputs) != len(batch_args):
+            raise ValueError(
+                "predict_batch returned {} results for a batch of {} "
+                "items".format(len(raw_outputs), len(batch_args))
+            )
+        return raw_outputs
+
+    @staticmethod
+    def _call_model(model_wrapper, predict_func, predict_args):
+        if hasattr(model_wrapper, "__graph"):
+            with model_wrapper.__graph.as_default():
                 logger.info("Restored tensorflow model's graph")
-                raw_output = self.model_wrapper.predict(*predict_args)
+                return predict_func(*predict_args)
         else:
-            raw_output = self.model_wrapper.predict(*predict_args)
+            return predict_func(*predict_args)
 
+    @staticmethod
+    def _check_ordered_columns(model_wrapper):
         if (
-            self.model_wrapper.have_columns_been_ordered
+            model_wrapper.have_columns_been_ordered
             and not resource._order_columns_called
         ):
             logger.warning(
@@ -375,15 +952,11 @@ class ModelApi:
                 "prediction does not call function order_columns."
             )
 
-        output = resource.to_plain_python_obj(raw_output)
-        logger.debug("Prediction output %s", output)
-        return output
-
     @staticmethod
     def _init_datasources(config):
         logger.info("Initializing datasources...")
         dso, dsi = resource.create_data_sources_and_sinks(
-            config, tags="predict"
+            config, tags="predict", shared=True
         )
         logger.info(
             "%s datasource(s) initialized: %s", len(dso), list(dso.keys())
@@ -395,20 +968,40 @@ class ModelApi:
             logger.info("Preloading datasources...")
             for ds in dso.values():
                 _ = ds.get_dataframe()
+                if ds.refresh == "background":
+                    ds.start_refresher()
 
         return dso, dsi
 
     @staticmethod
     def _load_model(model_store, model_config):
         logger.info("Loading model...")
+        resident_before = resource.get_resident_bytes()
+        start = time.perf_counter()
         model, meta = model_store.load_trained_model(model_config)
+        seconds = time.perf_counter() - start
+        resident_after = resource.get_resident_bytes()
         logger.info(
             "Model loaded: {}, version: {}, created {}".format(
                 meta["name"], meta["version"], meta["created"]
             )
         )
 
-        return model
+        # Memory-mapped arrays (model_store: mmap_arrays) are only paged in
+        # when used, so the resident memory can be much less than the model size
+        serialization = meta.setdefault("serialization", {})
+        serialization["mapped_bytes"] = serialization.get("mapped_bytes", 0)
+        if resident_before is not None and resident_after is not None:
+            serialization["resident_bytes"] = resident_after - resident_before
+        logger.info(
+            "Loading took %.2f seconds, %s bytes memory-mapped, resident "
+            "memory grew by %s bytes",
+            seconds,
+            serialization["mapped_bytes"],
+            serialization.get("resident_bytes", "(unknown)"),
+        )
+
+        return model, meta
 
 
 _pd_type_lookup = {
@@ -9,11 +9,13 @@ from typing import Dict
 # Third-party imports
 import click
 from flask import Flask
+from werkzeug.serving import run_simple
 
 # Project imports
 import mllaunchpad as mllp
 from mllaunchpad import logutil
 from mllaunchpad.api import ModelApi, generate_raml
+from mllaunchpad.router import create_application
 
 
 # Fix for click using the wrong name if run using `python -m mllaunchpad`
@@ -127,6 +129,23 @@ def api(settings):
     app.run(debug=True)  # nosec
 
 
+@main.command()
+@click.option("--host", default="127.0.0.1", help="Host to listen on.")
+@click.option("--port", "-p", default=5000, help="Port to listen on.")
+@pass_settings
+def route(settings, host, port):
+    """Run request router for several API nodes in debug mode."""
+    settings.logger.warning(
+        "Starting request router debug server. In production, please "
+        "use a WSGI server, e.g.\n"
+        "'export LAUNCHPAD_CFG=addition_cfg.yml'\n"
+        "'gunicorn -w 1 --threads 16 -b 127.0.0.1:5000 "
+        '"mllaunchpad.router:create_application()"\''
+    )
+    app = create_application(settings.config)
+    run_simple(host, port, app, threaded=True)
+
+
 @main.command()
 @click.argument("json-file", type=click.File("r"), default=sys.stdin)
 @pass_settings
@@ -144,6 +163,52 @@ def predict(settings, json_file):
     print(output)
 
 
+@main.command(name="batch-predict")
+@click.option(
+    "--input",
+    "-i",
+    "input_name",
+    required=True,
+    help="Name of the datasource to get the input data from.",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_name",
+    required=True,
+    help="Name of the datasink to store the predictions in.",
+)
+@click.option(
+    "--chunksize",
+    "-n",
+    default=10000,
+    show_default=True,
+    help="Number of rows to predict at once.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    show_default=True,
+    help="Number of processes to use for prediction.",
+)
+@pass_settings
+def batch_predict(settings, input_name, output_name, chunksize, workers):
+    """Run prediction on all rows of a datasource, store results in a datasink.
+
+    The datasource needs to be configured with `expires: 0`.
+    """
+    stats = mllp.batch_predict(
+        settings.config,
+        input_name,
+        output_name,
+        chunksize=chunksize,
+        workers=workers,
+        use_live_code=True,
+    )
+    print(stats)
+
+
 @main.command(name="generate-raml")
 @click.argument("datasource-name", type=str, required=True)
 @pass_settings
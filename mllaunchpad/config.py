@@ -5,7 +5,7 @@
 # Stdlib imports
 import logging
 import os
-from typing import AnyStr, Dict, TextIO, Union
+from typing import AnyStr, Dict, List, TextIO, Union
 from warnings import warn
 
 # Third-party imports
@@ -64,6 +64,17 @@ def check_semantics(config_dict):
             )
 
 
+def _open_config(filename: str) -> TextIO:
+    if filename == CONFIG_DEFAULT:
+        logger.warning(
+            "Config filename environment variable LAUNCHPAD_CFG not set, "
+            "using default file: %s",
+            repr(CONFIG_DEFAULT),
+        )
+    logger.info("Loading configuration file %s...", filename)
+    return open(filename)
+
+
 def get_validated_config(filename: str = CONFIG_ENV) -> dict:
     """Read the configuration from file and return it as a dict object.
 
@@ -73,15 +84,7 @@ def get_validated_config(filename: str = CONFIG_ENV) -> dict:
     :return: dict with configuration
     :rtype: dict
    """
-    if filename == CONFIG_DEFAULT:
-        logger.warning(
-            "Config filename environment variable LAUNCHPAD_CFG not set, "
-            "using default file: %s",
-            repr(CONFIG_DEFAULT),
-        )
-    logger.info("Loading configuration file %s...", filename)
-
-    with open(filename) as f:
+    with _open_config(filename) as f:
         return get_validated_config_str(f)
 
 
@@ -99,9 +102,57 @@ def get_validated_config_str(io: Union[AnyStr, TextIO]) -> dict:
     # is a subclass of yaml.SafeLoader
     y = yaml.load(io, SafeIncludeLoader)  # nosec
 
+    return _validate(y)
+
+
+def _validate(y: Dict) -> Dict:
     validate_config(y, required_config)
     check_semantics(y)
 
     logger.debug("Configuration loaded and validated: %s", y)
 
     return y
+
+
+def get_validated_configs(filename: str = CONFIG_ENV) -> List[Dict]:
+    """Read one or several configurations from file and return them as a list
+    of dict objects. This is used to serve several models from the same
+    WSGI application, using a file which lists their configurations::
+
+        models:
+          - !include iris/LAUNCHPAD_CFG.yml
+          - !include churn/LAUNCHPAD_CFG.yml
+
+    A normal configuration file with one model is also accepted.
+
+    :param filename: Path to configuration file
+    :type filename: optional str, default: environment variable LAUNCHPAD_CFG or file ./LAUNCHPAD_CFG.yml
+
+    :return: list of configuration dicts
+    :rtype: list
+    """
+    with _open_config(filename) as f:
+        return get_validated_configs_str(f)
+
+
+def get_validated_configs_str(io: Union[AnyStr, TextIO]) -> List[Dict]:
+    """Read one or several configurations from a string or open file and
+    return them as a list of dict objects (see `get_validated_configs`).
+
+    :param io: Configuration as unicode string or b"byte string" or a open text file to read from
+    :type io: str or open text file handle
+
+    :return: list of configurations
+    :rtype: list
+    """
+    # Normally, one should use safe_load(), but our Loader
+    # is a subclass of yaml.SafeLoader
+    y = yaml.load(io, SafeIncludeLoader)  # nosec
+
+    if "models" not in y:
+        return [_validate(y)]
+    if not isinstance(y["models"], list) or not y["models"]:
+        raise ValueError(
+            "Config key 'models:' must contain a list of configurations"
+        )
+    return [_validate(c) for c in y["models"]]
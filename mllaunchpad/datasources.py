@@ -1,7 +1,30 @@
 # Stdlib imports
+import atexit
+import csv
+import glob
+import importlib
+import io
+import json
 import logging
+import mmap
 import os
-from typing import Dict, Generator, Iterable, Optional, Union, cast
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from time import perf_counter, time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 # Third-party imports
 import numpy as np
@@ -13,7 +36,13 @@ from mllaunchpad.resource import DataSink, DataSource, Raw, get_user_pw
 
 logger = logging.getLogger(__name__)
 
-SUPPORTED_FILE_TYPES = ["csv", "euro_csv", "text_file", "binary_file"]
+ARROW_FILE_TYPES = ["parquet", "feather", "arrow_ipc"]
+SUPPORTED_FILE_TYPES = [
+    "csv",
+    "euro_csv",
+    "text_file",
+    "binary_file",
+] + ARROW_FILE_TYPES
 
 
 def get_connection_args(dbms_config: Dict) -> Dict:
@@ -88,6 +117,223 @@ def _create_sqlalchemy_engine(dbms_config: Dict):
     return engine
 
 
+class _SharedEngine:
+    """Database connection engine shared by all DataSources/Sinks of one
+    ``dbms:`` entry (see :func:`_get_shared_engine`).
+    """
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+
+    def stats(self) -> Dict:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class _SharedSqlAlchemyEngine(_SharedEngine):
+    """SQLAlchemy engine which counts the connections checked out from its
+    pool and times how long it takes to open new connections. Listening on
+    the engine (instead of its pool) keeps the statistics working when the
+    engine replaces its pool, e.g. in ``engine.dispose()``.
+    """
+
+    def __init__(self, name: str, dbms_config: Dict):
+        super().__init__(name, _create_sqlalchemy_engine(dbms_config))
+        self.checkouts = 0
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.max_connect_seconds = 0.0
+        self._lock = threading.Lock()
+        self._connect_start = threading.local()
+
+        from sqlalchemy import event
+
+        event.listen(self.engine, "checkout", self._on_checkout)
+        event.listen(self.engine, "do_connect", self._on_do_connect)
+        event.listen(self.engine, "connect", self._on_connect)
+
+    def _on_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_do_connect(self, *args) -> None:
+        self._connect_start.time = perf_counter()
+
+    def _on_connect(self, *args) -> None:
+        start = getattr(self._connect_start, "time", None)
+        seconds = 0.0 if start is None else perf_counter() - start
+        with self._lock:
+            self.connects += 1
+            self.connect_seconds += seconds
+            self.max_connect_seconds = max(self.max_connect_seconds, seconds)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "connect_seconds_total": self.connect_seconds,
+                "connect_seconds_max": self.max_connect_seconds,
+                "connect_seconds_mean": (
+                    self.connect_seconds / self.connects
+                    if self.connects
+                    else 0.0
+                ),
+                "pool_status": self.engine.pool.status(),
+            }
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+# Process-wide registry of engines, one per dbms configuration
+_engines: Dict[str, _SharedEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def _get_shared_engine(
+    ds_config: Dict,
+    dbms_config: Dict,
+    create: Callable[[str, Dict], _SharedEngine],
+) -> _SharedEngine:
+    """Get the engine for `dbms_config`, creating it using `create` if it
+    does not exist yet in this process."""
+    name = ds_config["type"].split(".", 1)[-1]
+    key = json.dumps(dbms_config, sort_keys=True, default=str)
+    with _engines_lock:
+        shared = _engines.get(key)
+        if shared is None:
+            logger.info("Creating connection engine for dbms %s...", name)
+            shared = create(name, dbms_config)
+            _engines[key] = shared
+        else:
+            logger.debug("Reusing connection engine for dbms %s", name)
+        return shared
+
+
+@atexit.register
+def _close_shared_engines() -> None:
+    """Close the connections of all engines of this process."""
+    with _engines_lock:
+        shared_engines = list(_engines.values())
+        _engines.clear()
+    for shared in shared_engines:
+        try:
+            shared.close()
+        except Exception as e:
+            logger.warning(
+                "Could not close connection engine for dbms %s: %s",
+                shared.name,
+                e,
+            )
+
+
+def get_connection_pool_stats() -> Dict[str, Dict]:
+    """Get statistics about the database connection engines in this process,
+    one per ``dbms:`` entry: number of connection `checkouts` from the
+    engine's pool and the pool's current status. For SQLAlchemy engines,
+    also the number of new connections opened (`connects`) and the total,
+    maximum and mean time in seconds it took to open them. For Oracle
+    session pools, the total, maximum and mean time in seconds the
+    checkouts took (`checkout_seconds_...`).
+
+    Example::
+
+        {"my_connection": {"checkouts": 12, "connects": 2,
+                           "connect_seconds_total": 0.034,
+                           "connect_seconds_max": 0.021,
+                           "connect_seconds_mean": 0.017,
+                           "pool_status": "Pool size: 5  Connections in pool: 1 ..."}}
+
+    :return: dict with dbms names as keys and statistics dicts as values
+    """
+    with _engines_lock:
+        shared_engines = list(_engines.values())
+    return {shared.name: shared.stats() for shared in shared_engines}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ModuleNotFoundError as e:
+        logger.error(
+            "Please install the pyarrow package to be able to use the file types %s or fetch: arrow.",
+            ARROW_FILE_TYPES,
+        )
+        raise e
+    return pyarrow
+
+
+def _iter_arrow_batches(
+    batches: Iterable, to_pandas_options: Dict
+) -> Generator:
+    for batch in batches:
+        yield batch.to_pandas(**to_pandas_options)
+
+
+def _read_dataframe_file(
+    ds_type: str, path: str, options: Dict, chunksize: Optional[int] = None
+) -> Union[pd.DataFrame, Generator]:
+    """Read one file of a :class:`FileDataSource` (module-level so that
+    it can be run in a process pool).
+    """
+    if ds_type == "csv":
+        return pd.read_csv(path, chunksize=chunksize, **options)
+    elif ds_type == "euro_csv":
+        return pd.read_csv(
+            path, sep=";", decimal=",", chunksize=chunksize, **options
+        )
+    elif ds_type in ARROW_FILE_TYPES:
+        return _read_arrow_file(ds_type, path, options, chunksize)
+    else:
+        raise TypeError(
+            "Can only read csv, parquet, feather and arrow_ipc files as "
+            'dataframes. Use method "get_raw" for raw data'
+        )
+
+
+def _read_arrow_file(
+    ds_type: str, path: str, options: Dict, chunksize: Optional[int] = None
+) -> Union[pd.DataFrame, Generator]:
+    pa = _import_pyarrow()
+    to_pandas_options = dict(options)
+    columns = to_pandas_options.pop("columns", None)
+    memory_map = to_pandas_options.pop("memory_map", True) and isinstance(
+        path, str
+    )
+
+    if ds_type == "parquet":
+        if chunksize is not None:
+            parquet_file = pa.parquet.ParquetFile(path, memory_map=memory_map)
+            return _iter_arrow_batches(
+                parquet_file.iter_batches(
+                    batch_size=chunksize, columns=columns
+                ),
+                to_pandas_options,
+            )
+        table = pa.parquet.read_table(
+            path, columns=columns, memory_map=memory_map
+        )
+    else:
+        # Feather (V2) and Arrow IPC are the same file format
+        table = pa.feather.read_table(
+            path, columns=columns, memory_map=memory_map
+        )
+        if chunksize is not None:
+            return _iter_arrow_batches(
+                table.to_batches(max_chunksize=chunksize),
+                to_pandas_options,
+            )
+
+    return table.to_pandas(**to_pandas_options)
+
+
 def fill_nas(
     df: pd.DataFrame, as_generator: bool = False
 ) -> Union[pd.DataFrame, Generator]:
@@ -104,6 +350,134 @@ def fill_nas(
         return df
 
 
+_copy_null = "\\N"
+
+
+def _postgres_copy_insert(table, conn, keys, data_iter):
+    """Insert rows using PostgreSQL's COPY command, which is much faster than
+    INSERT statements. Used as ``method`` of ``DataFrame.to_sql``
+    (requires the psycopg2 driver).
+    """
+    buffer = io.StringIO()
+    # Write NULLs as an explicit marker: with COPY's default NULL of an
+    # unquoted empty value, empty strings would become NULL as well.
+    csv.writer(buffer).writerows(
+        [_copy_null if value is None else value for value in row]
+        for row in data_iter
+    )
+    buffer.seek(0)
+    table_name = '"{}"'.format(table.name)
+    if table.schema:
+        table_name = '"{}".{}'.format(table.schema, table_name)
+    columns = ", ".join('"{}"'.format(k) for k in keys)
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(
+            "COPY {} ({}) FROM STDIN WITH (FORMAT CSV, NULL '{}')".format(  # nosec
+                table_name, columns, _copy_null
+            ),
+            buffer,
+        )
+
+
+def _write_dataframes(
+    dataframes: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    table: str,
+    con,
+    chunksize: Optional[int],
+    kw_options: Dict,
+) -> None:
+    """Store one DataFrame or all DataFrames of an iterable (e.g. a generator)
+    in a table using `DataFrame.to_sql`. Later DataFrames are appended to the
+    table, regardless of `if_exists`.
+    """
+    if isinstance(dataframes, pd.DataFrame):
+        dataframes = [dataframes]
+    kw_options = dict(kw_options)
+    if_exists = kw_options.pop("if_exists", "fail")
+
+    start = time()
+    rows = 0
+    for i, dataframe in enumerate(dataframes):
+        dataframe.to_sql(
+            table,
+            con=con,
+            chunksize=chunksize,
+            if_exists=if_exists if i == 0 else "append",
+            **kw_options
+        )
+        rows += len(dataframe)
+    duration = time() - start
+    logger.debug(
+        "Stored %s rows in table %s in %.2f s (%.0f rows/s)",
+        rows,
+        table,
+        duration,
+        rows / duration if duration else float("inf"),
+    )
+
+
+def _get_partition_predicates(
+    partition_config: Dict,
+) -> List[Tuple[str, Dict]]:
+    """Split the range of a numeric column into `num_partitions` predicates
+    with parameters, like Spark's partitioned JDBC reads. The first and
+    last partitions are open-ended, and the first also contains NULLs, so
+    that no rows are left out.
+    """
+    column = partition_config["column"]
+    lower = partition_config["lower"]
+    upper = partition_config["upper"]
+    num_partitions = partition_config["num_partitions"]
+    if num_partitions == 1:
+        return [("1 = 1", {})]
+
+    stride = (upper - lower) / num_partitions
+    if isinstance(lower, int) and isinstance(upper, int):
+        bounds = [lower + round(i * stride) for i in range(1, num_partitions)]
+    else:
+        bounds = [lower + i * stride for i in range(1, num_partitions)]
+    predicates = [
+        (
+            "{0} < :mllp_upper OR {0} IS NULL".format(column),
+            {"mllp_upper": bounds[0]},
+        )
+    ]
+    for low, high in zip(bounds, bounds[1:]):
+        predicates.append(
+            (
+                "{0} >= :mllp_lower AND {0} < :mllp_upper".format(column),
+                {"mllp_lower": low, "mllp_upper": high},
+            )
+        )
+    predicates.append(
+        ("{} >= :mllp_lower".format(column), {"mllp_lower": bounds[-1]})
+    )
+    return predicates
+
+
+def _check_partition_config(ds_id: str, partition_config: Dict) -> None:
+    missing = {"column", "lower", "upper", "num_partitions"} - set(
+        partition_config
+    )
+    if missing:
+        raise ValueError(
+            "Datasource {}: partition is missing {}".format(
+                ds_id, ", ".join(sorted(missing))
+            )
+        )
+    num_partitions = partition_config["num_partitions"]
+    if not isinstance(num_partitions, int) or num_partitions < 1:
+        raise ValueError(
+            "Datasource {}: partition:num_partitions must be a positive "
+            "integer, got {}".format(ds_id, num_partitions)
+        )
+    if not partition_config["lower"] < partition_config["upper"]:
+        raise ValueError(
+            "Datasource {}: partition:lower must be less than "
+            "partition:upper".format(ds_id)
+        )
+
+
 class SqlDataSource(DataSource):
     """DataSource for RedShift, Postgres, MySQL, SQLite, Oracle, Microsoft SQL (ODBC), and their dialects.
 
@@ -127,6 +501,10 @@ class SqlDataSource(DataSource):
 
     * Any ``dbms:``-level settings other than ``type:``, ``connection_string:`` and ``options:`` will be passed as additional
       keyword arguments to SQLAlchemy's `create_engine <https://docs.sqlalchemy.org/en/13/core/engines.html#sqlalchemy.create_engine>`_.
+      This includes the connection pool settings ``pool_size:``, ``max_overflow:``, ``pool_recycle:`` and ``pool_pre_ping:``
+      (see `Connection Pooling <https://docs.sqlalchemy.org/en/13/core/pooling.html>`_).
+      All datasources and datasinks of a ``dbms:`` entry share the same engine (and pool) in a process.
+      To monitor connection checkouts and how long it takes to open new connections, use :func:`get_connection_pool_stats`.
     * Any key-value pairs inside ``dbms:<name>:options: {}`` will be passed to SQLAlchemy as `connect_args <https://docs.sqlalchemy.org/en/13/core/engines.html#sqlalchemy.create_engine.params.connect_args>`_.
       If you append ``_var`` to the end of an argument key, its value will be interpreted as an
       environment variable name which ML Launchpad will attempt to get a value from.
@@ -142,6 +520,10 @@ class SqlDataSource(DataSource):
             connection_string: mssql+pyodbc:///default?&driver=Cloudera+ODBC+Driver+for+Impala&host=servername.somedomain.com&port=21050&authmech=1&krbservicename=impala&ssl=1&usesasl=1&ignoretransactions=1&usesystemtruststore=1
             # pyodbc alternative: mssql+pyodbc:///?odbc_connect=DRIVER%3D%7BCloudera+ODBC+Driver+for+Impala%7D%3BHOST%3Dservername.somedomain.com%3BPORT%3D21050%3BAUTHMECH%3D1%3BKRBSERVICENAME%3Dimpala%3BSSL%3D1%3BUSESASL%3D1%3BIGNORETRANSACTIONS%3D1%3BUSESYSTEMTRUSTSTORE%3D1
             echo: True  # example for an additional SQLAlchemy keyword argument (logs the SQL) -- these are optional
+            pool_size: 5  # optional pool settings: number of connections to keep open
+            max_overflow: 10  # number of additional connections to open when all pooled ones are in use
+            pool_recycle: 3600  # replace connections after this many seconds
+            pool_pre_ping: True  # check connections before using them
             options: {}  # used as `connect_args` when creating the SQLAlchemy engine
         # ...
         datasources:
@@ -152,6 +534,28 @@ class SqlDataSource(DataSource):
             expires: 0    # generic parameter, see documentation on DataSources
             tags: [train] # generic parameter, see documentation on DataSources and DataSinks
             options: {}   # used as **kwargs when fetching the query using `pandas.read_sql`
+
+    Large tables can be read faster using several connections in parallel.
+    For this, specify a numeric column and its approximate range of values, and
+    the number of partitions to split this range into (cf. Spark's partitioned JDBC reads)::
+
+          my_large_datasource:
+            type: dbms.my_connection
+            query: SELECT * FROM somewhere.my_large_table
+            partition:
+              column: id          # numeric column, ideally indexed
+              lower: 0            # approximate minimum value
+              upper: 100000000    # approximate maximum value
+              num_partitions: 8   # number of queries to run in parallel
+            expires: 0
+            tags: [train]
+
+    Rows outside of ``lower`` and ``upper`` (and those with NULLs in ``column``)
+    are still returned, but are all read by the first or last partition query.
+    The partitions are concatenated in order. When using `chunksize`, the partitions
+    are instead read one after another, in chunks, so that only one chunk at a time
+    is held in memory. Make sure the dbms's ``pool_size:`` (default: 5)
+    plus ``max_overflow:`` (default: 10) allows for ``num_partitions`` connections.
     """
 
     serves = ["dbms.sql"]
@@ -163,12 +567,18 @@ class SqlDataSource(DataSource):
 
         self.dbms_config = dbms_config
 
+        self.partition = self.config.get("partition")
+        if self.partition is not None:
+            _check_partition_config(self.id, self.partition)
+
         logger.info(
-            "Creating database connection engine for datasource {}...".format(
+            "Getting database connection engine for datasource {}...".format(
                 self.id
             )
         )
-        self.engine = _create_sqlalchemy_engine(dbms_config)
+        self.engine = _get_shared_engine(
+            self.config, dbms_config, _SharedSqlAlchemyEngine
+        ).engine
 
     def get_dataframe(
         self, params: Dict = None, chunksize: Optional[int] = None
@@ -200,16 +610,76 @@ class SqlDataSource(DataSource):
                 query, params, chunksize, kw_options
             )
         )
-        df = pd.read_sql(
-            text(query),
-            con=self.engine,
-            params=params,
-            chunksize=chunksize,
-            **kw_options
-        )
+        if self.partition is not None:
+            partitions = self._read_partitions(
+                self.partition, text, query, params, chunksize
+            )
+            if chunksize is None:
+                df = pd.concat(list(partitions), ignore_index=True)
+            else:
+                df = partitions
+        else:
+            df = pd.read_sql(
+                text(query),
+                con=self.engine,
+                params=params,
+                chunksize=chunksize,
+                **kw_options
+            )
 
         return fill_nas(df, as_generator=chunksize is not None)
 
+    def _read_partitions(
+        self,
+        partition: Dict,
+        text: Callable,
+        query: str,
+        params: Dict,
+        chunksize: Optional[int] = None,
+    ) -> Generator[pd.DataFrame, None, None]:
+        predicates = _get_partition_predicates(partition)
+        num_partitions = len(predicates)
+
+        def read_partition(predicate_and_params, chunksize=None):
+            predicate, predicate_params = predicate_and_params
+            partition_query = (
+                "SELECT * FROM ({}) mllp_partition WHERE {}".format(
+                    query, predicate
+                )
+            )
+            return pd.read_sql(
+                text(partition_query),
+                con=self.engine,
+                params={**params, **predicate_params},
+                chunksize=chunksize,
+                **self.options
+            )
+
+        if chunksize is not None:
+            # Stream one partition after another, so that only one chunk
+            # is in memory at a time instead of all partitions
+            for predicate_and_params in predicates:
+                yield from read_partition(predicate_and_params, chunksize)
+            return
+
+        start = time()
+        with ThreadPoolExecutor(
+            max_workers=num_partitions,
+            thread_name_prefix="partition-{}".format(self.id),
+        ) as executor:
+            # Read all partitions in parallel, but return them in order
+            pending = deque(
+                executor.submit(read_partition, p) for p in predicates
+            )
+            while pending:
+                yield pending.popleft().result()
+        logger.debug(
+            "Read %s partitions of datasource %s in %.2f s",
+            num_partitions,
+            self.id,
+            time() - start,
+        )
+
     def get_raw(
         self, params: Dict = None, chunksize: Optional[int] = None
     ) -> Raw:
@@ -246,6 +716,10 @@ class SqlDataSink(DataSink):
 
     * Any ``dbms:``-level settings other than ``type:``, ``connection_string:`` and ``options:`` will be passed as additional
       keyword arguments to SQLAlchemy's `create_engine <https://docs.sqlalchemy.org/en/13/core/engines.html#sqlalchemy.create_engine>`_.
+      This includes the connection pool settings ``pool_size:``, ``max_overflow:``, ``pool_recycle:`` and ``pool_pre_ping:``
+      (see `Connection Pooling <https://docs.sqlalchemy.org/en/13/core/pooling.html>`_).
+      All datasources and datasinks of a ``dbms:`` entry share the same engine (and pool) in a process.
+      To monitor connection checkouts and how long it takes to open new connections, use :func:`get_connection_pool_stats`.
     * Any key-value pairs inside ``dbms:<name>:options: {}`` will be passed to SQLAlchemy as `connect_args <https://docs.sqlalchemy.org/en/13/core/engines.html#sqlalchemy.create_engine.params.connect_args>`_.
       If you append ``_var`` to the end of an argument key, its value will be interpreted as an
       environment variable name which ML Launchpad will attempt to get a value from.
@@ -261,6 +735,10 @@ class SqlDataSink(DataSink):
             connection_string: mssql+pyodbc:///default?&driver=Cloudera+ODBC+Driver+for+Impala&host=servername.somedomain.com&port=21050&authmech=1&krbservicename=impala&ssl=1&usesasl=1&ignoretransactions=1&usesystemtruststore=1
             # pyodbc alternative: mssql+pyodbc:///?odbc_connect=DRIVER%3D%7BCloudera+ODBC+Driver+for+Impala%7D%3BHOST%3Dservername.somedomain.com%3BPORT%3D21050%3BAUTHMECH%3D1%3BKRBSERVICENAME%3Dimpala%3BSSL%3D1%3BUSESASL%3D1%3BIGNORETRANSACTIONS%3D1%3BUSESYSTEMTRUSTSTORE%3D1
             echo: True  # example for an additional SQLAlchemy keyword argument (logs the SQL) -- these are optional
+            pool_size: 5  # optional pool settings: number of connections to keep open
+            max_overflow: 10  # number of additional connections to open when all pooled ones are in use
+            pool_recycle: 3600  # replace connections after this many seconds
+            pool_pre_ping: True  # check connections before using them
             options: {}  # used as `connect_args` when creating the SQLAlchemy engine
         # ...
         datasinks:
@@ -270,6 +748,14 @@ class SqlDataSink(DataSink):
             table: somewhere.my_table
             tags: [train] # generic parameter, see documentation on DataSources and DataSinks
             options: {}   # used as **kwargs when storing the table using `my_df.to_sql`
+
+    For large amounts of data, pass a generator of DataFrames and/or a
+    ``chunksize`` to :meth:`put_dataframe`, and consider setting one of these
+    insertion methods in the datasink's ``options``:
+
+    * ``method: multi``: Insert ``chunksize`` rows per ``INSERT`` statement.
+    * ``method: copy``: Use PostgreSQL's ``COPY`` command, which is the fastest
+      way to load data into PostgreSQL (requires the psycopg2 driver).
     """
 
     serves = ["dbms.sql"]
@@ -282,15 +768,17 @@ class SqlDataSink(DataSink):
         self.dbms_config = dbms_config
 
         logger.info(
-            "Creating database connection engine for datasource {}...".format(
+            "Getting database connection engine for datasource {}...".format(
                 self.id
             )
         )
-        self.engine = _create_sqlalchemy_engine(dbms_config)
+        self.engine = _get_shared_engine(
+            self.config, dbms_config, _SharedSqlAlchemyEngine
+        ).engine
 
     def put_dataframe(
         self,
-        dataframe: pd.DataFrame,
+        dataframe: Union[pd.DataFrame, Iterable[pd.DataFrame]],
         params: Dict = None,
         chunksize: Optional[int] = None,
     ) -> None:
@@ -302,29 +790,35 @@ class SqlDataSink(DataSink):
 
             data_sinks["my_datasink"].put_dataframe(my_df)
 
-        :param dataframe: The pandas dataframe to store
-        :type dataframe: pandas DataFrame
+        :param dataframe: The pandas dataframe to store, or an iterable (e.g. generator) of dataframes which are all stored in the table in one transaction
+        :type dataframe: pandas DataFrame or iterable of pandas DataFrames
         :param params: Currently not implemented
         :type params: optional dict
-        :param chunksize: Currently not implemented
-        :type chunksize: optional bool
+        :param chunksize: Number of rows to write to the database at once
+        :type chunksize: optional int
         """
         if params:
             raise NotImplementedError("Parameters not supported yet")
-        if chunksize:
-            raise NotImplementedError("Buffered storing not supported yet")
 
         table = self.config["table"]
-        kw_options = self.options
+        kw_options = dict(self.options)
         if "index" not in kw_options:
             kw_options["index"] = False
+        if kw_options.get("method") == "copy":
+            kw_options["method"] = _postgres_copy_insert
 
         logger.debug(
-            "Storing data in table {} with options {}...".format(
-                table, kw_options
+            "Storing data in table {} with chunksize {} and options {}...".format(
+                table, chunksize, kw_options
             )
         )
-        dataframe.to_sql(table, con=self.engine, **kw_options)
+        if isinstance(dataframe, pd.DataFrame) and not chunksize:
+            dataframe.to_sql(table, con=self.engine, **kw_options)
+        else:
+            with self.engine.begin() as connection:
+                _write_dataframes(
+                    dataframe, table, connection, chunksize, kw_options
+                )
 
     def put_raw(
         self, raw_data, params: Dict = None, chunksize: Optional[int] = None
@@ -339,13 +833,11 @@ class SqlDataSink(DataSink):
         )
 
 
-def _get_oracle_connection(dbms_config: Dict):
-    import cx_Oracle  # Importing here avoids environment-specific dependencies
-
+def _create_oracle_pool(driver, dbms_config: Dict):
     user, pw = get_user_pw(
         dbms_config["user_var"], dbms_config["password_var"]
     )
-    dsn_tns = cx_Oracle.makedsn(
+    dsn_tns = driver.makedsn(
         dbms_config["host"],
         dbms_config["port"],
         service_name=dbms_config["service_name"],
@@ -353,15 +845,113 @@ def _get_oracle_connection(dbms_config: Dict):
     logger.debug("Oracle connection string: %s", dsn_tns)
 
     kw_options = dbms_config.get("options", {})
-    connection = cx_Oracle.connect(user, pw, dsn_tns, **kw_options)
+    pool_args = dict(
+        user=user,
+        password=pw,
+        dsn=dsn_tns,
+        min=dbms_config.get("pool_min", 1),
+        max=dbms_config.get("pool_size", 5),
+        increment=1,
+        **kw_options
+    )
+    if hasattr(driver, "create_pool"):  # python-oracledb
+        return driver.create_pool(**pool_args)
+    return driver.SessionPool(threaded=True, **pool_args)
+
+
+class _SharedOraclePool(_SharedEngine):
+    """Oracle session pool which counts the connections checked out from
+    it and times how long that takes.
+    """
+
+    def __init__(self, name: str, dbms_config: Dict):
+        # Importing here avoids environment-specific dependencies.
+        # The driver can also be python-oracledb, cx_Oracle's successor.
+        self.driver = importlib.import_module(
+            dbms_config.get("driver", "cx_Oracle")
+        )
+        super().__init__(name, _create_oracle_pool(self.driver, dbms_config))
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        start = perf_counter()
+        connection = self.engine.acquire()
+        seconds = perf_counter() - start
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds += seconds
+            self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+        return connection
+
+    def release(self, connection) -> None:
+        self.engine.release(connection)
+
+    def release_after(self, chunks: Iterable, connection) -> Generator:
+        """Yield the items of `chunks`, then release `connection`."""
+        try:
+            yield from chunks
+        finally:
+            self.release(connection)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checkout_seconds_total": self.checkout_seconds,
+                "checkout_seconds_max": self.max_checkout_seconds,
+                "checkout_seconds_mean": (
+                    self.checkout_seconds / self.checkouts
+                    if self.checkouts
+                    else 0.0
+                ),
+            }
+        stats["pool_status"] = "Sessions open: {}, busy: {}, max: {}".format(
+            self.engine.opened, self.engine.busy, self.engine.max
+        )
+        return stats
 
-    return connection
+    def close(self) -> None:
+        self.engine.close(force=True)
+
+
+class _TunedConnection:
+    """Wraps a DB-API connection so that its cursors fetch `arraysize` rows
+    per network round trip and prefetch `prefetchrows` rows when executing.
+    Used to pass these settings through ``pandas.read_sql``.
+    """
+
+    def __init__(
+        self,
+        connection,
+        arraysize: Optional[int] = None,
+        prefetchrows: Optional[int] = None,
+    ):
+        self._connection = connection
+        self._arraysize = arraysize
+        self._prefetchrows = prefetchrows
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._connection.cursor(*args, **kwargs)
+        if self._arraysize is not None:
+            cursor.arraysize = self._arraysize
+        if self._prefetchrows is not None:
+            cursor.prefetchrows = self._prefetchrows
+        return cursor
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
 
 
 class OracleDataSource(DataSource):
     """DataSource for Oracle database connections.
 
-    Creates a long-living connection on initialization.
+    Uses a session pool which is shared by all Oracle DataSources and
+    DataSinks of the same ``dbms:`` entry. Each call takes a connection
+    from the pool and returns it afterwards (with `chunksize`: after the
+    last chunk has been fetched).
 
     Configuration example::
 
@@ -374,7 +964,10 @@ class OracleDataSource(DataSource):
             user_var: MY_USER_ENV_VAR
             password_var: MY_PW_ENV_VAR  # optional
             service_name: servicename.example.com
-            options: {}  # used as **kwargs when initializing the DB connection
+            driver: cx_Oracle  # optional, default: cx_Oracle, alternative: oracledb (python-oracledb)
+            pool_size: 5  # optional: maximum number of sessions in the pool, default: 5
+            pool_min: 1   # optional: number of sessions to keep open, default: 1
+            options: {}  # used as **kwargs when creating the session pool
         # ...
         datasources:
           # ... (other datasources)
@@ -383,7 +976,19 @@ class OracleDataSource(DataSource):
             query: SELECT * FROM somewhere.my_table where id = :id  # fill `:params` by calling `get_dataframe` with a `dict`
             expires: 0    # generic parameter, see documentation on DataSources
             tags: [train] # generic parameter, see documentation on DataSources and DataSinks
+            arraysize: 10000      # optional: rows to fetch per network round trip, driver default: 100
+            prefetchrows: 10001   # optional: rows to fetch together with executing the query, driver default: 2
+            fetch: pandas         # optional: `pandas` (default) or `arrow` (see below)
             options: {}   # used as **kwargs when fetching the query using `pandas.read_sql`
+
+    For large results, increasing ``arraysize:`` greatly reduces the number of
+    network round trips (at the cost of memory for buffering the rows).
+
+    With ``fetch: arrow``, the driver creates the columns of the data directly
+    in Apache Arrow format instead of creating Python objects for every row,
+    which are then converted by pandas. This is much faster for large results and
+    requires ``driver: oracledb`` (python-oracledb 3.0 or newer) and ``pyarrow``.
+    The ``options:`` are not used in this case.
     """
 
     serves = ["dbms.oracle"]
@@ -394,13 +999,32 @@ class OracleDataSource(DataSource):
         super().__init__(identifier, datasource_config)
 
         self.dbms_config = dbms_config
+        self.arraysize = self.config.get("arraysize")
+        self.prefetchrows = self.config.get("prefetchrows")
+        self.fetch = self.config.get("fetch", "pandas")
+        if self.fetch not in ["pandas", "arrow"]:
+            raise ValueError(
+                "Datasource {}: fetch must be pandas or arrow, got {}".format(
+                    self.id, self.fetch
+                )
+            )
 
         logger.info(
             "Establishing Oracle database connection for datasource {}...".format(
                 self.id
             )
         )
-        self.connection = _get_oracle_connection(dbms_config)
+        self.pool = cast(
+            _SharedOraclePool,
+            _get_shared_engine(self.config, dbms_config, _SharedOraclePool),
+        )
+        if self.fetch == "arrow" and not hasattr(
+            self.pool.driver.Connection, "fetch_df_all"
+        ):
+            raise ValueError(
+                "Datasource {}: fetch: arrow needs python-oracledb>=3.0 "
+                "(driver: oracledb)".format(self.id)
+            )
 
     def get_dataframe(
         self, params: Dict = None, chunksize: Optional[int] = None
@@ -430,14 +1054,49 @@ class OracleDataSource(DataSource):
                 query, params, chunksize, kw_options
             )
         )
-        df = pd.read_sql(
-            query,
-            con=self.connection,
-            params=params,
-            chunksize=chunksize,
-            **kw_options
+        connection = self.pool.acquire()
+        try:
+            if self.fetch == "arrow":
+                df = self._fetch_arrow(connection, query, params, chunksize)
+            else:
+                con = connection
+                if self.arraysize is not None or self.prefetchrows is not None:
+                    con = _TunedConnection(
+                        connection, self.arraysize, self.prefetchrows
+                    )
+                df = pd.read_sql(
+                    query,
+                    con=con,
+                    params=params,
+                    chunksize=chunksize,
+                    **kw_options
+                )
+        except Exception:
+            self.pool.release(connection)
+            raise
+        if chunksize is None:
+            self.pool.release(connection)
+            return fill_nas(df)
+        # Keep the connection until all chunks have been fetched
+        return fill_nas(
+            self.pool.release_after(df, connection), as_generator=True
+        )
+
+    def _fetch_arrow(
+        self, connection, query: str, params: Dict, chunksize: Optional[int]
+    ) -> Union[pd.DataFrame, Generator]:
+        pa = _import_pyarrow()
+        if chunksize is None:
+            odf = connection.fetch_df_all(
+                query, params, arraysize=self.arraysize
+            )
+            return pa.table(odf).to_pandas()
+        return (
+            pa.table(odf).to_pandas()
+            for odf in connection.fetch_df_batches(
+                query, params, size=chunksize
+            )
         )
-        return fill_nas(df, as_generator=chunksize is not None)
 
     def get_raw(
         self, params: Dict = None, chunksize: Optional[int] = None
@@ -451,15 +1110,14 @@ class OracleDataSource(DataSource):
             'Use method "get_dataframe" for dataframes'
         )
 
-    def __del__(self):
-        if hasattr(self, "connection"):
-            self.connection.close()
-
 
 class OracleDataSink(DataSink):
     """DataSink for Oracle database connections.
 
-    Creates a long-living connection on initialization.
+    Uses a session pool which is shared by all Oracle DataSources and
+    DataSinks of the same ``dbms:`` entry. Each call takes a connection
+    from the pool and returns it afterwards (with `chunksize`: after the
+    last chunk has been fetched).
 
     Configuration example::
 
@@ -472,7 +1130,8 @@ class OracleDataSink(DataSink):
             user_var: MY_USER_ENV_VAR
             password_var: MY_PW_ENV_VAR  # optional
             service_name: servicename.example.com
-            options: {}  # used as **kwargs when initializing the DB connection
+            pool_size: 5  # optional: maximum number of sessions in the pool, default: 5
+            options: {}  # used as **kwargs when creating the session pool
         # ...
         datasinks:
           # ... (other datasinks)
@@ -498,11 +1157,14 @@ class OracleDataSink(DataSink):
             )
         )
 
-        self.connection = _get_oracle_connection(dbms_config)
+        self.pool = cast(
+            _SharedOraclePool,
+            _get_shared_engine(self.config, dbms_config, _SharedOraclePool),
+        )
 
     def put_dataframe(
         self,
-        dataframe: pd.DataFrame,
+        dataframe: Union[pd.DataFrame, Iterable[pd.DataFrame]],
         params: Dict = None,
         chunksize: Optional[int] = None,
     ) -> None:
@@ -514,30 +1176,37 @@ class OracleDataSink(DataSink):
 
             data_sinks["my_datasink"].put_dataframe(my_df)
 
-        :param dataframe: The pandas dataframe to store
-        :type dataframe: pandas DataFrame
+        :param dataframe: The pandas dataframe to store, or an iterable (e.g. generator) of dataframes which are all stored in the table
+        :type dataframe: pandas DataFrame or iterable of pandas DataFrames
         :param params: Currently not implemented
         :type params: optional dict
-        :param chunksize: Currently not implemented
-        :type chunksize: optional bool
+        :param chunksize: Number of rows to write to the database at once (using `executemany`)
+        :type chunksize: optional int
         """
         if params:
             raise NotImplementedError("Parameters not supported yet")
-        if chunksize:
-            raise NotImplementedError("Buffered storing not supported yet")
 
         # TODO: maybe want to open/close connection on every method call (shouldn't happen often)
         table = self.config["table"]
-        kw_options = self.options
+        kw_options = dict(self.options)
         if "index" not in kw_options:
             kw_options["index"] = False
 
         logger.debug(
-            "Storing data in table {} with options {}...".format(
-                table, kw_options
+            "Storing data in table {} with chunksize {} and options {}...".format(
+                table, chunksize, kw_options
             )
         )
-        dataframe.to_sql(table, con=self.connection, **kw_options)
+        connection = self.pool.acquire()
+        try:
+            if isinstance(dataframe, pd.DataFrame) and not chunksize:
+                dataframe.to_sql(table, con=connection, **kw_options)
+            else:
+                _write_dataframes(
+                    dataframe, table, connection, chunksize, kw_options
+                )
+        finally:
+            self.pool.release(connection)
 
     def put_raw(
         self, raw_data, params: Dict = None, chunksize: Optional[int] = None
@@ -551,10 +1220,6 @@ class OracleDataSink(DataSink):
             'Use method "put_dataframe" for raw data'
         )
 
-    def __del__(self):
-        if hasattr(self, "connection"):
-            self.connection.close()
-
 
 class FileDataSource(DataSource):
     """DataSource for fetching data from files.
@@ -571,17 +1236,74 @@ class FileDataSource(DataSource):
             expires: 0    # generic parameter, see documentation on DataSources
             tags: [train] # generic parameter, see documentation on DataSources and DataSinks
             options: {}   # used as **kwargs when fetching the data using `pandas.read_csv`
+          my_validated_datasource:
+            type: csv
+            path: /some/large_file.csv
+            expires: -1     # cache until the file changes...
+            validate: mtime # ...as determined by its size and modification time
+            tags: [predict]
+          my_daily_datasource:
+            type: csv
+            path: /some/dir/2026-10-*.csv  # glob pattern or directory: read all matching files
+            workers: 4      # optional: number of processes to parse the files with, default: number of CPUs
+            partition_column: date  # optional: add a column with the value of a "date=..." directory or else the file name
+            expires: 0
+            tags: [train]
           my_raw_datasource:
             type: text_file  # raw files can also be of type `binary_file`
             path: /some/file.txt  # Can be URL
             expires: 0    # generic parameter, see documentation on DataSources
             tags: [train] # generic parameter, see documentation on DataSources and DataSinks
             options: {}   # used as **kwargs when fetching the data using `fh.read`
+          my_large_raw_datasource:
+            type: binary_file
+            path: /some/embeddings.bin
+            mmap: True    # optional: memory-map the file instead of reading it, default: False
+            expires: -1
+            tags: [predict]
+          my_arrow_datasource:
+            type: parquet  # also available: `feather` and `arrow_ipc` (needs `pyarrow`)
+            path: /some/file.parquet
+            expires: 0    # generic parameter, see documentation on DataSources
+            tags: [train] # generic parameter, see documentation on DataSources and DataSinks
+            options:
+              columns: [a, b]    # optional: only read these columns
+              memory_map: True   # optional: memory-map the file if possible, default: True
+              # all other options are used as **kwargs when converting using `pyarrow.Table.to_pandas`
+
+    The types `parquet`, `feather` and `arrow_ipc` are read using
+    `pyarrow <https://arrow.apache.org/docs/python/>`_ and
+    are much faster to read than csv, as they are stored in a columnar binary format.
+    Using `chunksize`, Parquet files are read row group by row group, never
+    loading the whole file at once. Arrow IPC (`arrow_ipc`, uncompressed) files can be
+    memory-mapped without copying their data.
+
+    If `path` is a glob pattern (containing ``*``, ``?`` or ``[``) or a directory, all
+    matching files (in a directory: recursively, except for those starting with ``.`` or ``_``)
+    are parsed in parallel using a pool of ``workers`` processes and concatenated in
+    the order of their paths. Using `chunksize`, the files are read one after another
+    instead, and each chunk contains rows of one file only. With ``partition_column``,
+    a column of this name is added containing, for each file, the value of a Hive-style
+    directory ``<partition_column>=<value>`` in its path, or else its file name without extension,
+    e.g. ``2026-10-01`` for ``/some/dir/2026-10-01.csv``.
 
     Using the raw formats `binary_file` and `text_file`, you can read arbitrary data, as long as
     it can be represented as a `bytes` or a `str` object, respectively. Please note that while possible, it is not
     recommended to persist `DataFrame`s this way, because by adding format-specific code to your
     model, you're giving up your code's independence from the type of `DataSource`/`DataSink`.
+
+    For large `binary_file`s, use ``mmap: True`` to get a read-only `memoryview`
+    of the memory-mapped file, which only loads the parts of the file that are
+    actually accessed, and shares them between processes (e.g. using
+    ``numpy.frombuffer``). Cached items keep the mapping, not a copy of the data.
+    Using `get_raw`'s `chunksize` parameter, `binary_file` sources are read in blocks
+    of `chunksize` bytes and `text_file` sources in blocks of `chunksize` lines.
+
+    With ``validate: mtime`` (requires ``expires`` other than 0), cached items are
+    additionally reloaded as soon as the file's size or modification time changes,
+    which costs one ``os.stat`` call per access. This way, a large file can be cached
+    indefinitely (``expires: -1``) without ever serving stale data.
+
     Here's an example for unpickling an arbitrary object::
 
         # config fragment:
@@ -617,6 +1339,49 @@ class FileDataSource(DataSource):
 
         self.type = ds_type
         self.path = datasource_config["path"]
+        self.mmap = datasource_config.get("mmap", False)
+        if self.mmap and ds_type != "binary_file":
+            raise ValueError(
+                "Datasource {}: mmap is only supported for binary_file".format(
+                    identifier
+                )
+            )
+        if self.validate not in [None, "mtime"]:
+            raise ValueError(
+                "Datasource {}: validate must be mtime, got {}".format(
+                    identifier, self.validate
+                )
+            )
+        if self.validate and "://" in self.path:
+            raise ValueError(
+                "Datasource {}: validate is only supported for local files".format(
+                    identifier
+                )
+            )
+        self.workers = datasource_config.get("workers")
+        self.partition_column = datasource_config.get("partition_column")
+        if ds_type in ["text_file", "binary_file"] and self._is_multi_file():
+            raise ValueError(
+                "Datasource {}: several files are only supported for "
+                "dataframe types".format(identifier)
+            )
+
+    def _get_version(self, params: Optional[Dict]) -> Any:
+        if self.validate != "mtime":
+            return None
+        try:
+            if self._is_multi_file():
+                # Also notices added and removed files
+                paths = self._get_paths()
+            else:
+                paths = [self.path]
+            stats = [os.stat(path) for path in paths]
+        except OSError:
+            return None  # Let the read raise the appropriate error
+        return [
+            [path, stat.st_size, stat.st_mtime_ns]
+            for path, stat in zip(paths, stats)
+        ]
 
     def get_dataframe(
         self, params: Dict = None, chunksize: Optional[int] = None
@@ -637,33 +1402,103 @@ class FileDataSource(DataSource):
         if params:
             raise NotImplementedError("Parameters not supported yet")
 
-        kw_options = self.options
+        if self._is_multi_file():
+            return self._get_multi_file_dataframe(chunksize)
 
         logger.debug(
             "Loading type {} file {} with chunksize {} and options {}...".format(
-                self.type, self.path, chunksize, kw_options
+                self.type, self.path, chunksize, self.options
             )
         )
-        if self.type == "csv":
-            df = pd.read_csv(self.path, chunksize=chunksize, **kw_options)
-        elif self.type == "euro_csv":
-            df = pd.read_csv(
-                self.path,
-                sep=";",
-                decimal=",",
-                chunksize=chunksize,
-                **kw_options
-            )
+        return _read_dataframe_file(
+            self.type, self.path, self.options, chunksize
+        )
+
+    def _is_multi_file(self) -> bool:
+        if not isinstance(self.path, str) or "://" in self.path:
+            return False
+        return any(c in self.path for c in "*?[") or os.path.isdir(self.path)
+
+    def _get_paths(self) -> List[str]:
+        if os.path.isdir(self.path):
+            pattern = os.path.join(self.path, "**", "*")
         else:
-            raise TypeError(
-                'Can only read csv files as dataframes. Use method "get_raw" for raw data'
+            pattern = self.path
+        # Leave out hidden files and markers like _SUCCESS
+        paths = sorted(
+            p
+            for p in glob.glob(pattern, recursive=True)
+            if os.path.isfile(p)
+            and not os.path.basename(p).startswith((".", "_"))
+        )
+        if not paths:
+            raise FileNotFoundError(
+                "Datasource {}: no files found for path {}".format(
+                    self.id, self.path
+                )
             )
+        return paths
 
-        return df
+    def _get_multi_file_dataframe(
+        self, chunksize: Optional[int] = None
+    ) -> Union[pd.DataFrame, Generator]:
+        paths = self._get_paths()
+        logger.debug(
+            "Loading %s type %s files from %s with chunksize %s and options %s...",
+            len(paths),
+            self.type,
+            self.path,
+            chunksize,
+            self.options,
+        )
+        if chunksize is not None:
+            return self._iter_files(paths, chunksize)
+
+        workers = min(self.workers or os.cpu_count() or 1, len(paths))
+        if workers == 1:
+            dfs = [
+                _read_dataframe_file(self.type, path, self.options)
+                for path in paths
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                dfs = list(
+                    executor.map(
+                        _read_dataframe_file,
+                        [self.type] * len(paths),
+                        paths,
+                        [self.options] * len(paths),
+                    )
+                )
+        for path, df in zip(paths, dfs):
+            self._add_partition_column(df, path)
+        return pd.concat(dfs, ignore_index=True)
+
+    def _iter_files(self, paths: List[str], chunksize: int) -> Generator:
+        for path in paths:
+            for chunk in _read_dataframe_file(
+                self.type, path, self.options, chunksize
+            ):
+                self._add_partition_column(chunk, path)
+                yield chunk
+
+    def _add_partition_column(self, df: pd.DataFrame, path: str) -> None:
+        column = self.partition_column
+        if column is None:
+            return
+        # Hive-style "column=value" directory, or else the file's name
+        prefix = column + "="
+        for part in reversed(os.path.normpath(path).split(os.sep)):
+            if part.startswith(prefix):
+                value = part.split("=", 1)[1]
+                break
+        else:
+            value = os.path.splitext(os.path.basename(path))[0]
+        df[column] = value
 
     def get_raw(
         self, params: Dict = None, chunksize: Optional[int] = None
-    ) -> Raw:
+    ) -> Union[Raw, Generator]:
         """Get data as raw (unstructured) data.
 
         Example::
@@ -672,40 +1507,68 @@ class FileDataSource(DataSource):
 
         :param params: Currently not implemented
         :type params: optional dict
-        :param chunksize: Currently not implemented
-        :type chunksize: optional bool
+        :param chunksize: Return an iterator of blocks of chunksize bytes (binary) or lines (text) each.
+        :type chunksize: optional int
 
-        :return: The file's bytes (binary) or string (text) contents, possibly cached according to config value of `expires:`
-        :rtype: bytes or str
+        :return: The file's bytes (binary) or string (text) contents, possibly cached according to config value of `expires:`.
+                 With `mmap: True`, a read-only `memoryview` of the memory-mapped file.
+        :rtype: bytes, str or memoryview
         """
         if params:
             raise NotImplementedError("Parameters not supported yet")
-        if chunksize:
-            raise NotImplementedError("Buffered reading not supported yet")
 
         kw_options = self.options
 
         logger.debug(
-            "Loading raw {} {} with options {}...".format(
-                self.type, self.path, kw_options
+            "Loading raw {} {} with chunksize {} and options {}...".format(
+                self.type, self.path, chunksize, kw_options
             )
         )
 
-        raw: Raw
-        if self.type == "text_file":
-            with open(self.path, "r") as txt_file:
-                raw = txt_file.read(**kw_options)
-        elif self.type == "binary_file":
-            with open(self.path, "rb") as bin_file:
-                raw = bin_file.read(**kw_options)
-        else:
+        raw: Union[Raw, Generator]
+        if self.type not in ["text_file", "binary_file"]:
             raise TypeError(
                 "Can only read binary data or text strings as raw file. "
                 'Use method "get_dataframe" for dataframes'
             )
+        elif chunksize:
+            raw = self._iter_raw_chunks(chunksize)
+        elif self.mmap:
+            with open(self.path, "rb") as bin_file:
+                if os.fstat(bin_file.fileno()).st_size == 0:
+                    # Empty files can't be memory-mapped
+                    raw = b""
+                else:
+                    # The mapping stays valid after closing the file
+                    mapped = mmap.mmap(
+                        bin_file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+                    raw = memoryview(mapped)
+        elif self.type == "text_file":
+            with open(self.path, "r") as txt_file:
+                raw = txt_file.read(**kw_options)
+        else:
+            with open(self.path, "rb") as bin_file:
+                raw = bin_file.read(**kw_options)
 
         return raw
 
+    def _iter_raw_chunks(self, chunksize: int) -> Generator:
+        if self.type == "text_file":
+            with open(self.path, "r") as txt_file:
+                while True:
+                    lines = list(islice(txt_file, chunksize))
+                    if not lines:
+                        return
+                    yield "".join(lines)
+        else:
+            with open(self.path, "rb") as bin_file:
+                while True:
+                    block = bin_file.read(chunksize)
+                    if not block:
+                        return
+                    yield block
+
 
 class FileDataSink(DataSink):
     """DataSink for putting data into files.
@@ -726,6 +1589,18 @@ class FileDataSink(DataSink):
             path: /some/file.txt  # Can be URL
             tags: [train] # generic parameter, see documentation on DataSources and DataSinks
             options: {}   # used as **kwargs when writing the data using `fh.write`
+          my_arrow_datasink:
+            type: parquet  # also available: `feather` and `arrow_ipc` (needs `pyarrow`)
+            path: /some/file.parquet
+            tags: [train] # generic parameter, see documentation on DataSources and DataSinks
+            options: {}   # used as **kwargs when writing using `pyarrow.parquet.write_table` or `pyarrow.feather.write_feather`
+
+    The type `arrow_ipc` is always written uncompressed, so that it can be
+    memory-mapped when reading it using a :class:`FileDataSource`.
+
+    Instead of one DataFrame, :meth:`put_dataframe` also accepts an iterable
+    (e.g. a generator) of DataFrames, which are written to the file one
+    after another, without keeping all of them in memory.
 
     Using the raw formats `binary_file` and `text_file`, you can persist arbitrary data, as long as
     it can be represented as a `bytes` or a `str` object, respectively. Please note that while possible, it is not
@@ -768,7 +1643,7 @@ class FileDataSink(DataSink):
 
     def put_dataframe(
         self,
-        dataframe: pd.DataFrame,
+        dataframe: Union[pd.DataFrame, Iterable[pd.DataFrame]],
         params: Dict = None,
         chunksize: Optional[int] = None,
     ) -> None:
@@ -780,8 +1655,8 @@ class FileDataSink(DataSink):
 
             data_sinks["my_datasink"].put_dataframe(my_df)
 
-        :param dataframe: The pandas dataframe to save
-        :type dataframe: pandas DataFrame
+        :param dataframe: The pandas dataframe to save, or an iterable (e.g. generator) of dataframes which are written one after another
+        :type dataframe: pandas DataFrame or iterable of pandas DataFrames
         :param params: Currently not implemented
         :type params: optional dict
         :param chunksize: Currently not implemented
@@ -801,14 +1676,104 @@ class FileDataSink(DataSink):
                 self.type, self.path, kw_options
             )
         )
-        if self.type == "csv":
-            dataframe.to_csv(self.path, **kw_options)
-        elif self.type == "euro_csv":
-            dataframe.to_csv(self.path, sep=";", decimal=",", **kw_options)
+        if self.type in ["csv", "euro_csv"]:
+            if self.type == "euro_csv":
+                kw_options = dict(kw_options, sep=";", decimal=",")
+            if isinstance(dataframe, pd.DataFrame):
+                dataframe.to_csv(self.path, **kw_options)
+            else:
+                header = kw_options.get("header", True)
+                with open(self.path, "w", newline="") as f:
+                    for i, partial_df in enumerate(dataframe):
+                        partial_df.to_csv(
+                            f, **dict(kw_options, header=header and i == 0)
+                        )
+        elif self.type in ARROW_FILE_TYPES:
+            self._put_arrow_dataframe(dataframe)
         else:
             raise TypeError(
-                'Can only write dataframes to csv file. Use method "put_raw" for raw data'
+                "Can only write dataframes to csv, parquet, feather and "
+                'arrow_ipc files. Use method "put_raw" for raw data'
+            )
+
+    def _put_arrow_dataframe(
+        self, dataframe: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+    ) -> None:
+        pa = _import_pyarrow()
+        kw_options = dict(self.options)
+        index = kw_options.pop("index")
+        if not isinstance(dataframe, pd.DataFrame):
+            self._put_arrow_dataframes(pa, dataframe, index, kw_options)
+            return
+        table = pa.Table.from_pandas(dataframe, preserve_index=index)
+        if self.type == "parquet":
+            pa.parquet.write_table(table, self.path, **kw_options)
+        else:
+            if self.type == "arrow_ipc":
+                kw_options = {"compression": "uncompressed", **kw_options}
+            pa.feather.write_feather(table, self.path, **kw_options)
+
+    def _put_arrow_dataframes(
+        self, pa, dataframes: Iterable[pd.DataFrame], index, kw_options: Dict
+    ) -> None:
+        writer = None
+        max_chunksize = None
+        try:
+            for partial_df in dataframes:
+                table = pa.Table.from_pandas(partial_df, preserve_index=index)
+                if writer is None:
+                    schema = table.schema
+                    if self.type == "parquet":
+                        writer = pa.parquet.ParquetWriter(
+                            self.path, schema, **kw_options
+                        )
+                    else:
+                        max_chunksize = kw_options.get("chunksize")
+                        writer = pa.ipc.new_file(
+                            self.path,
+                            schema,
+                            options=self._ipc_write_options(pa, kw_options),
+                        )
+                elif not table.schema.equals(schema):
+                    # e.g. int columns of a chunk without missing values
+                    table = table.cast(schema)
+                if max_chunksize is None:
+                    writer.write_table(table)
+                else:
+                    writer.write_table(table, max_chunksize=max_chunksize)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _ipc_write_options(self, pa, kw_options: Dict):
+        """Translate the options of `pyarrow.feather.write_feather` to the
+        IPC writer which writes an iterable of dataframes
+        """
+        options = dict(kw_options)
+        options.pop("chunksize", None)
+        if options.pop("version", 2) != 2:
+            raise ValueError(
+                "Only feather version 2 files can be written in chunks"
+            )
+        compression = options.pop("compression", None)
+        compression_level = options.pop("compression_level", None)
+        if options:
+            raise ValueError(
+                "Unsupported options for writing {} files in chunks: "
+                "{}".format(self.type, ", ".join(sorted(options)))
             )
+        if compression is None:
+            if self.type == "feather" and pa.Codec.is_available("lz4"):
+                compression = "lz4"
+            else:
+                compression = "uncompressed"
+        if compression == "uncompressed":
+            return pa.ipc.IpcWriteOptions()
+        return pa.ipc.IpcWriteOptions(
+            compression=pa.Codec(
+                compression, compression_level=compression_level
+            )
+        )
 
     def put_raw(
         self,
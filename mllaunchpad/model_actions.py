@@ -3,7 +3,13 @@
 # Stdlib imports
 import logging
 import sys
-from typing import Dict, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from time import time
+from typing import Any, Dict, Optional, Tuple
+
+# Third-party imports
+import pandas as pd
 
 # Project imports
 from mllaunchpad import resource
@@ -236,6 +242,183 @@ def predict(
     return output
 
 
+def batch_predict(
+    complete_conf: Dict,
+    input_name: str,
+    output_name: str,
+    chunksize: int = 10000,
+    workers: int = 1,
+    use_live_code: bool = False,
+) -> Dict:
+    """Carry out prediction for all rows of a datasource and store the
+    results in a datasink.
+
+    The input is read in chunks of `chunksize` rows, so the datasource needs
+    to be configured with ``expires: 0``. Each chunk is passed to the model's
+    :meth:`~mllaunchpad.model_interface.ModelInterface.predict_batch` as a
+    DataFrame. With several `workers`, the chunks are scored in parallel
+    processes, each of which loads the model once. The results are written
+    to the datasink in the order of the input, as a generator of DataFrames
+    (see e.g. :meth:`~mllaunchpad.datasources.FileDataSink.put_dataframe`).
+
+    :param complete_conf: configuration dict
+    :type complete_conf: dict
+    :param input_name: Name of the datasource to get the input data from
+    :type input_name: str
+    :param output_name: Name of the datasink to store the predictions in
+    :type output_name: str
+    :param chunksize: Number of rows to predict at once
+    :type chunksize: optional int, default: 10000
+    :param workers: Number of processes to use for prediction
+    :type workers: optional int, default: 1
+    :param use_live_code: Use the current `predict_batch` function instead of the one persisted with the model in the `model_store`.
+    :type use_live_code: optional bool, default: False
+
+    :return: dict with the number of `rows` and `chunks` predicted, the `seconds` it took, `rows_per_second`, and the peak memory usage of the main and the worker processes in MB (if available on this OS)
+    """
+    logger.info(
+        "Batch prediction from %s to %s with chunksize %s and %s worker(s)...",
+        input_name,
+        output_name,
+        chunksize,
+        workers,
+    )
+    source, sink = _get_batch_source_and_sink(
+        complete_conf, input_name, output_name
+    )
+    chunks = source.get_dataframe(chunksize=chunksize)
+    stats: Dict[str, Any] = {"rows": 0, "chunks": 0}
+
+    def count(results):
+        for result in results:
+            stats["rows"] += len(result)
+            stats["chunks"] += 1
+            logger.debug("Predicted %s rows", stats["rows"])
+            yield result
+
+    start = time()
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(complete_conf, use_live_code),
+        ) as executor:
+            results = _map_in_order(
+                executor, _predict_chunk, chunks, workers * 2
+            )
+            sink.put_dataframe(count(results))
+    else:
+        _init_batch_worker(complete_conf, use_live_code)
+        results = (_predict_chunk(chunk) for chunk in chunks)
+        sink.put_dataframe(count(results))
+    stats["seconds"] = time() - start
+    stats["rows_per_second"] = (
+        stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+    )
+    stats.update(_get_peak_memory_mb())
+    logger.info("Batch prediction done: %s", stats)
+
+    return stats
+
+
+def _get_batch_source_and_sink(
+    complete_conf: Dict, input_name: str, output_name: str
+) -> Tuple[resource.DataSource, resource.DataSink]:
+    """Create only the datasource and datasink used by batch prediction,
+    not any other (e.g. database) ones from the configuration.
+    """
+    sources = complete_conf.get("datasources") or {}
+    sinks = complete_conf.get("datasinks") or {}
+    if input_name not in sources:
+        raise ValueError("Datasource {} not configured".format(input_name))
+    if output_name not in sinks:
+        raise ValueError("Datasink {} not configured".format(output_name))
+    dso, dsi = resource.create_data_sources_and_sinks(
+        {
+            **complete_conf,
+            "datasources": {input_name: sources[input_name]},
+            "datasinks": {output_name: sinks[output_name]},
+        }
+    )
+    return dso[input_name], dsi[output_name]
+
+
+_batch_worker_state: Dict = {}
+
+
+def _init_batch_worker(complete_conf: Dict, use_live_code: bool) -> None:
+    """Load model and the datasources tagged for prediction once per batch
+    prediction worker.
+    """
+    dso, dsi = _get_data_sources_and_sinks(complete_conf, tags=["predict"])
+    model_wrapper, _ = _get_model(complete_conf)
+    if use_live_code:
+        m_cls = _get_model_class(complete_conf)
+        model_wrapper = m_cls(contents=model_wrapper.contents)
+    _batch_worker_state.update(
+        model_conf=complete_conf["model"],
+        model_wrapper=model_wrapper,
+        dso=dso,
+        dsi=dsi,
+    )
+
+
+def _predict_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    state = _batch_worker_state
+    model_wrapper = state["model_wrapper"]
+    output = model_wrapper.predict_batch(
+        state["model_conf"],
+        state["dso"],
+        state["dsi"],
+        model_wrapper.contents,
+        chunk,
+    )
+    if not isinstance(output, pd.DataFrame):
+        output = list(output)
+        if output and isinstance(output[0], dict):
+            output = pd.DataFrame(output)
+        else:
+            output = pd.DataFrame({"prediction": output})
+    if len(output) != len(chunk):
+        raise ValueError(
+            "predict_batch returned {} results for {} rows".format(
+                len(output), len(chunk)
+            )
+        )
+    output.index = chunk.index
+    return output
+
+
+def _map_in_order(executor, func, items, max_pending: int):
+    """Like `executor.map`, but without consuming all `items` at once,
+    so at most `max_pending` items are in memory or being processed.
+    """
+    pending: deque = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _get_peak_memory_mb() -> Dict:
+    try:
+        import resource as rusage  # Not available on Windows
+    except ImportError:
+        return {}
+    # ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+    unit = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "peak_memory_mb": rusage.getrusage(rusage.RUSAGE_SELF).ru_maxrss
+        / unit,
+        "peak_worker_memory_mb": rusage.getrusage(
+            rusage.RUSAGE_CHILDREN
+        ).ru_maxrss
+        / unit,
+    }
+
+
 def clear_caches():
     global _cached_model_stores
     global _cached_model_tuples
@@ -2,6 +2,9 @@
 import abc
 import logging
 
+# Third-party imports
+import pandas as pd
+
 
 logger = logging.getLogger(__name__)
 
@@ -107,6 +110,37 @@ class ModelInterface(abc.ABC):
             Prediction result as a dictionary/list structure which will be automatically turned into JSON.
         """
 
+    def predict_batch(
+        self, model_conf, data_sources, data_sinks, model, args_dicts
+    ):
+        """Optionally implement this method to predict for several requests at once.
+        It is used by the API's ``.../batch`` resources, which receive a
+        DataFrame with one column per parameter, and, if the API has been
+        configured with ``api: batching:``, for batches of concurrent API
+        requests, which are passed as a list of parameter dicts.
+        Models which are able to vectorize their prediction (e.g. by using
+        ``pd.DataFrame(args_dicts)`` and calling the underlying model's
+        ``predict`` only once) will benefit most.
+
+        The default implementation calls predict() once for each item.
+
+        Params:
+            model_conf:   the model configuration dict from the config file
+            data_sources: dict containing the data sources
+            data_sinks:   dict containing the data sinks, as configured in the config file.
+            model:        your model object (whatever you returned in create_trained_model)
+            args_dicts:   list of parameter dicts or DataFrame, one item/row for each set of parameters
+
+        Return:
+            List (or DataFrame or array) of prediction results, one for each item in args_dicts and in the same order.
+        """
+        if isinstance(args_dicts, pd.DataFrame):
+            args_dicts = args_dicts.to_dict(orient="records")
+        return [
+            self.predict(model_conf, data_sources, data_sinks, model, args)
+            for args in args_dicts
+        ]
+
     def __del__(self):
         """Clean up any resources (temporary files, sockets, etc.).
         If you overwrite this method, please call super().__del__() at the beginning.
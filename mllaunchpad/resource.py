@@ -1,17 +1,32 @@
 # Stdlib imports
 import abc
+import bz2
 import getpass
 import glob
+import hashlib
+import io
 import json
 import logging
+import lzma
+import math
+import mmap
 import os
+import re
 import shutil
+import sqlite3
 import sys
+import threading
+import weakref
+import zlib
 from collections import OrderedDict
-from datetime import datetime
-from time import time
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from time import perf_counter, time
 from typing import (
     Any,
+    Callable,
     Dict,
     Generator,
     Iterable,
@@ -32,7 +47,7 @@ import pandas as pd
 
 
 DS = TypeVar("DS", "DataSource", "DataSink")
-Raw = Union[str, bytes]
+Raw = Union[str, bytes, memoryview]
 
 
 logger = logging.getLogger(__name__)
@@ -40,13 +55,616 @@ logger = logging.getLogger(__name__)
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 DATE_FORMAT_FILES = "%Y-%m-%d_%H-%M-%S"
 
+# Model serialization with compression: pickle data and large numpy arrays
+# are split into blocks of this size, which are (de)compressed in parallel
+MODEL_BLOCK_SIZE = 8 * 1024 * 1024
+# Numpy arrays at least this large are stored outside of the pickle data
+MODEL_OUT_OF_BAND_BYTES = 1024 * 1024
+
+
+def _get_codec(
+    compression: str, level: Optional[int] = None
+) -> Tuple[Callable[[Any], bytes], Callable[[Any], bytes]]:
+    """Get compress and decompress functions for `compression`, which
+    are safe to call from several threads at once.
+    """
+    if compression == "zlib":
+        return (
+            lambda data: zlib.compress(data, -1 if level is None else level),
+            zlib.decompress,
+        )
+    elif compression == "bz2":
+        return (
+            lambda data: bz2.compress(data, 9 if level is None else level),
+            bz2.decompress,
+        )
+    elif compression == "lzma":
+        return lambda data: lzma.compress(data, preset=level), lzma.decompress
+    elif compression == "lz4":
+        lz4_frame = _import_optional("lz4.frame", "lz4")
+        return (
+            lambda data: lz4_frame.compress(
+                data, compression_level=level or 0
+            ),
+            lz4_frame.decompress,
+        )
+    elif compression == "zstd":
+        zstandard = _import_optional("zstandard", "zstandard")
+        return (
+            lambda data: zstandard.ZstdCompressor(
+                level=3 if level is None else level
+            ).compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data),
+        )
+    else:
+        raise ValueError(
+            "Model store: compression must be one of none, zlib, bz2, lzma, "
+            "lz4, zstd, got {}".format(compression)
+        )
+
+
+def _import_optional(module_name: str, package: str):
+    try:
+        module = __import__(module_name)
+    except ModuleNotFoundError as e:
+        logger.error(
+            "Please install the %s package to be able to use it for storing models.",
+            package,
+        )
+        raise e
+    for attr in module_name.split(".")[1:]:
+        module = getattr(module, attr)
+    return module
+
+
+# Storing numpy arrays out of band needs pickle protocol 5 (Python 3.8+)
+_OUT_OF_BAND_PICKLING = sys.version_info >= (3, 8)
+
+
+class _OutOfBandPickler(pickle.Pickler):
+    """Pickles numpy arrays as buffers which can be stored out of band
+    (dill itself only does this for subclasses of `ndarray`).
+    """
+
+    def reducer_override(self, obj):
+        if type(obj) is np.ndarray:
+            return obj.__reduce_ex__(5)
+        return NotImplemented
+
+
+def _dump_compressed(
+    obj, f, compression: str, level: Optional[int], threads: Optional[int]
+) -> List[Dict]:
+    """Pickle `obj` into file `f` as blocks compressed in parallel, with large
+    numpy arrays stored out of band, i.e. without copying them into the
+    pickle data (only on Python 3.8+). Returns the sizes which
+    :func:`_load_compressed` needs.
+    """
+    compress, _ = _get_codec(compression, level)
+    buffers = []
+
+    def keep_in_band(buffer) -> bool:
+        raw = buffer.raw()
+        if raw.nbytes < MODEL_OUT_OF_BAND_BYTES:
+            return True
+        buffers.append(raw)
+        return False
+
+    stream = io.BytesIO()
+    if _OUT_OF_BAND_PICKLING:
+        pickler = _OutOfBandPickler(
+            stream, protocol=5, buffer_callback=keep_in_band
+        )
+    else:
+        pickler = pickle.Pickler(stream, protocol=4)
+    pickler.dump(obj)
+    parts = [stream.getbuffer()] + buffers
+    frames = []
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for part in parts:
+            blocks = [
+                part[start:][:MODEL_BLOCK_SIZE]
+                for start in range(0, part.nbytes, MODEL_BLOCK_SIZE)
+            ]
+            block_sizes = []
+            for compressed in executor.map(compress, blocks):
+                f.write(compressed)
+                block_sizes.append(len(compressed))
+            frames.append({"size": part.nbytes, "blocks": block_sizes})
+    return frames
+
+
+def _load_compressed(
+    f, compression: str, frames: List[Dict], threads: Optional[int]
+):
+    """Load an object dumped by :func:`_dump_compressed` from file `f`."""
+    _, decompress = _get_codec(compression)
+    parts = []
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for frame in frames:
+            part = bytearray(frame["size"])
+            blocks = [f.read(size) for size in frame["blocks"]]
+            start = 0
+            for block in executor.map(decompress, blocks):
+                end = start + len(block)
+                part[start:end] = block
+                start = end
+            parts.append(part)
+    # We are only unpickling files which are completely under the
+    # control of the model developer, not influenced by end user data.
+    if len(parts) == 1:
+        return pickle.loads(parts[0])  # nosec
+    if not _OUT_OF_BAND_PICKLING:
+        raise ValueError(
+            "Model has been stored with out-of-band numpy arrays, which "
+            "needs Python 3.8 or newer to load"
+        )
+    return pickle.loads(parts[0], buffers=parts[1:])  # nosec
+
+
+def _write_file(path: str, write: Callable[[Any], None]) -> None:
+    """Write a binary file using `write(f)`. The file is replaced instead
+    of overwritten, so processes which have mapped the old file into memory
+    and hard links to it (i.e. backups) keep the old contents.
+    """
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        with open(temp_path, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _save_npy(path: str, array: np.ndarray) -> None:
+    _write_file(path, lambda f: np.save(f, array, allow_pickle=False))
+
+
+# Linux ioctl to clone a file's contents (copy-on-write), from linux/fs.h
+_FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str) -> None:
+    """Make `dst` a copy-on-write clone of `src` (e.g. on Btrfs or XFS)"""
+    import fcntl  # Not available on Windows
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        except OSError:
+            os.close(dst_fd)
+            os.remove(dst)
+            raise
+        os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """Create `dst` with the same contents as `src` without copying any
+    data if the file system supports it. Returns the method used: "link",
+    "reflink" or "copy".
+    """
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+        return "link"
+    except OSError as e:
+        logger.debug("Could not hard link %s: %s", src, e)
+    try:
+        _reflink(src, dst)
+        return "reflink"
+    except (OSError, ImportError) as e:
+        logger.debug("Could not reflink %s: %s", src, e)
+    shutil.copy(src, dst)
+    return "copy"
+
+
+def _hash_array(array: np.ndarray) -> str:
+    """Get a hash of an array's contents, shape and dtype"""
+    header = np.lib.format.header_data_from_array_1_0(array)
+    array_hash = hashlib.sha256(repr(sorted(header.items())).encode("utf-8"))
+    if array.flags.f_contiguous and not array.flags.c_contiguous:
+        array = array.T  # Saved in Fortran order, see header
+    array_hash.update(
+        np.ascontiguousarray(array).reshape(-1).view(np.uint8).data
+    )
+    return array_hash.hexdigest()
+
+
+class _NpyPickler(pickle.Pickler):
+    """Stores numpy arrays in separate `.npy` files next to the pickle
+    file, so they can be memory-mapped when loading. With `blob_dir`, the
+    files are instead stored there, named by the hash of their contents,
+    and files which already exist are not written again.
+    """
+
+    def __init__(self, file, base_name: str, blob_dir: Optional[str] = None):
+        super().__init__(file)
+        self.base_name = base_name
+        self.blob_dir = blob_dir
+        self.array_files: Dict[int, str] = {}
+        self.new_bytes = 0
+
+    def persistent_id(self, obj):
+        if (
+            type(obj) is not np.ndarray
+            or obj.dtype.hasobject
+            or obj.nbytes < MODEL_OUT_OF_BAND_BYTES
+        ):
+            return None
+        file_name = self.array_files.get(id(obj))
+        if file_name is None:
+            file_name = self.array_files[id(obj)] = self._save(obj)
+        return "npy", file_name
+
+    def _save(self, array: np.ndarray) -> str:
+        """Save `array` and return its path relative to the model store"""
+        if self.blob_dir is None:
+            path = "{}.array{}.npy".format(
+                self.base_name, len(self.array_files)
+            )
+            _save_npy(path, array)
+            self.new_bytes += array.nbytes
+            return os.path.basename(path)
+
+        array_hash = _hash_array(array)
+        # Subdirectories to avoid too many files in one directory
+        file_name = "/".join([array_hash[:2], array_hash + ".npy"])
+        path = os.path.join(self.blob_dir, file_name)
+        if os.path.exists(path):
+            os.utime(path)  # Mark as used, see ModelStore.remove_unused_blobs
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _save_npy(path, array)
+            self.new_bytes += array.nbytes
+        return "/".join([os.path.basename(self.blob_dir), file_name])
+
+
+class _NpyUnpickler(pickle.Unpickler):
+    """Loads pickle files written by :class:`_NpyPickler`, memory-mapping
+    their arrays read-only if `mmap` is `True`. `array_paths` maps the
+    array files' names stored in the pickle to the files to load instead,
+    e.g. for backups.
+    """
+
+    def __init__(
+        self,
+        file,
+        location: str,
+        mmap: bool = True,
+        array_paths: Optional[Dict[str, str]] = None,
+    ):
+        super().__init__(file)
+        self.location = location
+        self.mmap_mode = "r" if mmap else None
+        self.array_paths = array_paths or {}
+        self.arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def mapped_bytes(self) -> int:
+        if self.mmap_mode is None:
+            return 0
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def persistent_load(self, pid):
+        kind, file_name = pid
+        if kind != "npy":
+            raise pickle.UnpicklingError(
+                "Unknown persistent id {}".format(pid)
+            )
+        if file_name not in self.arrays:
+            path = self.array_paths.get(file_name, file_name)
+            self.arrays[file_name] = np.load(
+                os.path.join(self.location, path), mmap_mode=self.mmap_mode
+            )
+        return self.arrays[file_name]
+
+
+def get_resident_bytes() -> Optional[int]:
+    """Get the current process' resident set size (physical memory in use)
+    in bytes, or `None` if it is not available on this platform.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * mmap.PAGESIZE
+
+
+def _flatten_metrics(metrics, prefix: str = "") -> Dict[str, float]:
+    """Get the finite numeric values of a (nested) metrics dict, with the keys
+    of nested dicts joined by dots, e.g. `{"a": {"b": 1}}` -> `{"a.b": 1}`.
+    NaN and infinite values are left out as they cannot be ranked.
+    """
+    flat: Dict[str, float] = {}
+    if not isinstance(metrics, dict):
+        return flat
+    for key, value in metrics.items():
+        key = prefix + str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten_metrics(value, key + "."))
+        elif isinstance(value, (int, float, np.number)) and math.isfinite(
+            value
+        ):
+            flat[key] = float(value)
+    return flat
+
+
+_REGISTRY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    metadata_file TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    api_name TEXT,
+    created TEXT NOT NULL,
+    backup TEXT  -- NULL for current models
+);
+CREATE INDEX IF NOT EXISTS models_name
+    ON models (name, version);
+CREATE INDEX IF NOT EXISTS models_api_name
+    ON models (api_name, backup);
+CREATE TABLE IF NOT EXISTS metrics (
+    model_id INTEGER NOT NULL
+        REFERENCES models (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (model_id, name)
+);
+CREATE INDEX IF NOT EXISTS metrics_value
+    ON metrics (name, value);
+"""
+
+
+class _ModelRegistry:
+    """Index of the models and backups in a model store and their numeric
+    metrics, kept in an SQLite database, so that models can be queried
+    without reading all metadata files.
+
+    Models are identified by the path of their metadata file relative to
+    the model store. A new connection is used for every operation, so the
+    registry can be used from several threads and processes.
+    """
+
+    def __init__(self, location: str):
+        self.location = location
+        self.path = os.path.join(location, "registry.sqlite")
+        with self._transaction() as db:
+            is_new = not db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'models'"
+            ).fetchone()
+            # Not executescript, which would commit the transaction
+            for statement in _REGISTRY_SCHEMA.split(";")[:-1]:
+                db.execute(statement)
+            if is_new:
+                self._add_existing_models(db)
+
+    @contextmanager
+    def _transaction(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            db.execute("PRAGMA foreign_keys = ON")
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def _add_existing_models(self, db: sqlite3.Connection) -> None:
+        logger.info("Indexing the models in model store %s", self.location)
+        backup_pattern = re.compile(
+            r"_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.json$"
+        )
+        paths = glob.glob(os.path.join(self.location, "*.json"))
+        paths += glob.glob(os.path.join(self.location, "previous", "*.json"))
+        for path in paths:
+            try:
+                with open(path, "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Not indexing %s: %s", path, e)
+                continue
+            if not isinstance(meta, dict) or not {"name", "version"} <= set(
+                meta
+            ):
+                logger.warning("Not indexing %s: not model metadata", path)
+                continue
+            backup = None
+            if os.path.basename(os.path.dirname(path)) == "previous":
+                match = backup_pattern.search(path)
+                backup = match.group(1) if match else ""
+            self._add(db, self._relative(path), meta, backup)
+
+    def _relative(self, path: str) -> str:
+        return "/".join(os.path.relpath(path, self.location).split(os.sep))
+
+    @staticmethod
+    def _add(
+        db: sqlite3.Connection,
+        metadata_file: str,
+        meta: Dict,
+        backup: Optional[str],
+    ) -> None:
+        db.execute(
+            "DELETE FROM models WHERE metadata_file = ?", (metadata_file,)
+        )
+        model_id = db.execute(
+            "INSERT INTO models "
+            "(metadata_file, name, version, api_name, created, backup) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                metadata_file,
+                meta["name"],
+                str(meta["version"]),
+                meta.get("api_name"),
+                meta.get("created", ""),
+                backup,
+            ),
+        ).lastrowid
+        db.executemany(
+            "INSERT INTO metrics (model_id, name, value) VALUES (?, ?, ?)",
+            [
+                (model_id, name, value)
+                for name, value in _flatten_metrics(
+                    meta.get("metrics")
+                ).items()
+            ],
+        )
+
+    def add(
+        self, metadata_path: str, meta: Dict, backup: Optional[str] = None
+    ) -> None:
+        """Add or replace the model with the metadata file `metadata_path`
+        and metadata `meta`. `backup` is the time stamp of backups.
+        """
+        with self._transaction() as db:
+            self._add(db, self._relative(metadata_path), meta, backup)
+
+    def remove(self, metadata_path: str) -> None:
+        with self._transaction() as db:
+            db.execute(
+                "DELETE FROM models WHERE metadata_file = ?",
+                (self._relative(metadata_path),),
+            )
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        version: Optional[str] = None,
+        api_name: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_until: Optional[str] = None,
+        include_backups: bool = False,
+        order_by_metric: Optional[str] = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        query = (
+            "SELECT m.id, m.metadata_file, m.name, m.version, m.api_name, "
+            "m.created, m.backup FROM models m"
+        )
+        conditions: List[str] = []
+        args: List[Any] = []
+        if order_by_metric is not None:
+            # Models without this metric are left out
+            query += " JOIN metrics o ON o.model_id = m.id AND o.name = ?"
+            args.append(order_by_metric)
+        for column, operator, value in [
+            ("m.name", "=", name),
+            ("m.version", "=", version),
+            ("m.api_name", "=", api_name),
+            ("m.created", ">=", created_from),
+            ("m.created", "<=", created_until),
+        ]:
+            if value is not None:
+                conditions.append("{} {} ?".format(column, operator))
+                args.append(value)
+        if not include_backups:
+            conditions.append("m.backup IS NULL")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if order_by_metric is not None:
+            query += " ORDER BY o.value {}".format(
+                "ASC" if ascending else "DESC"
+            )
+        else:
+            query += " ORDER BY m.created DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+
+        with self._transaction() as db:
+            rows = db.execute(query, args).fetchall()
+            models = {
+                row[0]: {
+                    "metadata_file": row[1],
+                    "name": row[2],
+                    "version": row[3],
+                    "api_name": row[4],
+                    "created": row[5],
+                    "backup": row[6],
+                    "metrics": {},
+                }
+                for row in rows
+            }
+            if models:
+                for model_id, metric, value in db.execute(
+                    "SELECT model_id, name, value FROM metrics "
+                    "WHERE model_id IN ({})".format(
+                        ", ".join("?" * len(models))
+                    ),
+                    list(models),
+                ):
+                    models[model_id]["metrics"][metric] = value
+        return [models[row[0]] for row in rows]
+
 
 class ModelStore:
     """Deals with persisting, loading, updating metrics metadata of models.
     Abstracts away how and where the model is kept.
 
-    TODO: Smarter querying like 'get me the model with the currently (next)
-    best metrics which serves a particular API.'
+    How models are serialized can be configured in the `model_store:`
+    section:
+
+    * ``serializer``: ``dill`` (default) or ``joblib`` (needs the `joblib` package).
+    * ``compression``: ``none`` (default), ``zlib``, ``bz2``, ``lzma``, ``lz4``
+      (needs `lz4`) or ``zstd`` (needs `zstandard`). With ``dill``, large numpy
+      arrays are stored out of band (on Python 3.8+, such models can't be
+      loaded using older Python versions), and the model is (de)compressed in
+      blocks using several threads. ``joblib`` uses its own (single-threaded)
+      compression, supporting the names of its ``compress`` parameter instead.
+    * ``compression_level``: optional, default depends on the compression
+    * ``compression_threads``: optional, default: number of CPUs (``dill`` only)
+    * ``mmap_arrays``: ``True`` to store numpy arrays (of at least 1 MiB,
+      also inside of DataFrames) in separate `.npy` files, which are
+      memory-mapped read-only when loading the model, default: ``False``
+      (``dill`` without compression only). Loading is then nearly
+      instant, and the arrays' pages are only read when they are used and
+      are shared by all processes serving the model.
+    * ``content_addressed``: ``True`` to store numpy arrays (like ``mmap_arrays``)
+      in the subdirectory `blobs`, named by the hash of their contents, default:
+      ``False`` (``dill`` without compression only). Arrays which are identical
+      to those of any other stored model or backup, e.g. embeddings which did not
+      change since the last training, are then stored only once and not
+      written again. Without ``mmap_arrays: True``, the arrays are loaded into
+      memory. Arrays which are no longer used by any model or backup are
+      removed when storing a model, one hour after their last use at the earliest
+      (see :meth:`remove_unused_blobs`).
+
+    Before a model is stored, the model previously stored under the same name
+    and version is backed up into the subdirectory `previous`, using hard links
+    or copy-on-write clones (reflinks) if the file system supports them, so no
+    data is copied. The model files are never overwritten in place, so the
+    backups keep their contents. Backups are kept forever, unless limited by:
+
+    * ``keep_backups``: keep at most this many backups of each model
+    * ``keep_backup_days``: remove backups which are older than this many days
+
+    Use the `backup` parameter of :meth:`load_trained_model` to load a backup.
+
+    The serialization settings, the model file's size and the time it took to save it are
+    stored in the model's metadata under `serialization`, which is used for
+    loading it again, so changing the settings does not affect models
+    which have already been stored. The time it took to load the model and
+    the number of memory-mapped bytes are added to the metadata returned by
+    :meth:`load_trained_model`.
+
+    With ``registry: True``, an index of all models and backups and their
+    metrics is kept in the SQLite database `registry.sqlite` in the model
+    store, which is used to query models using :meth:`find_models` and
+    :meth:`get_best_model`. When the registry is created, the models which
+    are already in the model store are added to it.
     """
 
     def __init__(self, config):
@@ -55,10 +673,43 @@ class ModelStore:
         Params:
             config: configuration dict
         """
-        self.location = config["model_store"]["location"]
+        store_config = config["model_store"]
+        self.location = store_config["location"]
         if not os.path.exists(self.location):
             os.makedirs(self.location)
 
+        self.serializer = store_config.get("serializer", "dill")
+        self.compression = store_config.get("compression", "none")
+        self.compression_level = store_config.get("compression_level")
+        self.compression_threads = store_config.get("compression_threads")
+        if self.serializer not in ["dill", "joblib"]:
+            raise ValueError(
+                "Model store: serializer must be one of dill, joblib, "
+                "got {}".format(self.serializer)
+            )
+        if self.serializer == "joblib":
+            _import_optional("joblib", "joblib")  # Fail early
+        elif self.compression != "none":
+            _get_codec(self.compression)  # Fail early
+        self.keep_backups = store_config.get("keep_backups")
+        self.keep_backup_days = store_config.get("keep_backup_days")
+        self.mmap_arrays = store_config.get("mmap_arrays", False)
+        self.content_addressed = store_config.get("content_addressed", False)
+        self.blob_dir = os.path.join(self.location, "blobs")
+        for option in ["mmap_arrays", "content_addressed"]:
+            if getattr(self, option) and (
+                self.serializer != "dill" or self.compression != "none"
+            ):
+                raise ValueError(
+                    "Model store: {} requires serializer dill and "
+                    "compression none".format(option)
+                )
+        self._registry = (
+            _ModelRegistry(self.location)
+            if store_config.get("registry", False)
+            else None
+        )
+
     def _get_model_base_name(self, model_conf):
         return os.path.join(
             self.location,
@@ -76,29 +727,109 @@ class ModelStore:
     @staticmethod
     def _dump_metadata(base_name, raw_metadata):
         metadata_name = base_name + ".json"
-        metadata = to_plain_python_obj(raw_metadata)
-        try:
-            with open(metadata_name, "w") as f:
-                json.dump(metadata, f, indent=2)
-        except TypeError as e:
-            os.remove(metadata_name)
-            raise e
+        # Serialize first, so no partial file is left if it fails (TypeError).
+        # Always using the json module (not orjson), which keeps NaN metrics.
+        metadata = json.dumps(
+            raw_metadata, default=_json_default, indent=2
+        ).encode("utf-8")
+        _write_file(metadata_name, lambda f: f.write(metadata))
 
     def _backup_old_model(self, base_name):
         backup_dir = os.path.join(self.location, "previous")
         if not os.path.exists(backup_dir):
             os.makedirs(backup_dir)
         infix = datetime.now().strftime(DATE_FORMAT_FILES)
-        for file in glob.glob(base_name + "*"):
+        model_name = os.path.basename(base_name)
+        # Not e.g. temporary files or those of version 1.2.3.4 for 1.2.3
+        pattern = re.compile(
+            re.escape(model_name) + r"(?:\.array\d+\.npy|\.pkl)$"
+        )
+        # The backed up arrays, by the names the pickle refers to them with
+        array_paths = {}
+        has_metadata = False
+        for file in sorted(glob.glob(base_name + ".*")):
             fn_ext = os.path.basename(file)
+            if fn_ext == model_name + ".json":
+                has_metadata = True  # Backed up below
+                continue
+            if not pattern.match(fn_ext):
+                continue
             fn, ext = os.path.splitext(fn_ext)
             new_file_name = "{}_{}{}".format(fn, infix, ext)
+            new_file = os.path.join(backup_dir, new_file_name)
+            method = _link_or_copy(file, new_file)
             logger.debug(
-                "Backing up previous model file {} as {}".format(
-                    fn_ext, new_file_name
+                "Backed up previous model file {} as {} ({})".format(
+                    fn_ext, new_file_name, method
                 )
             )
-            shutil.copy(file, os.path.join(backup_dir, new_file_name))
+            if ext == ".npy":
+                array_paths[fn_ext] = "previous/" + new_file_name
+        if has_metadata:
+            self._backup_metadata(base_name, model_name, infix, array_paths)
+        self._prune_backups(base_name)
+
+    def _backup_metadata(self, base_name, model_name, infix, array_paths):
+        backup_base_name = os.path.join(
+            self.location, "previous", "{}_{}".format(model_name, infix)
+        )
+        if array_paths:
+            # Let the backup load the backed up arrays (see `_NpyUnpickler`)
+            meta = self._load_metadata(base_name)
+            serialization = meta.setdefault("serialization", {})
+            serialization["array_paths"] = array_paths
+            serialization["array_files"] = [
+                array_paths.get(file_name, file_name)
+                for file_name in serialization.get("array_files", [])
+            ]
+            self._dump_metadata(backup_base_name, meta)
+        else:
+            _link_or_copy(base_name + ".json", backup_base_name + ".json")
+        logger.debug(
+            "Backed up previous model metadata as %s.json", backup_base_name
+        )
+        if self._registry is not None:
+            self._registry.add(
+                backup_base_name + ".json",
+                self._load_metadata(backup_base_name),
+                infix,
+            )
+
+    def _prune_backups(self, base_name):
+        """Remove backups of a model according to `keep_backups` and
+        `keep_backup_days`.
+        """
+        if self.keep_backups is None and self.keep_backup_days is None:
+            return
+        backup_dir = os.path.join(self.location, "previous")
+        model_name = os.path.basename(base_name)
+        pattern = re.compile(
+            re.escape(model_name)
+            + r"(?:\.array\d+)?_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.\w+$"
+        )
+        backups: Dict[str, List[str]] = {}
+        for path in glob.glob(os.path.join(backup_dir, model_name + "*")):
+            match = pattern.match(os.path.basename(path))
+            if match:
+                backups.setdefault(match.group(1), []).append(path)
+
+        # Newest first (the date format sorts chronologically)
+        infixes = sorted(backups, reverse=True)
+        keep = len(infixes) if self.keep_backups is None else self.keep_backups
+        to_keep = infixes[:keep]
+        if self.keep_backup_days is not None:
+            oldest = datetime.now() - timedelta(days=self.keep_backup_days)
+            oldest_infix = oldest.strftime(DATE_FORMAT_FILES)
+            to_keep = [infix for infix in to_keep if infix >= oldest_infix]
+        for infix in infixes:
+            if infix not in to_keep:
+                logger.info(
+                    "Removing backup of model %s from %s", model_name, infix
+                )
+                for path in backups[infix]:
+                    os.remove(path)
+                    if self._registry is not None and path.endswith(".json"):
+                        self._registry.remove(path)
 
     def dump_trained_model(self, complete_conf, model, metrics):
         """Save a model object in the model store. Some metadata will also
@@ -119,9 +850,7 @@ class ModelStore:
         self._backup_old_model(base_name)
 
         # Save model itself
-        pkl_name = base_name + ".pkl"
-        with open(pkl_name, "wb") as f:
-            pickle.dump(model, f)
+        serialization = self._dump_model(base_name, model)
 
         # Save metadata
         meta = {
@@ -132,36 +861,207 @@ class ModelStore:
             "metrics": metrics,
             "metrics_history": {datetime.now().strftime(DATE_FORMAT): metrics},
             "config_snapshot": model_conf,
+            "serialization": serialization,
         }
         if "api" in complete_conf:  # API is optional
             meta["api_name"] = complete_conf["api"]["name"]
 
         self._dump_metadata(base_name, meta)
+        if self._registry is not None:
+            self._registry.add(base_name + ".json", meta)
+        if self.content_addressed:
+            self.remove_unused_blobs()
+
+    def remove_unused_blobs(self, min_age_seconds: float = 3600) -> int:
+        """Remove the arrays stored by `content_addressed: True` which are
+        not used by any model or backup in the model store. Arrays which
+        have been used until less than `min_age_seconds` ago are kept, as
+        another process might be about to store a model using them.
 
-    def load_trained_model(self, model_conf):
+        Returns:
+            Number of bytes removed
+        """
+        used = set()
+        for metadata_name in glob.glob(
+            os.path.join(self.location, "*.json")
+        ) + glob.glob(os.path.join(self.location, "previous", "*.json")):
+            try:
+                with open(metadata_name, "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    "Not removing unused blobs, could not read %s: %s",
+                    metadata_name,
+                    e,
+                )
+                return 0
+            used.update(meta.get("serialization", {}).get("array_files", []))
+
+        removed_bytes = 0
+        latest_use = time() - min_age_seconds
+        for path in glob.glob(os.path.join(self.blob_dir, "*", "*.npy")):
+            file_name = "/".join(
+                os.path.relpath(path, self.location).split(os.sep)
+            )
+            stat = os.stat(path)
+            if file_name not in used and stat.st_mtime < latest_use:
+                logger.debug("Removing unused blob %s", file_name)
+                os.remove(path)
+                removed_bytes += stat.st_size
+        return removed_bytes
+
+    def load_trained_model(self, model_conf, backup: Optional[str] = None):
         """Load a model object from the model store. Some metadata will also
         be loaded along the model.
 
         Params:
             model_conf:  the config dict of our model
+            backup:      optionally load the backup of the model with this
+                         time stamp instead (see `backup` in :meth:`find_models`)
 
         Returns:
             Tuple of model object and metadata dictionary
         """
         base_name = self._get_model_base_name(model_conf)
+        if backup is not None:
+            base_name = os.path.join(
+                self.location,
+                "previous",
+                "{}_{}".format(os.path.basename(base_name), backup),
+            )
 
         if "." not in sys.path:
             sys.path.append(".")
 
+        meta = self._load_metadata(base_name)
+        serialization = meta.setdefault("serialization", {})
+
+        start = perf_counter()
+        model = self._load_model(base_name, serialization)
+        serialization["load_seconds"] = perf_counter() - start
+        logger.info(
+            "Loaded model %s in %.2f seconds",
+            base_name,
+            serialization["load_seconds"],
+        )
+
+        return model, meta
+
+    def _dump_model(self, base_name: str, model) -> Dict:
         pkl_name = base_name + ".pkl"
+        serialization: Dict[str, Any] = {
+            "serializer": self.serializer,
+            "compression": self.compression,
+        }
+        start = perf_counter()
+        if self.serializer == "joblib":
+            joblib = _import_optional("joblib", "joblib")
+            compress = (
+                0
+                if self.compression == "none"
+                else (self.compression, self.compression_level or 3)
+            )
+            _write_file(
+                pkl_name, lambda f: joblib.dump(model, f, compress=compress)
+            )
+        else:
+
+            def write(f):
+                if self.mmap_arrays or self.content_addressed:
+                    pickler = _NpyPickler(
+                        f,
+                        base_name,
+                        self.blob_dir if self.content_addressed else None,
+                    )
+                    pickler.dump(model)
+                    serialization["mmap_arrays"] = self.mmap_arrays
+                    serialization["array_files"] = sorted(
+                        set(pickler.array_files.values())
+                    )
+                    serialization["new_bytes"] = pickler.new_bytes
+                elif self.compression == "none":
+                    pickle.dump(model, f)
+                else:
+                    serialization["frames"] = _dump_compressed(
+                        model,
+                        f,
+                        self.compression,
+                        self.compression_level,
+                        self.compression_threads,
+                    )
+
+            _write_file(pkl_name, write)
+            self._remove_unused_arrays(
+                base_name, serialization.get("array_files", [])
+            )
+        serialization["dump_seconds"] = perf_counter() - start
+        serialization["size_bytes"] = os.path.getsize(pkl_name) + sum(
+            os.path.getsize(os.path.join(self.location, file_name))
+            for file_name in serialization.get("array_files", [])
+        )
+        return serialization
+
+    @staticmethod
+    def _remove_unused_arrays(base_name: str, array_files: List[str]):
+        """Remove array files left over from a previously stored model"""
+        pattern = re.compile(
+            re.escape(os.path.basename(base_name)) + r"\.array\d+\.npy$"
+        )
+        for path in glob.glob(base_name + ".array*.npy"):
+            file_name = os.path.basename(path)
+            if pattern.match(file_name) and file_name not in array_files:
+                os.remove(path)
+
+    def _load_model(self, base_name: str, serialization: Dict):
+        pkl_name = base_name + ".pkl"
+        if serialization.get("serializer") == "joblib":
+            joblib = _import_optional("joblib", "joblib")
+            return joblib.load(pkl_name)
         with open(pkl_name, "rb") as f:
+            if "array_files" in serialization:
+                unpickler = _NpyUnpickler(
+                    f,
+                    self.location,
+                    serialization.get("mmap_arrays", True),
+                    serialization.get("array_paths"),
+                )
+                # We are only unpickling files which are completely under the
+                # control of the model developer, not influenced by end user data.
+                model = unpickler.load()  # nosec
+                serialization["mapped_bytes"] = unpickler.mapped_bytes
+                return model
+            if "frames" in serialization:
+                return _load_compressed(
+                    f,
+                    serialization["compression"],
+                    serialization["frames"],
+                    self.compression_threads,
+                )
             # We are only unpickling files which are completely under the
             # control of the model developer, not influenced by end user data.
-            model = pickle.load(f)  # nosec
+            return pickle.load(f)  # nosec
 
-        meta = self._load_metadata(base_name)
+    def get_model_mtime(self, model_conf) -> Optional[float]:
+        """Get the modification time of a stored model's pickle file. Use it
+        to find out whether a newer model has been stored since loading one
+        (updating a model's metrics does not change it).
 
-        return model, meta
+        Params:
+            model_conf:  the config dict of our model
+
+        Returns:
+            Modification time in seconds since the epoch, or None if there
+            is no such model in the store or it is still being stored (its
+            metadata, which is written last, is older than its pickle file)
+        """
+        base_name = self._get_model_base_name(model_conf)
+        try:
+            mtime = os.path.getmtime(base_name + ".pkl")
+            if os.path.getmtime(base_name + ".json") < mtime:
+                return None
+        except FileNotFoundError:
+            return None
+        return mtime
 
     def update_model_metrics(self, model_conf, metrics):
         """Update the test metrics for a previously stored model
@@ -171,6 +1071,73 @@ class ModelStore:
         meta["metrics"] = metrics
         meta["metrics_history"][datetime.now().strftime(DATE_FORMAT)] = metrics
         self._dump_metadata(base_name, meta)
+        if self._registry is not None:
+            self._registry.add(base_name + ".json", meta)
+
+    def find_models(
+        self,
+        name: Optional[str] = None,
+        version: Optional[str] = None,
+        api_name: Optional[str] = None,
+        created_from: Optional[Union[datetime, str]] = None,
+        created_until: Optional[Union[datetime, str]] = None,
+        include_backups: bool = False,
+        order_by_metric: Optional[str] = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Find models in the model store using its registry (needs
+        `registry: True` in the `model_store:` configuration).
+
+        Params:
+            name, version, api_name: only models with these values
+            created_from, created_until: only models created in this range
+            include_backups: also find backups of models, which have a
+                             `backup` time stamp (else `None`)
+            order_by_metric: sort by this metric, leaving out models without
+                             it (keys of nested metrics are joined by dots),
+                             default: sort by creation time
+            ascending:       sort ascending instead of descending
+            limit:           find at most this many models
+
+        Returns:
+            List of dicts with the models' `name`, `version`, `api_name`,
+            `created`, `backup`, `metadata_file` and numeric `metrics`
+        """
+        if self._registry is None:
+            raise ValueError(
+                "Model store: querying models requires registry: True"
+            )
+        if isinstance(created_from, datetime):
+            created_from = created_from.strftime(DATE_FORMAT)
+        if isinstance(created_until, datetime):
+            created_until = created_until.strftime(DATE_FORMAT)
+        return self._registry.find(
+            name=name,
+            version=version,
+            api_name=api_name,
+            created_from=created_from,
+            created_until=created_until,
+            include_backups=include_backups,
+            order_by_metric=order_by_metric,
+            ascending=ascending,
+            limit=limit,
+        )
+
+    def get_best_model(
+        self, api_name: str, metric: str, higher_is_better: bool = True
+    ) -> Optional[Dict]:
+        """Get the (current, not backed up) model with the best value of
+        `metric` which serves the API `api_name`, or `None` if there is none.
+        See :meth:`find_models` for details.
+        """
+        models = self.find_models(
+            api_name=api_name,
+            order_by_metric=metric,
+            ascending=not higher_is_better,
+            limit=1,
+        )
+        return models[0] if models else None
 
 
 def _tags_match(tags, other_tags) -> bool:
@@ -227,8 +1194,18 @@ def _get_all_classes(config, the_type: Type[DS]) -> Dict[str, Type[DS]]:
     return ds_cls
 
 
+# DataSources/Sinks in use by any model (see `create_data_sources_and_sinks`)
+_shared_ds_objects: "weakref.WeakValueDictionary[str, Any]" = (
+    weakref.WeakValueDictionary()
+)
+_shared_ds_lock = threading.Lock()
+
+
 def _create_data_sources_or_sinks(
-    config: Dict, the_type: Type[DS], tags: Optional[Iterable[str]] = None
+    config: Dict,
+    the_type: Type[DS],
+    tags: Optional[Iterable[str]] = None,
+    shared: bool = False,
 ) -> Dict[str, DS]:
     # Implementation note: no generator used because we want to fail early
     if not tags:
@@ -272,24 +1249,63 @@ def _create_data_sources_or_sinks(
                 f"No {what} class for {service_need} available. Check the configuration for typos in the {what} type or add a suitable plugin."
             )
 
-        logger.debug(
-            "Initializing %s %s of type %s...", what, ds_id, ds_config["type"]
-        )
-        if ds_subtype_config is None:
-            ds_objects[ds_id] = ds_cls[service_need](ds_id, ds_config)
+        if shared:
+            cls = ds_cls[service_need]
+            shared_key = json.dumps(
+                [
+                    what,
+                    "{}.{}".format(cls.__module__, cls.__qualname__),
+                    ds_config,
+                    ds_subtype_config,
+                ],
+                sort_keys=True,
+                default=str,
+            )
+            with _shared_ds_lock:
+                ds_object = _shared_ds_objects.get(shared_key)
+                if ds_object is None:
+                    ds_object = _create_data_source_or_sink(
+                        what, cls, ds_id, ds_config, ds_subtype_config
+                    )
+                    _shared_ds_objects[shared_key] = ds_object
+                else:
+                    logger.debug(
+                        "Sharing existing %s %s as %s",
+                        what,
+                        ds_object.id,
+                        ds_id,
+                    )
+            ds_objects[ds_id] = ds_object
         else:
-            ds_objects[ds_id] = ds_cls[service_need](
-                ds_id, ds_config, ds_subtype_config
+            ds_objects[ds_id] = _create_data_source_or_sink(
+                what, ds_cls[service_need], ds_id, ds_config, ds_subtype_config
             )
 
-        logger.debug("%s %s initialized", what.capitalize(), ds_id)
-
     # typing.cast(Dict[str, DS], ds_objects)
     return ds_objects
 
 
+def _create_data_source_or_sink(
+    what: str,
+    cls: Type[DS],
+    ds_id: str,
+    ds_config: Dict,
+    ds_subtype_config: Optional[Dict],
+) -> DS:
+    logger.debug(
+        "Initializing %s %s of type %s...", what, ds_id, ds_config["type"]
+    )
+    if ds_subtype_config is None:
+        ds_object = cls(ds_id, ds_config)
+    else:
+        ds_object = cls(ds_id, ds_config, ds_subtype_config)  # type: ignore
+
+    logger.debug("%s %s initialized", what.capitalize(), ds_id)
+    return ds_object
+
+
 def create_data_sources_and_sinks(
-    config: Dict, tags: Optional[Iterable[str]] = None
+    config: Dict, tags: Optional[Iterable[str]] = None, shared: bool = False
 ) -> Tuple[Dict[str, "DataSource"], Dict[str, "DataSink"]]:
     """Creates the data sources as defined in the configuration dict.
     Filters them by tag.
@@ -297,6 +1313,11 @@ def create_data_sources_and_sinks(
     Params:
         config: configuration dictionary
         tags:   optionally filter for only matching datasources no value(s) = match all datasources
+        shared: reuse DataSources/Sinks with identical configuration and
+                class which have already been created with `shared=True`,
+                e.g. by other models served in the same process. A shared
+                object keeps the name (`id`) it was first created with,
+                which appears in its log messages.
 
     Returns:
         dict with keys=datasource names, values=initialized DataSource objects
@@ -308,34 +1329,141 @@ def create_data_sources_and_sinks(
     # which is a know issue: https://github.com/python/mypy/issues/5374
     # Ignoring check for now, hoping for a solution/workaround soon.
     sources: Dict[str, DataSource] = _create_data_sources_or_sinks(
-        config, the_type=DataSource, tags=tags  # type: ignore
+        config, the_type=DataSource, tags=tags, shared=shared  # type: ignore
     )
     sinks: Dict[str, DataSink] = _create_data_sources_or_sinks(
-        config, the_type=DataSink, tags=tags  # type: ignore
+        config, the_type=DataSink, tags=tags, shared=shared  # type: ignore
     )
 
     return sources, sinks
 
 
+def _get_size_in_bytes(obj) -> int:
+    """Approximate memory used by `obj`, for limiting cache sizes."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(obj, pd.DataFrame) else usage
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, memoryview) and isinstance(obj.obj, mmap.mmap):
+        return 0  # memory-mapped file pages, not held on the heap
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    return sys.getsizeof(obj)
+
+
 class CacheDict(OrderedDict):
+    """Dictionary which evicts its least recently used items when it
+    holds more than `maxsize` items, or, if `maxbytes` is given, when its items'
+    combined size exceeds `maxbytes` (as determined by the `sizeof` function).
+
+    Use :meth:`lookup` instead of item access to update the recency of an
+    item and to keep track of hits and misses.
+    """
+
     def __init__(self, *args, **kwds):
         self.maxsize = kwds.pop("maxsize", None)
+        self.maxbytes = kwds.pop("maxbytes", None)
+        self.sizeof = kwds.pop("sizeof", _get_size_in_bytes)
+        self.nbytes = 0
+        self._item_bytes: Dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
         OrderedDict.__init__(self, *args, **kwds)
         self._check_size_limit()
 
     def __setitem__(self, key, value):
+        nbytes = self.sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and nbytes > self.maxbytes:
+            # Too large to be cached, don't evict other items for it
+            if key in self:
+                del self[key]
+            return
+        if key in self:
+            self.nbytes -= self._item_bytes[key]
         OrderedDict.__setitem__(self, key, value)
+        self.move_to_end(key)
+        self._item_bytes[key] = nbytes
+        self.nbytes += nbytes
         self._check_size_limit()
 
+    def __delitem__(self, key):
+        OrderedDict.__delitem__(self, key)
+        self.nbytes -= self._item_bytes.pop(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return OrderedDict.pop(self, key, *default)
+
+    def popitem(self, last=True):
+        if not self:
+            raise KeyError("dictionary is empty")
+        key = next(reversed(self)) if last else next(iter(self))
+        return key, self.pop(key)
+
+    def clear(self):
+        OrderedDict.clear(self)
+        self._item_bytes.clear()
+        self.nbytes = 0
+
+    def lookup(self, key, default=None, is_valid=None):
+        """Get an item, marking it as most recently used. If the optional
+        function `is_valid` returns False for the item (e.g. because it has
+        expired), the item is removed and the lookup counts as a miss.
+        """
+        if key in self:
+            if is_valid is None or is_valid(self[key]):
+                self.move_to_end(key)
+                self.hits += 1
+                return self[key]
+            del self[key]
+        self.misses += 1
+        return default
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache statistics (hits, misses, evictions, items, bytes)."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "items": len(self),
+            "bytes": self.nbytes,
+        }
+
     def _check_size_limit(self):
-        if self.maxsize is not None:
-            while len(self) > self.maxsize:
-                self.popitem(last=False)
+        while self and (
+            (self.maxsize is not None and len(self) > self.maxsize)
+            or (self.maxbytes is not None and self.nbytes > self.maxbytes)
+        ):
+            self.popitem(last=False)
+            self.evictions += 1
 
     def __hash__(self):
         return hash(frozenset(self.items()))
 
 
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _read_text(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+# File extensions and reader functions of DataSource's disk cache
+_disk_cache_readers: Dict[str, Callable[[str], Any]] = {
+    ".parquet": pd.read_parquet,
+    ".bin": _read_bytes,
+    ".txt": _read_text,
+}
+
+
 class CachedDataSource(type):
     """Metaclass to Auto-apply decorators "@cached" to data getters.
     https://stackoverflow.com/questions/10067262/automatically-decorating-every-instance-method-in-a-class
@@ -349,7 +1477,10 @@ class CachedDataSource(type):
 
     @classmethod
     def cached(mcs, func):
-        """This decorator is automatically applied to `get_dataframe` and `get_raw` methods to enable caching."""
+        """This decorator is automatically applied to `get_dataframe` and `get_raw` methods to enable caching.
+        The cache is thread-safe, and concurrent calls with the same parameters
+        which miss the cache result in only one call of the decorated method.
+        """
 
         def wrapper(
             self, params: Dict = None, chunksize: Optional[int] = None
@@ -360,20 +1491,50 @@ class CachedDataSource(type):
                     'To be able to use "chunksize", please set "expires: 0" '
                     "in the datasource configuration."
                 )
+            if self.expires == 0:
+                return func(self, params, chunksize)
             key = (
                 func.__name__,
                 json.dumps(params, sort_keys=True),
                 chunksize,
             )
-            item = self._get_cached(key)
-            if item is not None:
-                return item
-            else:
-                result = func(self, params, chunksize)
-                self._to_cache(key, result)
-                return result
+            version = self._get_version(params)
+            # Single-flight: of several concurrent callers missing the same
+            # key, only the first one fetches the data, the others wait for it.
+            with self._cache_lock:
+                if self.refresh == "background":
+                    item = self._get_stale(key, version)
+                else:
+                    item = self._get_cached(key, version)
+                if item is not None:
+                    return item
+                flight = self._in_flight.get(key)
+                is_fetcher = flight is None
+                if is_fetcher:
+                    flight = self._in_flight[key] = Future()
+            if not is_fetcher:
+                logger.debug(
+                    "Waiting for concurrent fetch of datasource %s", self.id
+                )
+                return flight.result()
+
+            try:
+                result, time_stamp = self._fetch(
+                    key, lambda: func(self, params, chunksize), version
+                )
+            except BaseException as e:
+                with self._cache_lock:
+                    del self._in_flight[key]
+                flight.set_exception(e)
+                raise
+            with self._cache_lock:
+                self._to_cache(key, result, time_stamp, version)
+                del self._in_flight[key]
+            flight.set_result(result)
+            return result
 
         wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
         return wrapper
 
 
@@ -397,9 +1558,66 @@ class DataSource(metaclass=CachedDataSource):
         self.options = self.config.get("options", {})
 
         self.expires = self.config.get("expires", 0)
+        self.validate = self.config.get("validate")
+        if self.validate is not None and self.expires == 0:
+            raise ValueError(
+                "Datasource {}: validate requires expires != 0".format(self.id)
+            )
 
         maxsize = self.config.get("cache_size", 32)
-        self._cache = CacheDict(maxsize=maxsize)
+        maxbytes = self.config.get("cache_max_bytes")
+        self._cache = CacheDict(
+            maxsize=maxsize,
+            maxbytes=maxbytes,
+            sizeof=lambda entry: _get_size_in_bytes(entry[0]),
+        )
+        self._cache_lock = threading.RLock()
+        self._in_flight: Dict[Tuple, Future] = {}
+
+        self.refresh = self.config.get("refresh", "sync")
+        self.refresh_fraction = self.config.get("refresh_fraction", 1.0)
+        if self.refresh not in ["sync", "background"]:
+            raise ValueError(
+                "Datasource {}: refresh must be one of sync, background, "
+                "got {}".format(self.id, self.refresh)
+            )
+        if self.refresh == "background" and self.expires <= 0:
+            raise ValueError(
+                "Datasource {}: refresh: background requires expires > 0".format(
+                    self.id
+                )
+            )
+        if not 0 < self.refresh_fraction <= 1:
+            raise ValueError(
+                "Datasource {}: refresh_fraction must be between 0 and 1, "
+                "got {}".format(self.id, self.refresh_fraction)
+            )
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_stop = threading.Event()
+
+        self.cache_dir = self.config.get("cache_dir")
+        if self.cache_dir is not None and self.expires == 0:
+            raise ValueError(
+                "Datasource {}: cache_dir requires expires != 0".format(
+                    self.id
+                )
+            )
+        # Identifies cached items independently of the datasource's name,
+        # which may differ between models (see `shared` in
+        # `create_data_sources_and_sinks`)
+        self._config_hash = hashlib.sha256(
+            json.dumps(
+                [
+                    "{}.{}".format(
+                        type(self).__module__, type(self).__qualname__
+                    ),
+                    self.config,
+                    sub_config,
+                ],
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()[:16]
 
     @abc.abstractmethod
     def get_dataframe(
@@ -410,14 +1628,26 @@ class DataSource(metaclass=CachedDataSource):
     @abc.abstractmethod
     def get_raw(
         self, params: Dict = None, chunksize: Optional[int] = None
-    ) -> Raw:
+    ) -> Union[Raw, Generator]:
         ...
 
-    def _get_cached(self, key) -> Any:
+    def _get_version(self, params: Optional[Dict]) -> Any:
+        """Overwrite to return a cheap fingerprint of the data which `params`
+        refer to, e.g. a file's size and modification time. Cached items
+        are reloaded as soon as the fingerprint changes. The default `None`
+        means that items are only reloaded when they expire.
+        """
+        return None
+
+    def _get_cached(self, key, version=None) -> Any:
         if self.expires == -1 or self.expires > 0:
-            item, time_stamp = self._cache.get(key, (None, 0))
-            if item is not None and (
-                self.expires == -1 or time() <= time_stamp + self.expires
+            item, time_stamp, item_version = self._cache.lookup(
+                key, (None, 0, None)
+            )
+            if (
+                item is not None
+                and item_version == version
+                and (self.expires == -1 or time() <= time_stamp + self.expires)
             ):
                 logger.debug(
                     "Returning cached item for datasource %s", self.id
@@ -425,9 +1655,219 @@ class DataSource(metaclass=CachedDataSource):
                 return item
         return None  # either immediately expires (0) or has expired in meantime (>0)
 
-    def _to_cache(self, key, item) -> None:
+    def _get_stale(self, key, version=None) -> Any:
+        """Get an expired or soon-to-expire item from the cache and start
+        reloading it in the background (`refresh: background` only).
+        Items whose source has changed (see :meth:`_get_version`) are not
+        returned at all.
+        """
+        item, time_stamp, item_version = self._cache.lookup(
+            key, (None, 0, None)
+        )
+        if item is not None and item_version != version:
+            return None
+        if item is not None:
+            logger.debug("Returning cached item for datasource %s", self.id)
+            if time() > time_stamp + self.refresh_fraction * self.expires:
+                self._refresh_in_background(key)
+        return item
+
+    def _refresh_in_background(self, key) -> None:
+        with self._cache_lock:
+            if key in self._in_flight:
+                return  # Already being loaded
+            flight = self._in_flight[key] = Future()
+        threading.Thread(
+            target=self._refresh, args=(key, flight), daemon=True
+        ).start()
+
+    def _refresh(self, key, flight: Future) -> None:
+        func_name, params, chunksize = key
+        func = getattr(type(self), func_name).__wrapped__
+        logger.debug("Refreshing cached item for datasource %s", self.id)
+        try:
+            version = self._get_version(json.loads(params))
+            result, time_stamp = self._fetch(
+                key, lambda: func(self, json.loads(params), chunksize), version
+            )
+        except Exception as e:
+            logger.warning(
+                "Refreshing datasource %s failed, keeping stale item: %s",
+                self.id,
+                e,
+            )
+            with self._cache_lock:
+                del self._in_flight[key]
+            flight.set_exception(e)
+            return
+        with self._cache_lock:
+            self._to_cache(key, result, time_stamp, version)
+            del self._in_flight[key]
+        flight.set_result(result)
+
+    def start_refresher(self) -> None:
+        """Start a daemon thread which reloads this DataSource's cached items
+        in the background before they expire, so that callers never have to
+        wait for them to be loaded again. Only available with
+        `refresh: background`.
+        """
+        if self.refresh != "background":
+            raise ValueError(
+                "Datasource {}: refresher needs refresh: background".format(
+                    self.id
+                )
+            )
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._run_refresher,
+            name="refresher-{}".format(self.id),
+            daemon=True,
+        )
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        """Stop the thread started by :meth:`start_refresher`."""
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    def _run_refresher(self) -> None:
+        refresh_after = self.refresh_fraction * self.expires
+        while True:
+            now = time()
+            next_due = now + refresh_after
+            with self._cache_lock:
+                entries = [(k, v[1]) for k, v in self._cache.items()]
+            for key, time_stamp in entries:
+                due = time_stamp + refresh_after
+                if due <= now:
+                    self._refresh_in_background(key)
+                else:
+                    next_due = min(next_due, due)
+            # Wait at least a second so failing reloads are not retried too eagerly
+            if self._refresher_stop.wait(max(next_due - now, 1)):
+                return
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Get statistics about this DataSource's cache: number of
+        `hits`, `misses` and `evictions`, and number of `items` and their
+        approximate size in `bytes` (only if `cache_max_bytes` is configured).
+        """
+        with self._cache_lock:
+            return self._cache.stats()
+
+    def _to_cache(
+        self, key, item, time_stamp: Optional[float] = None, version=None
+    ) -> None:
         if self.expires != 0:
-            self._cache[key] = (item, time())
+            self._cache[key] = (
+                item,
+                time() if time_stamp is None else time_stamp,
+                version,
+            )
+
+    def _fetch(
+        self, key, load: Callable[[], Any], version=None
+    ) -> Tuple[Any, float]:
+        """Get an item from the disk cache (if configured and not expired),
+        or else `load` it from the source and put it into the disk cache.
+        """
+        if self.cache_dir is not None:
+            cached = self._get_disk_cached(key, version)
+            if cached is not None:
+                return cached
+        item = load()
+        time_stamp = time()
+        if self.cache_dir is not None:
+            self._to_disk_cache(key, item, version)
+        return item, time_stamp
+
+    def _disk_cache_path(self, key, version=None) -> str:
+        if self.cache_dir is None:
+            raise ValueError(
+                "Datasource {} has no cache_dir configured".format(self.id)
+            )
+        func_name, params, chunksize = key
+        # Files of other versions of the source are simply not found
+        hashed = (
+            [params, chunksize]
+            if version is None
+            else [params, chunksize, version]
+        )
+        params_hash = hashlib.sha256(
+            json.dumps(hashed).encode("utf-8")
+        ).hexdigest()[:16]
+        file_name = "{}-{}-{}".format(
+            self._config_hash, func_name, params_hash
+        )
+        return os.path.join(self.cache_dir, file_name)
+
+    def _get_disk_cached(
+        self, key, version=None
+    ) -> Optional[Tuple[Any, float]]:
+        base_path = self._disk_cache_path(key, version)
+        for ext, read in _disk_cache_readers.items():
+            path = base_path + ext
+            try:
+                time_stamp = os.path.getmtime(path)
+            except OSError:
+                continue
+            # (With refresh: background, refresh_fraction determines when to reload)
+            if self.expires > 0 and (
+                time() > time_stamp + self.refresh_fraction * self.expires
+            ):
+                return None
+            try:
+                item = read(path)
+            except Exception as e:
+                logger.warning(
+                    "Could not read disk cache file %s of datasource %s: %s",
+                    path,
+                    self.id,
+                    e,
+                )
+                return None
+            logger.debug(
+                "Returning disk-cached item for datasource %s", self.id
+            )
+            return item, time_stamp
+        return None
+
+    def _to_disk_cache(self, key, item, version=None) -> None:
+        if isinstance(item, pd.DataFrame):
+            ext, write = ".parquet", lambda f: item.to_parquet(f)
+        elif isinstance(item, bytes):
+            ext, write = ".bin", lambda f: f.write(item)
+        elif isinstance(item, str):
+            ext, write = ".txt", lambda f: f.write(item.encode("utf-8"))
+        else:
+            logger.debug(
+                "Not caching item of type %s on disk for datasource %s",
+                type(item),
+                self.id,
+            )
+            return
+        path = self._disk_cache_path(key, version) + ext
+        # Write to a temporary file first so that other processes never
+        # read half-written files
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                write(f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(
+                "Could not write disk cache file %s of datasource %s: %s",
+                path,
+                self.id,
+                e,
+            )
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
     def __del__(self):
         """Overwrite to clean up any resources (connections, temp files, etc.).
@@ -498,10 +1938,8 @@ def to_plain_python_obj(possible_ndarray):
             key: to_plain_python_obj(val)
             for key, val in possible_ndarray.items()
         }
-    if isinstance(possible_ndarray, np.int64):
-        return int(possible_ndarray)
-    if isinstance(possible_ndarray, np.float32):
-        return float(possible_ndarray)
+    if isinstance(possible_ndarray, np.generic):
+        return _numpy_scalar_to_python(possible_ndarray)
     elif isinstance(possible_ndarray, list) or isinstance(
         possible_ndarray, tuple
     ):
@@ -516,6 +1954,95 @@ def to_plain_python_obj(possible_ndarray):
         return possible_ndarray
 
 
+def _numpy_scalar_to_python(value: np.generic):
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+    return value.item()
+
+
+def _column_to_list(column: pd.Series) -> List:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return [None if v is pd.NaT else v.isoformat() for v in column]
+    return column.tolist()
+
+
+def _json_default(obj):
+    """Convert objects which the json module does not know how to serialize.
+    Arrays and DataFrames are converted as a whole or column by column,
+    instead of element by element.
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "M":  # datetime64
+            if obj.ndim > 1:
+                return [_json_default(row) for row in obj]
+            return _column_to_list(pd.Series(obj))
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return _numpy_scalar_to_python(obj)
+    if isinstance(obj, pd.DataFrame):
+        index = obj.index.tolist()
+        return {
+            col: dict(zip(index, _column_to_list(obj[col])))
+            for col in obj.columns
+        }
+    if isinstance(obj, pd.Series):
+        return dict(zip(obj.index.tolist(), _column_to_list(obj)))
+    if isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(type(obj).__name__)
+    )
+
+
+@lru_cache(maxsize=None)
+def _import_orjson():
+    try:
+        import orjson
+    except ModuleNotFoundError:
+        logger.debug("orjson not installed, serializing using json module")
+        return None
+    return orjson
+
+
+def to_json_bytes(obj, indent: bool = False) -> bytes:
+    """Serialize `obj` to UTF-8 encoded JSON.
+
+    Like `json.dumps(to_plain_python_obj(obj))`, but without creating a
+    converted copy of `obj` first: Plain containers are walked by the JSON
+    encoder, and only numpy and pandas objects are converted (arrays and
+    DataFrames as a whole or column by column). In addition, all numpy
+    scalar types and datetimes are supported.
+
+    If the optional package `orjson` is installed, it is used for
+    serializing, which is several times faster. Note that orjson
+    serializes NaN and infinity as `null`.
+
+    Params:
+        obj:    object to serialize
+        indent: indent the output by 2 spaces, default: compact output
+
+    Returns:
+        JSON as bytes
+    """
+    orjson = _import_orjson()
+    if orjson is not None:
+        # Not using orjson's native numpy support, which e.g. turns NaT
+        # into 1970-01-01, but converting numpy objects in _json_default
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_json_default, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers with more than 64 bits
+            logger.debug("orjson failed, serializing using json module")
+    if indent:
+        return json.dumps(obj, default=_json_default, indent=2).encode("utf-8")
+    return json.dumps(
+        obj, default=_json_default, separators=(",", ":")
+    ).encode("utf-8")
+
+
 _order_columns_called = 0
 
 
@@ -0,0 +1,251 @@
+"""This module contains a lightweight WSGI request router which distributes
+   API requests over several ML Launchpad API nodes such that requests with
+   the same routing key (e.g. the same resource id) always go to the same node
+   (as long as it is not overloaded). That way, each node's DataSource
+   caches hold a separate share of the keys, and the cluster's effective
+   cache size grows with the number of nodes.
+
+Example:
+    `$ gunicorn -w 1 --threads 16 --bind 0.0.0.0:5000 "mllaunchpad.router:create_application()"`
+"""
+
+# Stdlib imports
+import bisect
+import hashlib
+import logging
+import math
+import threading
+import urllib.error
+import urllib.request
+from http import HTTPStatus
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+
+logger = logging.getLogger(__name__)
+
+# Headers which must not be forwarded by proxies, see RFC 2616, section 13.5.1
+_hop_by_hop_headers = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(
+        hashlib.sha256(key.encode("utf-8")).digest()[:8], "big"
+    )
+
+
+class ConsistentHashRing:
+    """Consistent hashing with bounded loads.
+
+    Every node is placed on the hash ring `replicas` times. A key is assigned
+    to the first node clockwise from the key's hash whose current load
+    (number of requests in progress) is below the capacity
+    ``ceil(load_factor * (total_load + 1) / number_of_nodes)``. Keys stay
+    with "their" node unless it is overloaded, in which case they spill over
+    to the next node on the ring.
+    """
+
+    def __init__(
+        self, nodes: List[str], replicas: int = 100, load_factor: float = 1.25
+    ):
+        if not nodes:
+            raise ValueError("router:nodes must contain at least one node")
+        if load_factor < 1:
+            raise ValueError(
+                "router:load_factor must be at least 1, got {}".format(
+                    load_factor
+                )
+            )
+        self.nodes = list(nodes)
+        self.load_factor = load_factor
+        self.loads: Dict[str, int] = {node: 0 for node in self.nodes}
+        self._lock = threading.Lock()
+        ring = sorted(
+            (_hash("{}#{}".format(node, i)), node)
+            for node in self.nodes
+            for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in ring]
+        self._ring_nodes = [node for _, node in ring]
+
+    def candidates(self, key: str) -> List[str]:
+        """All nodes in ring order, starting with the node responsible for `key`."""
+        start = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        seen: List[str] = []
+        for i in range(len(self._ring_nodes)):
+            node = self._ring_nodes[(start + i) % len(self._ring_nodes)]
+            if node not in seen:
+                seen.append(node)
+                if len(seen) == len(self.nodes):
+                    break
+        return seen
+
+    def acquire(self, key: str, exclude=()) -> Optional[str]:
+        """Get the node to use for `key`, and count the request towards its load.
+        Call :meth:`release` when the request is done.
+        """
+        with self._lock:
+            total = sum(self.loads.values())
+            capacity = math.ceil(
+                self.load_factor * (total + 1) / len(self.nodes)
+            )
+            candidates = [n for n in self.candidates(key) if n not in exclude]
+            if not candidates:
+                return None
+            node = next(
+                (n for n in candidates if self.loads[n] < capacity),
+                candidates[0],
+            )
+            self.loads[node] += 1
+            return node
+
+    def release(self, node: str) -> None:
+        with self._lock:
+            self.loads[node] -= 1
+
+
+class RoutingApp:
+    """WSGI application which forwards each request to one of the configured
+    API nodes, chosen by consistent hashing of the request's routing key.
+
+    The routing key is the value of the query or form parameter configured
+    as ``router:routing_param``. If the parameter is not present in the
+    request (or not configured), the request's path is used, which contains
+    the resource id for APIs with :ref:`URL parameters <urlparams>`.
+
+    If a node cannot be reached, the request is forwarded to the next node
+    on the hash ring.
+    """
+
+    def __init__(self, router_config: Dict):
+        self.routing_param = router_config.get("routing_param")
+        self.timeout = router_config.get("timeout", 60)
+        self.ring = ConsistentHashRing(
+            [n.rstrip("/") for n in router_config["nodes"]],
+            replicas=router_config.get("replicas", 100),
+            load_factor=router_config.get("load_factor", 1.25),
+        )
+
+    def _get_routing_key(self, environ: Dict, body: bytes) -> str:
+        if self.routing_param:
+            params = parse_qs(environ.get("QUERY_STRING", ""))
+            if environ.get("CONTENT_TYPE", "").startswith(
+                "application/x-www-form-urlencoded"
+            ):
+                params.update(parse_qs(body.decode("latin-1")))
+            if self.routing_param in params:
+                return params[self.routing_param][0]
+        return environ.get("PATH_INFO", "")
+
+    def _forward(self, node: str, environ: Dict, body: bytes):
+        url = node + environ.get("PATH_INFO", "")
+        if environ.get("QUERY_STRING"):
+            url += "?" + environ["QUERY_STRING"]
+        headers = {
+            key[5:].replace("_", "-").title(): value
+            for key, value in environ.items()
+            if key.startswith("HTTP_")
+            and key[5:].replace("_", "-").lower() not in _hop_by_hop_headers
+        }
+        if environ.get("CONTENT_TYPE"):
+            headers["Content-Type"] = environ["CONTENT_TYPE"]
+        req = urllib.request.Request(
+            url,
+            data=body or None,
+            headers=headers,
+            method=environ.get("REQUEST_METHOD", "GET"),
+        )
+        try:
+            # Only configured node URLs are requested, so no arbitrary schemes:
+            with urllib.request.urlopen(  # nosec
+                req, timeout=self.timeout
+            ) as response:
+                return (
+                    response.status,
+                    list(response.headers.items()),
+                    response.read(),
+                )
+        except urllib.error.HTTPError as e:
+            # Error responses of the node are forwarded as they are
+            return e.code, list(e.headers.items()), e.read()
+
+    def __call__(self, environ, start_response):
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        body = environ["wsgi.input"].read(length) if length else b""
+        key = self._get_routing_key(environ, body)
+
+        tried: List[str] = []
+        while True:
+            node = self.ring.acquire(key, exclude=tried)
+            if node is None:
+                start_response(
+                    "502 Bad Gateway", [("Content-Type", "text/plain")]
+                )
+                return [b"No API node reachable"]
+            try:
+                logger.debug("Routing key %s to node %s", key, node)
+                status, headers, content = self._forward(node, environ, body)
+                break
+            except (urllib.error.URLError, OSError) as e:
+                logger.warning("API node %s not reachable: %s", node, e)
+                tried.append(node)
+            finally:
+                self.ring.release(node)
+
+        headers = [
+            (k, v)
+            for k, v in headers
+            if k.lower() not in _hop_by_hop_headers
+            and k.lower() != "content-length"
+        ]
+        headers.append(("Content-Length", str(len(content))))
+        start_response("{} {}".format(status, _reason(status)), headers)
+        return [content]
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+def create_application(config: Optional[Dict] = None) -> RoutingApp:
+    """Create the routing WSGI application from the ``router:`` section of the
+    configuration.
+
+    Configuration example::
+
+        router:
+          nodes:  # The ML Launchpad API nodes to distribute requests over
+            - http://10.0.0.1:5000
+            - http://10.0.0.2:5000
+          routing_param: client_id  # Optional, default: route by URL path
+          load_factor: 1.25  # Optional: max load of a node relative to the average load
+          replicas: 100      # Optional: number of virtual nodes per node on the hash ring
+          timeout: 60        # Optional: timeout in seconds for requests to nodes
+
+    :param config: configuration dict
+    :type config: optional dict, default: load config from LAUNCHPAD_CFG or ./LAUNCHPAD_CFG.yml
+
+    :return: WSGI application
+    """
+    if config is None:
+        from mllaunchpad import config as mllp_config
+
+        config = mllp_config.get_validated_config()
+    if "router" not in config:
+        raise ValueError("Missing key in config file: router")
+    return RoutingApp(config["router"])
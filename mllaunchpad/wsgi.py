@@ -7,7 +7,7 @@ Example:
 
 # Stdlib imports
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 # Third-party imports
 from flask import Flask
@@ -22,21 +22,24 @@ logger = logging.getLogger(__name__)
 
 # In order to be able to generate API docs automatically, it is unfortunately
 # necessary to wrap the preparatory code in a try:except: statement.
-conf: Optional[Dict]
+confs: Optional[List[Dict]]
 try:
-    conf = config.get_validated_config()
+    # The config file can also list several models to serve (see docs)
+    confs = config.get_validated_configs()
 except FileNotFoundError:
     logger.error(
         "Config file could not be loaded. Starting the Flask application "
         "will fail."
     )
-    conf = None
+    confs = None
 
-if conf:
+if confs:
     # if you change the name of the application variable, you need to
     # specify it explicitly for gunicorn: gunicorn ... launchpad.wsgi:appname
-    application = Flask(__name__, root_path=conf["api"].get("root_path"))
-    ModelApi(conf, application)
+    application = Flask(__name__, root_path=confs[0]["api"].get("root_path"))
+    for conf in confs:
+        # Models share DataSources with identical configuration
+        ModelApi(conf, application)
 
     if __name__ == "__main__":  # pragma: no cover
         logger.warning(
@@ -1,12 +1,18 @@
 """Tests for `mllaunchpad.api` module."""
 
 # Stdlib imports
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 # Third-party imports
+import numpy as np
 import pandas as pd
 import pytest
 import ramlfications
+from flask import Flask
+from flask_restful import reqparse
+from werkzeug.datastructures import FileStorage
 
 # Project imports
 import mllaunchpad.api as api
@@ -300,3 +306,434 @@ def test_generate_raml():
     # Should be parseable
     parsed_raml(out)
     assert "/findme" in out
+
+
+@mock.patch(
+    "ramlfications.parse",
+    autospec=True,
+    side_effect=lambda _: parsed_raml(minimal_raml_str),
+)
+@mock.patch("mllaunchpad.api.Api", autospec=True)
+@mock.patch(
+    "mllaunchpad.resource.ModelStore.load_trained_model",
+    side_effect=lambda _: load_model_result(minimal_config),
+)
+def test_model_modelapi_predict_using_model_batching(
+    load_model_mock, api_mock, raml_mock, app
+):
+    """Should return expected output when predicting in micro-batches."""
+    cfg = {**minimal_config, "api": {**minimal_config["api"]}}
+    cfg["api"]["batching"] = {"max_batch_size": 4, "max_wait_ms": 10}
+    a = api.ModelApi(cfg, app)
+    assert a.batcher is not None
+    output = a.predict_using_model({"a": [1, 2, 3]})
+    assert output == prediction_output
+
+
+@mock.patch(
+    "ramlfications.parse",
+    autospec=True,
+    side_effect=lambda _: parsed_raml(minimal_raml_str),
+)
+@mock.patch("mllaunchpad.api.Api", autospec=True)
+@mock.patch(
+    "mllaunchpad.resource.ModelStore.load_trained_model",
+    side_effect=lambda _: load_model_result(minimal_config),
+)
+def test_model_modelapi_predict_using_model_response_cache(
+    load_model_mock, api_mock, raml_mock, app
+):
+    """Should predict repeated requests only once, regardless of argument order."""
+    cfg = {**minimal_config, "api": {**minimal_config["api"]}}
+    a = api.ModelApi(cfg, app)
+    assert a.response_cache_stats() is None
+
+    cfg["api"]["response_cache"] = {"size": 2}
+    a = api.ModelApi(cfg, app)
+    with mock.patch.object(
+        a.model_wrapper, "predict", wraps=a.model_wrapper.predict
+    ) as predict:
+        for _ in range(3):
+            assert a.predict_using_model({"a": 1, "b": 2}) == prediction_output
+        assert a.predict_using_model({"b": 2, "a": 1}) == prediction_output
+        assert a.predict_using_model({"a": 2, "b": 2}) == prediction_output
+        assert a.predict_using_model({"file": FileStorage()})
+    assert predict.call_count == 3
+    assert a.response_cache_stats() == {
+        "hits": 3,
+        "misses": 2,
+        "evictions": 0,
+        "items": 2,
+    }
+
+
+@mock.patch(
+    "ramlfications.parse",
+    autospec=True,
+    side_effect=lambda _: parsed_raml(minimal_raml_str),
+)
+@mock.patch("mllaunchpad.api.Api", autospec=True)
+@mock.patch("mllaunchpad.resource.ModelStore.get_model_mtime")
+@mock.patch("mllaunchpad.resource.ModelStore.load_trained_model")
+def test_model_modelapi_reload_model(
+    load_model_mock, mtime_mock, api_mock, raml_mock, app
+):
+    """Should serve a new model only after it has been loaded and warmed up."""
+    load_model_mock.side_effect = lambda _: load_model_result(minimal_config)
+    mtime_mock.return_value = 1.0
+    cfg = {**minimal_config, "api": {**minimal_config["api"]}}
+    cfg["api"]["response_cache"] = {"size": 2}
+    a = api.ModelApi(cfg, app)
+    old_model = a.model_wrapper
+    a.predict_using_model({"a": 1})
+    assert not a.reload_model()
+    assert a.model_wrapper is old_model
+
+    # Warm-up fails: keep serving the old model
+    a._warmup_args = {"a": 2}
+    mtime_mock.return_value = 2.0
+    with mock.patch.object(
+        MockModelClass, "predict", side_effect=RuntimeError("broken")
+    ):
+        assert not a.reload_model()
+    assert a.model_wrapper is old_model
+    assert a.response_cache_stats()["items"] == 1
+
+    assert a.reload_model()
+    assert a.model_wrapper is not old_model
+    assert a.response_cache_stats()["items"] == 0
+    assert load_model_mock.call_count == 3
+
+    # Stored again while loading: retry on the next check
+    new_model = a.model_wrapper
+    mtime_mock.side_effect = [3.0, 4.0]
+    assert not a.reload_model()
+    assert a.model_wrapper is new_model
+    mtime_mock.side_effect = None
+    mtime_mock.return_value = 4.0
+    assert a.reload_model()
+    assert a.model_wrapper is not new_model
+
+
+@mock.patch(
+    "ramlfications.parse",
+    autospec=True,
+    side_effect=lambda _: parsed_raml(minimal_raml_str),
+)
+@mock.patch("mllaunchpad.api.Api", autospec=True)
+@mock.patch("mllaunchpad.resource.ModelStore.get_best_model")
+@mock.patch("mllaunchpad.resource.ModelStore.get_model_mtime")
+@mock.patch("mllaunchpad.resource.ModelStore.load_trained_model")
+def test_model_modelapi_serve_best_model(
+    load_model_mock, mtime_mock, best_mock, api_mock, raml_mock, app
+):
+    """Should serve the model with the best metric, also on reloading."""
+    load_model_mock.side_effect = lambda conf: load_model_result(
+        {"model": conf}
+    )
+    mtime_mock.return_value = 1.0
+    best_mock.return_value = None
+    cfg = {**minimal_config, "api": {**minimal_config["api"]}}
+    cfg["api"]["serve_best_model"] = {"metric": "acc"}
+    a = api.ModelApi(cfg, app)
+    best_mock.assert_called_once_with("my_api", "acc", True)
+    assert a.model_meta["version"] == "1.2.3"  # Fallback to configured model
+
+    best_mock.return_value = {"name": "my_model", "version": "1.2.3"}
+    assert not a.reload_model()
+    best_mock.return_value = {"name": "other_model", "version": "2.0.0"}
+    assert a.reload_model()
+    assert a.model_meta["name"] == "other_model"
+    assert a.model_meta["version"] == "2.0.0"
+    # The configured model's other settings still apply
+    assert load_model_mock.call_args[0][0]["module"] == "my_module"
+    assert not a.reload_model()
+    # The served model gets its own name and version
+    with mock.patch.object(
+        MockModelClass, "predict", return_value=prediction_output
+    ) as predict_mock:
+        a.predict_using_model({"a": 1})
+    model_conf = predict_mock.call_args[0][0]
+    assert model_conf["name"] == "other_model"
+    assert model_conf["version"] == "2.0.0"
+
+
+@mock.patch("mllaunchpad.resource.get_resident_bytes", side_effect=[100, 150])
+def test_model_modelapi_load_model_memory(resident_mock):
+    store = mock.Mock()
+    store.load_trained_model.return_value = (
+        "model",
+        {
+            "name": "bla",
+            "version": "1.0.0",
+            "created": "now",
+            "serialization": {"mapped_bytes": 1000},
+        },
+    )
+    model, meta = api.ModelApi._load_model(store, {"name": "bla"})
+    assert model == "model"
+    assert meta["serialization"]["mapped_bytes"] == 1000
+    assert meta["serialization"]["resident_bytes"] == 50
+
+
+@mock.patch(
+    "ramlfications.parse",
+    autospec=True,
+    side_effect=lambda _: parsed_raml(minimal_raml_str),
+)
+@mock.patch("mllaunchpad.api.Api", autospec=True)
+@mock.patch(
+    "mllaunchpad.resource.ModelStore.load_trained_model",
+    side_effect=lambda _: load_model_result(minimal_config),
+)
+def test_model_modelapi_model_watcher(
+    load_model_mock, api_mock, raml_mock, app
+):
+    """Should check for new models in a background thread."""
+    cfg = {**minimal_config, "api": {**minimal_config["api"]}}
+    cfg["api"]["model_reload"] = {"interval": 0.01}
+    reloaded = threading.Event()
+    with mock.patch.object(
+        api.ModelApi, "reload_model", side_effect=reloaded.set
+    ):
+        a = api.ModelApi(cfg, app)
+        # Started on the first request, e.g. after forking
+        assert a._watcher is None
+        a.predict_using_model({"a": 1})
+        assert reloaded.wait(5)
+        a.stop_model_watcher()
+        a.predict_using_model({"a": 1})
+    assert a._watcher is None
+
+
+def test_response_cache():
+    meta = {"name": "m", "version": "1.0.0", "created": "yesterday"}
+    cache = api.ResponseCache(size=2, ttl=10)
+    key = cache.make_key(meta, {"x": 1})
+    assert key != cache.make_key({**meta, "created": "today"}, {"x": 1})
+    assert cache.get(key) == (False, None)
+
+    with mock.patch("mllaunchpad.api.time.time", return_value=100):
+        cache.put(key, "out")
+        cache.put(cache.make_key(meta, {"x": 2}), "out2")
+        cache.put(cache.make_key(meta, {"x": 3}), "out3")
+        assert cache.get(key) == (False, None)  # evicted
+        cache.put(key, "out")
+        assert cache.get(key) == (True, "out")
+    with mock.patch("mllaunchpad.api.time.time", return_value=111):
+        assert cache.get(key) == (False, None)  # expired
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 3,
+        "evictions": 2,
+        "items": 1,
+    }
+
+    cache.clear()
+    assert cache.stats()["items"] == 0
+
+    with pytest.raises(ValueError, match="size"):
+        api.ResponseCache(size=0)
+
+
+def test_prediction_batcher_batches_concurrent_requests():
+    """Concurrent requests should be predicted together, results split back."""
+    batch_sizes = []
+
+    def predict_batch(args_dicts):
+        batch_sizes.append(len(args_dicts))
+        return [a["x"] * 2 for a in args_dicts]
+
+    batcher = api.PredictionBatcher(
+        predict_batch, max_batch_size=5, max_wait_ms=200
+    )
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(
+            pool.map(lambda x: batcher.predict({"x": x}), range(10))
+        )
+
+    assert results == [x * 2 for x in range(10)]
+    assert sum(batch_sizes) == 10
+    assert max(batch_sizes) <= 5
+    assert len(batch_sizes) < 10
+
+
+def test_prediction_batcher_errors():
+    """Errors during batch prediction should be raised in all waiting requests."""
+
+    def failing_predict_batch(args_dicts):
+        raise RuntimeError("no luck")
+
+    batcher = api.PredictionBatcher(failing_predict_batch)
+    with pytest.raises(RuntimeError, match="no luck"):
+        batcher.predict({"x": 1})
+
+    batcher = api.PredictionBatcher(lambda args_dicts: [])
+    with pytest.raises(ValueError, match="results"):
+        batcher.predict({"x": 1})
+
+    with pytest.raises(ValueError, match="max_batch_size"):
+        api.PredictionBatcher(lambda args_dicts: [], max_batch_size=0)
+
+
+@pytest.fixture()
+def batch_client():
+    raml = raml_head_str + raml_query_resource_str.replace(
+        "type: string", "type: integer"
+    )
+    app = Flask(__name__)
+    with mock.patch(
+        "ramlfications.parse",
+        autospec=True,
+        side_effect=lambda _: parsed_raml(raml),
+    ), mock.patch(
+        "mllaunchpad.resource.ModelStore.load_trained_model",
+        side_effect=lambda _: load_model_result(minimal_config),
+    ):
+        _ = api.ModelApi(minimal_config, app)
+    return app.test_client()
+
+
+def test_several_models_in_one_app():
+    """Should serve several models from the same application."""
+    raml = raml_head_str + raml_query_resource_str
+    other_config = {
+        **minimal_config,
+        "model": {**minimal_config["model"], "name": "other_model"},
+        "api": {**minimal_config["api"], "name": "other_api"},
+    }
+    app = Flask(__name__)
+    with mock.patch(
+        "ramlfications.parse",
+        autospec=True,
+        side_effect=lambda _: parsed_raml(raml),
+    ), mock.patch(
+        "mllaunchpad.resource.ModelStore.load_trained_model",
+        side_effect=lambda model_conf: load_model_result(
+            {"model": model_conf}
+        ),
+    ):
+        _ = api.ModelApi(minimal_config, app)
+        _ = api.ModelApi(other_config, app)
+    client = app.test_client()
+    for api_name in ["my_api", "other_api"]:
+        response = client.post(
+            "/{}/v1/something/batch".format(api_name),
+            json={"aparam": ["a"]},
+        )
+        assert response.status_code == 200
+
+
+def test_batch_resource_columnar(batch_client):
+    """Should predict each row of a columnar JSON body."""
+    response = batch_client.post(
+        "/my_api/v1/something/batch", json={"aparam": [1, 2, 3]}
+    )
+    assert response.status_code == 200
+    assert response.get_json() == [prediction_output] * 3
+
+
+def test_batch_resource_ndjson(batch_client):
+    """Should predict each line of a newline-delimited JSON body."""
+    response = batch_client.post(
+        "/my_api/v1/something/batch",
+        data='{"aparam": 1}\n{"aparam": 2}\n',
+        content_type="application/x-ndjson",
+    )
+    assert response.status_code == 200
+    assert response.get_json() == [prediction_output] * 2
+
+
+def test_batch_resource_numpy_output(batch_client):
+    """Should write numpy/pandas outputs as JSON column by column."""
+    output = pd.DataFrame(
+        {
+            "p": np.array([1, 2], dtype=np.int32),
+            "t": pd.to_datetime(["2020-01-02", None]),
+        }
+    )
+    with mock.patch.object(
+        MockModelClass, "predict_batch", return_value=output
+    ):
+        response = batch_client.post(
+            "/my_api/v1/something/batch", json={"aparam": [1, 2]}
+        )
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "p": [1, 2],
+        "t": ["2020-01-02T00:00:00", None],
+    }
+
+
+def test__output_json():
+    app = Flask(__name__)
+    with app.app_context():
+        response = api._output_json(
+            {"a": np.float32(0.5)}, 201, headers={"X-Bla": "blu"}
+        )
+    assert response.status_code == 201
+    assert response.headers["X-Bla"] == "blu"
+    assert response.get_json() == {"a": 0.5}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"aparam": [1, "abc"]},  # wrong type
+        {"aparam": [1.5, 2]},  # not an integer
+        {"aparam": [1, None]},  # missing required value
+        {"other": [1, 2]},  # missing required param and unknown param
+        {"aparam": [1, 2], "other": [1]},  # different lengths
+        [1, 2, 3],  # not columnar
+    ],
+)
+def test_batch_resource_invalid(batch_client, body):
+    """Should respond with 400 Bad Request if body does not fit RAML."""
+    response = batch_client.post("/my_api/v1/something/batch", json=body)
+    assert response.status_code == 400
+
+
+def test_batch_resource_ndjson_invalid(batch_client):
+    """Should respond with 400 Bad Request if an NDJSON line is no object."""
+    response = batch_client.post(
+        "/my_api/v1/something/batch",
+        data='{"aparam": 1}\n1\n',
+        content_type="application/x-ndjson",
+    )
+    assert response.status_code == 400
+
+
+def test__validate_batch_dataframe():
+    parser = reqparse.RequestParser()
+    parser.add_argument("num", type=float, required=True)
+    parser.add_argument("opt", type=str, required=False, default="x")
+    parser.add_argument("choice", type=str, choices=["a", "b"])
+    df = pd.DataFrame({"num": ["1.5", 2], "choice": ["a", "b"]})
+
+    out = api._validate_batch_dataframe(parser, df)
+    assert str(out["num"].dtype) == "float64"
+    assert list(out["opt"]) == ["x", "x"]
+
+    df = pd.DataFrame({"num": [1], "choice": ["c"]})
+    with pytest.raises(ValueError, match="choice"):
+        api._validate_batch_dataframe(parser, df)
+
+
+def test__validate_batch_dataframe_optional_values():
+    parser = reqparse.RequestParser()
+    parser.add_argument("count", type=int, required=False, default=3)
+    parser.add_argument("label", type=str, required=False)
+    parser.add_argument("choice", type=str, choices=["a", "b"])
+    df = pd.DataFrame(
+        {
+            "count": [1, None, 2],
+            "label": [1, None, "x"],
+            "choice": ["a", None, "b"],
+        }
+    )
+
+    out = api._validate_batch_dataframe(parser, df)
+    assert str(out["count"].dtype) == "int64"
+    assert list(out["count"]) == [1, 3, 2]
+    assert list(out["label"]) == ["1", None, "x"]
+    assert list(out["choice"]) == ["a", None, "b"]
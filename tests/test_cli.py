@@ -154,3 +154,40 @@ def test_generate_raml(config, raml, runner_cfg_logcfg):
     assert result.exit_code == 0
     raml.assert_called()
     assert "my_raml" in result.output
+
+
+@mock.patch("{}.run_simple".format(cli.__name__))
+@mock.patch("{}.create_application".format(cli.__name__))
+@mock.patch("{}.Settings.config".format(cli.__name__))
+def test_route(config, create_app, run_simple, runner_cfg_logcfg, caplog):
+    """Test the CLI request router startup."""
+    runner, cfg, _ = runner_cfg_logcfg
+
+    result = runner.invoke(cli.main, ["--config", cfg, "route", "-p", "5002"])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "production".lower() in caplog.text.lower()
+    create_app.assert_called_with(config)
+    run_simple.assert_called_with(
+        "127.0.0.1", 5002, create_app.return_value, threaded=True
+    )
+
+
+@mock.patch(
+    "{}.mllp.batch_predict".format(cli.__name__), return_value="my_stats"
+)
+@mock.patch("{}.Settings.config".format(cli.__name__))
+def test_batch_predict(config, batch_predict, runner_cfg_logcfg):
+    """Test the batch prediction command."""
+    runner, cfg, _ = runner_cfg_logcfg
+
+    result = runner.invoke(
+        cli.main,
+        ["--config", cfg, "batch-predict", "-i", "in", "-o", "out", "-w", "2"],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    batch_predict.assert_called_with(
+        config, "in", "out", chunksize=10000, workers=2, use_live_code=True
+    )
+    assert "my_stats" in result.output
@@ -71,6 +71,47 @@ def test_get_validated_config_str(caplog):
     assert cfg["api"]["name"] == "my_api"
 
 
+test_file_models = b"""
+models:
+  - model_store:
+      location: asdfasdf
+    model:
+      name: my_model
+      version: '0.1.2'
+      module: my_model
+    api:
+      name: my_api
+  - model_store:
+      location: asdfasdf
+    model:
+      name: other_model
+      version: '1.0.0'
+      module: other_model
+    api:
+      name: other_api
+"""
+
+
+def test_get_validated_configs():
+    mo = mock.mock_open(read_data=test_file_models)
+    mo.return_value.name = "./foobar.yml"
+    with mock.patch("builtins.open", mo, create=True):
+        cfgs = config.get_validated_configs("lalala")
+    assert [c["api"]["name"] for c in cfgs] == ["my_api", "other_api"]
+
+    cfgs = config.get_validated_configs_str(test_file_valid)
+    assert [c["api"]["name"] for c in cfgs] == ["my_api"]
+
+
+@pytest.mark.parametrize(
+    "models",
+    [b"models: []", b"models: {a: b}", b"models:\n  - model: {name: x}"],
+)
+def test_get_validated_configs_invalid(models):
+    with pytest.raises(ValueError, match="models|Missing key"):
+        _ = config.get_validated_configs_str(models)
+
+
 test = b"""
 
      xob10:
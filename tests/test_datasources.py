@@ -1,4 +1,6 @@
 # Stdlib imports
+import os
+import sqlite3
 import sys
 from io import BytesIO
 from unittest import mock
@@ -12,6 +14,22 @@ import pytest
 import mllaunchpad.datasources as mllp_ds
 
 
+@pytest.fixture(autouse=True)
+def no_shared_engines():
+    """Don't share (mocked) database engines between tests."""
+    mllp_ds._engines.clear()
+
+
+@pytest.fixture(autouse=True)
+def restore_sqlalchemy():
+    """Tests replacing sqlalchemy by a mock delete it from sys.modules
+    afterwards, which breaks the real sqlalchemy if it has been imported."""
+    sqlalchemy = sys.modules.get("sqlalchemy")
+    yield
+    if sqlalchemy is not None:
+        sys.modules["sqlalchemy"] = sqlalchemy
+
+
 @pytest.fixture()
 def filedatasource_cfg_and_file():
     def _inner(file_type):
@@ -84,6 +102,29 @@ def test_filedatasource_raw(file_type, filedatasource_cfg_and_file):
             assert False  # Unsupported type
 
 
+@pytest.mark.parametrize("file_type", ["parquet", "feather", "arrow_ipc"])
+def test_filedatasource_arrow(file_type, tmp_path):
+    """Arrow-based file types should round-trip, support column projection and chunks."""
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "data.{}".format(file_type))
+    data = pd.DataFrame({"a": [1.1, 2.3, 3.5], "b": ["ad", "df", "x"]})
+    sink_cfg = {"type": file_type, "path": path, "options": {}}
+    mllp_ds.FileDataSink("bla", sink_cfg).put_dataframe(data)
+
+    cfg = {"type": file_type, "path": path, "expires": 0, "options": {}}
+    df = mllp_ds.FileDataSource("bla", cfg).get_dataframe()
+    pd.testing.assert_frame_equal(df, data, check_dtype=False)
+
+    cfg["options"] = {"columns": ["b"]}
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    df = ds.get_dataframe()
+    assert list(df.columns) == ["b"]
+
+    chunks = list(ds.get_dataframe(chunksize=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    assert list(pd.concat(chunks)["b"]) == list(data["b"])
+
+
 def test_filedatasource_notimplemented(filedatasource_cfg_and_file):
     cfg, _ = filedatasource_cfg_and_file("csv")
     ds = mllp_ds.FileDataSource("bla", cfg)
@@ -96,8 +137,6 @@ def test_filedatasource_notimplemented(filedatasource_cfg_and_file):
     ds = mllp_ds.FileDataSource("bla", cfg)
     with pytest.raises(NotImplementedError):
         ds.get_raw(params={"a": "hallo"})
-    with pytest.raises(NotImplementedError):
-        ds.get_raw(chunksize=5)
     with pytest.raises(TypeError, match="get_raw"):
         ds.get_dataframe()
 
@@ -165,6 +204,196 @@ def test_filedatasink_raw(file_type, mode, filedatasink_cfg_and_data):
         mo.assert_called_once_with(cfg["path"], mode)
 
 
+@pytest.mark.parametrize(
+    "file_type", ["csv", "euro_csv", "parquet", "feather", "arrow_ipc"]
+)
+def test_filedatasink_df_generator(file_type, tmp_path):
+    """Iterables of dataframes are written one after another"""
+    if file_type in mllp_ds.ARROW_FILE_TYPES:
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / "data")
+    cfg = {"type": file_type, "path": path, "tags": [], "expires": 0}
+    # The second chunk has an int column where the first has floats
+    chunks = [
+        pd.DataFrame({"a": [1.5, np.nan], "b": ["x", "y"]}),
+        pd.DataFrame({"a": [3, 4], "b": ["z", "w"]}, index=[2, 3]),
+    ]
+
+    mllp_ds.FileDataSink("bla", cfg).put_dataframe(iter(chunks))
+
+    df = mllp_ds.FileDataSource("bla", cfg).get_dataframe()
+    pd.testing.assert_frame_equal(
+        df, pd.concat(chunks).astype({"a": float}), check_index_type=False
+    )
+
+
+@pytest.mark.parametrize("file_type", ["feather", "arrow_ipc"])
+def test_filedatasink_feather_options(file_type, tmp_path):
+    """write_feather options should apply to single and chunked dataframes"""
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "data")
+    options = {"compression": "zstd", "compression_level": 5, "chunksize": 1}
+    cfg = {"type": file_type, "path": path, "expires": 0}
+    data = pd.DataFrame({"a": [1.5, 2.5], "b": ["x", "y"]})
+    for df in [data, iter([data.iloc[:1], data.iloc[1:]])]:
+        sink_cfg = dict(cfg, options=dict(options))
+        mllp_ds.FileDataSink("bla", sink_cfg).put_dataframe(df)
+        df = mllp_ds.FileDataSource("bla", cfg).get_dataframe()
+        pd.testing.assert_frame_equal(df, data)
+
+    sink = mllp_ds.FileDataSink("bla", dict(cfg, options={"bla": 1}))
+    with pytest.raises(ValueError, match="bla"):
+        sink.put_dataframe(iter([data]))
+
+
+def test_filedatasource_raw_chunksize(tmp_path):
+    bin_path = tmp_path / "file.bin"
+    bin_path.write_bytes(b"0123456789ab")
+    ds = mllp_ds.FileDataSource(
+        "bla", {"type": "binary_file", "path": str(bin_path)}
+    )
+    assert list(ds.get_raw(chunksize=5)) == [b"01234", b"56789", b"ab"]
+
+    txt_path = tmp_path / "file.txt"
+    txt_path.write_text("a\nb\nc\n")
+    ds = mllp_ds.FileDataSource(
+        "bla", {"type": "text_file", "path": str(txt_path)}
+    )
+    assert list(ds.get_raw(chunksize=2)) == ["a\nb\n", "c\n"]
+
+
+def test_filedatasource_raw_mmap(tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"0123456789")
+    ds = mllp_ds.FileDataSource(
+        "bla", {"type": "binary_file", "path": str(path), "mmap": True}
+    )
+    raw = ds.get_raw()
+    assert isinstance(raw, memoryview)
+    assert raw.readonly
+    assert raw[2:5] == b"234"
+    assert bytes(raw) == b"0123456789"
+    assert list(ds.get_raw(chunksize=4)) == [b"0123", b"4567", b"89"]
+
+
+def test_filedatasource_raw_mmap_empty(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    ds = mllp_ds.FileDataSource(
+        "bla", {"type": "binary_file", "path": str(path), "mmap": True}
+    )
+    assert ds.get_raw() == b""
+
+
+def test_filedatasource_raw_mmap_only_binary():
+    with pytest.raises(ValueError, match="mmap"):
+        mllp_ds.FileDataSource(
+            "bla", {"type": "text_file", "path": "x.txt", "mmap": True}
+        )
+
+
+def test_filedatasource_validate_mtime(tmp_path):
+    path = tmp_path / "file.csv"
+    path.write_text("a,b\n1,2\n")
+    cfg = {
+        "type": "csv",
+        "path": str(path),
+        "expires": -1,
+        "validate": "mtime",
+    }
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    df1 = ds.get_dataframe()
+    assert ds.get_dataframe() is df1
+
+    path.write_text("a,b\n3,4\n")
+    mtime = path.stat().st_mtime + 10
+    os.utime(str(path), (mtime, mtime))
+    df2 = ds.get_dataframe()
+    assert df2 is not df1
+    assert df2["a"][0] == 3
+    assert ds.get_dataframe() is df2
+
+
+@pytest.mark.parametrize(
+    "path, validate, match",
+    [
+        ("file.csv", "etag", "must be mtime"),
+        ("https://example.com/file.csv", "mtime", "local files"),
+    ],
+)
+def test_filedatasource_validate_config(path, validate, match):
+    cfg = {"type": "csv", "path": path, "expires": -1, "validate": validate}
+    with pytest.raises(ValueError, match=match):
+        mllp_ds.FileDataSource("bla", cfg)
+
+
+@pytest.fixture()
+def daily_csv_files(tmp_path):
+    for day in [1, 2, 3]:
+        path = tmp_path / "2026-10-0{}.csv".format(day)
+        path.write_text("a,b\n{0},x\n{0},y\n".format(day))
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_filedatasource_glob(workers, daily_csv_files):
+    cfg = {
+        "type": "csv",
+        "path": str(daily_csv_files / "2026-10-*.csv"),
+        "workers": workers,
+        "partition_column": "date",
+    }
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    df = ds.get_dataframe()
+    assert list(df["a"]) == [1, 1, 2, 2, 3, 3]
+    assert list(df.index) == list(range(6))
+    assert df["date"][2] == "2026-10-02"
+
+    chunks = list(ds.get_dataframe(chunksize=5))
+    assert len(chunks) == 3
+    assert list(chunks[1]["a"]) == [2, 2]
+    assert list(chunks[1]["date"]) == ["2026-10-02"] * 2
+
+
+def test_filedatasource_directory_hive(tmp_path):
+    for day in [1, 2]:
+        part_dir = tmp_path / "date=2026-10-0{}".format(day)
+        part_dir.mkdir()
+        (part_dir / "part-0.csv").write_text("a\n{}\n".format(day))
+        (part_dir / "_SUCCESS").write_text("")
+    cfg = {"type": "csv", "path": str(tmp_path), "partition_column": "date"}
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    df = ds.get_dataframe()
+    assert list(df["a"]) == [1, 2]
+    assert list(df["date"]) == ["2026-10-01", "2026-10-02"]
+
+
+def test_filedatasource_glob_errors(daily_csv_files):
+    cfg = {"type": "csv", "path": str(daily_csv_files / "*.parquet")}
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    with pytest.raises(FileNotFoundError, match="no files found"):
+        ds.get_dataframe()
+    cfg = {"type": "text_file", "path": str(daily_csv_files / "*.csv")}
+    with pytest.raises(ValueError, match="several files"):
+        mllp_ds.FileDataSource("bla", cfg)
+
+
+def test_filedatasource_glob_validate_mtime(daily_csv_files):
+    cfg = {
+        "type": "csv",
+        "path": str(daily_csv_files / "*.csv"),
+        "expires": -1,
+        "validate": "mtime",
+        "workers": 1,
+    }
+    ds = mllp_ds.FileDataSource("bla", cfg)
+    df1 = ds.get_dataframe()
+    assert ds.get_dataframe() is df1
+    (daily_csv_files / "2026-10-04.csv").write_text("a,b\n4,z\n")
+    df2 = ds.get_dataframe()
+    assert len(df2) == len(df1) + 1
+
+
 def test_filedatasink_notimplemented(filedatasink_cfg_and_data):
     cfg, data = filedatasink_cfg_and_data("csv")
     ds = mllp_ds.FileDataSink("bla", cfg)
@@ -231,8 +460,11 @@ def test_oracledatasource_df(user_pw, pd_read, oracledatasource_cfg_and_data):
     df = ds.get_dataframe()
 
     pd.testing.assert_frame_equal(df, data)
-    ora_mock.connect.assert_called_once()
+    ora_mock.create_pool.assert_called_once()
+    pool = ora_mock.create_pool.return_value
     pd_read.assert_called_once()
+    assert pd_read.call_args[1]["con"] is pool.acquire.return_value
+    pool.release.assert_called_once_with(pool.acquire.return_value)
 
     del sys.modules["cx_Oracle"]
 
@@ -253,9 +485,13 @@ def test_oracledatasource_df_chunksize(
 
     ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
     df_gen = ds.get_dataframe(chunksize=2)
+    pool = ora_mock.create_pool.return_value
 
     for df, orig in zip(df_gen, iter_data):
+        pool.release.assert_not_called()  # still fetching
         pd.testing.assert_frame_equal(df, orig)
+    assert list(df_gen) == []
+    pool.release.assert_called_once_with(pool.acquire.return_value)
 
     del sys.modules["cx_Oracle"]
 
@@ -351,12 +587,116 @@ def test_oracledatasource_regression_nas_issue86(
 
     pd.testing.assert_frame_equal(df, expected)
     # assert df == expected
-    ora_mock.connect.assert_called_once()
+    ora_mock.create_pool.assert_called_once()
     pd_read.assert_called_once()
 
     del sys.modules["cx_Oracle"]
 
 
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracledatasource_arraysize(user_pw, oracledatasource_cfg_and_data):
+    """Cursors used by pandas should fetch `arraysize` rows at once."""
+    cfg, dbms_cfg, data = oracledatasource_cfg_and_data()
+    cfg["query"] = "SELECT * FROM my_table WHERE a > :a"
+    cfg["arraysize"] = 2
+    con = sqlite3.connect(":memory:", check_same_thread=False)
+    data.to_sql("my_table", con=con, index=False)
+    ora_mock = mock.MagicMock()
+    ora_mock.create_pool.return_value.acquire.return_value = con
+    sys.modules["cx_Oracle"] = ora_mock
+
+    ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+    df = ds.get_dataframe({"a": 0})
+
+    pd.testing.assert_frame_equal(df, data)
+
+    tuned = mllp_ds._TunedConnection(mock.Mock(), 1000, 1001)
+    cursor = tuned.cursor()
+    assert cursor.arraysize == 1000
+    assert cursor.prefetchrows == 1001
+
+    del sys.modules["cx_Oracle"]
+
+
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracledatasource_fetch_arrow(user_pw, oracledatasource_cfg_and_data):
+    """With fetch: arrow, the driver's arrow-based fetch methods should be used."""
+    pa = pytest.importorskip("pyarrow")
+    cfg, dbms_cfg, data = oracledatasource_cfg_and_data()
+    cfg["fetch"] = "arrow"
+    cfg["arraysize"] = 1000
+    dbms_cfg["driver"] = "oracledb"
+    table = pa.Table.from_pandas(data)
+    ora_mock = mock.MagicMock()
+    connection = ora_mock.create_pool.return_value.acquire.return_value
+    connection.fetch_df_all.return_value = table
+    connection.fetch_df_batches.return_value = table.to_batches(2)
+    sys.modules["oracledb"] = ora_mock
+
+    ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+    pd.testing.assert_frame_equal(ds.get_dataframe({"id": 1}), data)
+    connection.fetch_df_all.assert_called_once_with(
+        cfg["query"], {"id": 1}, arraysize=1000
+    )
+
+    chunks = list(ds.get_dataframe(chunksize=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), data)
+    connection.fetch_df_batches.assert_called_once_with(
+        cfg["query"], {}, size=2
+    )
+
+    # cx_Oracle connections can't fetch arrow data
+    mllp_ds._engines.clear()
+    del dbms_cfg["driver"]
+    sys.modules["cx_Oracle"] = ora_mock
+    ora_mock.Connection = mock.Mock(spec=["cursor", "close"])
+    with pytest.raises(ValueError, match="oracledb"):
+        mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+    with pytest.raises(ValueError, match="fetch"):
+        mllp_ds.OracleDataSource("bla", {**cfg, "fetch": "numpy"}, dbms_cfg)
+
+    del sys.modules["oracledb"]
+    del sys.modules["cx_Oracle"]
+
+
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracle_connection_shared(user_pw, oracledatasource_cfg_and_data):
+    """Oracle datasources and datasinks of the same dbms should share a
+    session pool, which is closed on shutdown."""
+    cfg, dbms_cfg, _ = oracledatasource_cfg_and_data()
+    dbms_cfg["pool_size"] = 3
+    ora_mock = mock.MagicMock()
+    sys.modules["cx_Oracle"] = ora_mock
+    pool = ora_mock.create_pool.return_value
+
+    ds = mllp_ds.OracleDataSource("bla", cfg, dbms_cfg)
+    sink = mllp_ds.OracleDataSink("blu", cfg, {**dbms_cfg})
+    del ds
+
+    assert sink.pool.engine is pool
+    ora_mock.create_pool.assert_called_once()
+    assert ora_mock.create_pool.call_args[1]["max"] == 3
+    pool.close.assert_not_called()
+
+    sink.pool.acquire()
+    stats = mllp_ds.get_connection_pool_stats()["my_connection"]
+    assert stats["checkouts"] == 1
+    assert stats["checkout_seconds_total"] >= 0
+
+    mllp_ds._close_shared_engines()
+    pool.close.assert_called_once_with(force=True)
+    assert mllp_ds.get_connection_pool_stats() == {}
+
+    del sys.modules["cx_Oracle"]
+
+
 @mock.patch("pandas.DataFrame.to_sql")
 @mock.patch(
     "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
@@ -372,12 +712,40 @@ def test_oracledatasink_df(user_pw, df_write, oracledatasource_cfg_and_data):
     ds = mllp_ds.OracleDataSink("bla", cfg, dbms_cfg)
     ds.put_dataframe(data)
 
-    ora_mock.connect.assert_called_once()
+    ora_mock.create_pool.assert_called_once()
     df_write.assert_called_once()
 
     del sys.modules["cx_Oracle"]
 
 
+@mock.patch("pandas.DataFrame.to_sql")
+@mock.patch(
+    "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
+)
+def test_oracledatasink_df_chunks(
+    user_pw, df_write, oracledatasource_cfg_and_data
+):
+    cfg, dbms_cfg, data = oracledatasource_cfg_and_data()
+    del cfg["query"]
+    cfg["table"] = "blabla"
+    ora_mock = mock.MagicMock()
+    sys.modules["cx_Oracle"] = ora_mock
+
+    ds = mllp_ds.OracleDataSink("bla", cfg, dbms_cfg)
+    ds.put_dataframe((data for _ in range(3)), chunksize=7)
+
+    assert df_write.call_count == 3
+    for call, if_exists in zip(
+        df_write.call_args_list, ["fail", "append", "append"]
+    ):
+        assert call[1]["chunksize"] == 7
+        assert call[1]["if_exists"] == if_exists
+        assert call[1]["con"] is ds.pool.engine.acquire.return_value
+    ds.pool.engine.release.assert_called_once()
+
+    del sys.modules["cx_Oracle"]
+
+
 @mock.patch(
     "{}.get_user_pw".format(mllp_ds.__name__), return_value=("foo", "bar")
 )
@@ -391,8 +759,6 @@ def test_oracledatasink_notimplemented(user_pw, oracledatasource_cfg_and_data):
     ds = mllp_ds.OracleDataSink("bla", cfg, dbms_cfg)
     with pytest.raises(NotImplementedError):
         ds.put_dataframe(data, params={"a": "hallo"})
-    with pytest.raises(NotImplementedError):
-        ds.put_dataframe(data, chunksize=7)
     with pytest.raises(NotImplementedError, match="put_dataframe"):
         ds.put_raw(data)
 
@@ -511,6 +877,65 @@ def test_sqldatasource_df_chunksize(pd_read, sqldatasource_cfg_and_data):
     del sys.modules["sqlalchemy"]
 
 
+@pytest.mark.parametrize(
+    "partition, expected",
+    [
+        (
+            {"column": "id", "lower": 0, "upper": 10, "num_partitions": 3},
+            [
+                ("id < :mllp_upper OR id IS NULL", {"mllp_upper": 3}),
+                (
+                    "id >= :mllp_lower AND id < :mllp_upper",
+                    {"mllp_lower": 3, "mllp_upper": 7},
+                ),
+                ("id >= :mllp_lower", {"mllp_lower": 7}),
+            ],
+        ),
+        (
+            {"column": "x", "lower": 0.0, "upper": 1.0, "num_partitions": 2},
+            [
+                ("x < :mllp_upper OR x IS NULL", {"mllp_upper": 0.5}),
+                ("x >= :mllp_lower", {"mllp_lower": 0.5}),
+            ],
+        ),
+        (
+            {"column": "x", "lower": 0, "upper": 1, "num_partitions": 1},
+            [("1 = 1", {})],
+        ),
+    ],
+)
+def test__get_partition_predicates(partition, expected):
+    assert mllp_ds._get_partition_predicates(partition) == expected
+
+
+@pytest.mark.parametrize(
+    "partition, match",
+    [
+        ({"column": "id", "lower": 0, "upper": 10}, "num_partitions"),
+        (
+            {"column": "id", "lower": 0, "upper": 10, "num_partitions": 0},
+            "positive",
+        ),
+        (
+            {"column": "id", "lower": 10, "upper": 0, "num_partitions": 2},
+            "less than",
+        ),
+    ],
+)
+def test_sqldatasource_partition_config(
+    partition, match, sqldatasource_cfg_and_data
+):
+    cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
+    cfg["partition"] = partition
+    sqla_mock = mock.MagicMock()
+    sys.modules["sqlalchemy"] = sqla_mock
+
+    with pytest.raises(ValueError, match=match):
+        mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+
+    del sys.modules["sqlalchemy"]
+
+
 def test_sqldatasource_notimplemented(sqldatasource_cfg_and_data):
     cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
     sqla_mock = mock.MagicMock()
@@ -552,6 +977,27 @@ def test_sqldatasource_double_url(sqldatasource_cfg_and_data):
     del sys.modules["sqlalchemy"]
 
 
+def test_sql_engine_shared(sqldatasource_cfg_and_data):
+    """Datasources and datasinks of the same dbms should share one engine."""
+    cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
+    sqla_mock = mock.MagicMock()
+    sqla_mock.create_engine.side_effect = lambda *a, **kw: mock.Mock()
+    sys.modules["sqlalchemy"] = sqla_mock
+
+    ds1 = mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    ds2 = mllp_ds.SqlDataSource("blu", {**cfg, "query": "other"}, dbms_cfg)
+    del cfg["query"]
+    cfg["table"] = "blabla"
+    sink = mllp_ds.SqlDataSink("bli", cfg, {**dbms_cfg})
+    other = mllp_ds.SqlDataSource("blo", cfg, {**dbms_cfg, "port": 1})
+
+    assert ds1.engine is ds2.engine is sink.engine
+    assert other.engine is not ds1.engine
+    assert sqla_mock.create_engine.call_count == 2
+
+    del sys.modules["sqlalchemy"]
+
+
 @mock.patch("pandas.DataFrame.to_sql")
 def test_sqldatasink_df(df_write, sqldatasource_cfg_and_data):
     cfg, dbms_cfg, data = sqldatasource_cfg_and_data()
@@ -570,6 +1016,138 @@ def test_sqldatasink_df(df_write, sqldatasource_cfg_and_data):
     del sys.modules["sqlalchemy"]
 
 
+@pytest.mark.parametrize("method", [None, "multi"])
+@pytest.mark.parametrize("as_generator", [False, True])
+def test_sqldatasink_df_chunks_sqlite(
+    method, as_generator, tmp_path, sqldatasource_cfg_and_data
+):
+    """Chunked writing of dataframes and generators to a real SQLite db"""
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    cfg, dbms_cfg, _ = sqldatasource_cfg_and_data()
+    del cfg["query"]
+    cfg["table"] = "my_table"
+    cfg["options"] = {"if_exists": "replace"}
+    if method:
+        cfg["options"]["method"] = method
+    dbms_cfg = {
+        "type": "sql",
+        "connection_string": "sqlite:///{}".format(tmp_path / "test.db"),
+    }
+    data = pd.DataFrame({"a": range(100), "b": [0.5, np.nan] * 50})
+
+    ds = mllp_ds.SqlDataSink("bla", cfg, dbms_cfg)
+    if as_generator:
+        ds.put_dataframe(df for _, df in data.groupby(data.index // 30))
+    else:
+        ds.put_dataframe(data, chunksize=30)
+
+    engine = sqlalchemy.create_engine(dbms_cfg["connection_string"])
+    result = pd.read_sql("SELECT * FROM my_table", con=engine)
+    pd.testing.assert_frame_equal(result, data)
+
+
+@pytest.mark.parametrize("chunksize", [None, 7])
+def test_sqldatasource_partitioned_sqlite(
+    chunksize, tmp_path, sqldatasource_cfg_and_data
+):
+    """Partitioned reads should return all rows in order of partitions."""
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    cfg, _, _ = sqldatasource_cfg_and_data()
+    cfg["query"] = "SELECT * FROM my_table WHERE b != :skip_b"
+    cfg["partition"] = {
+        "column": "id",
+        "lower": 10,
+        "upper": 90,
+        "num_partitions": 4,
+    }
+    dbms_cfg = {
+        "type": "sql",
+        "connection_string": "sqlite:///{}".format(tmp_path / "test.db"),
+    }
+    data = pd.DataFrame(
+        {"id": [np.nan] + list(range(100)) + [150.0], "b": range(102)}
+    )
+    engine = sqlalchemy.create_engine(dbms_cfg["connection_string"])
+    data.sample(frac=1, random_state=1).to_sql(
+        "my_table", con=engine, index=False
+    )
+
+    ds = mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    with mock.patch("pandas.read_sql", wraps=pd.read_sql) as read_sql:
+        result = ds.get_dataframe({"skip_b": 50}, chunksize=chunksize)
+        if chunksize:
+            chunks = list(result)
+            assert max(len(c) for c in chunks) == chunksize
+            result = pd.concat(chunks, ignore_index=True)
+    # With chunksize, partitions are not read as a whole
+    assert read_sql.call_count == 4
+    for call in read_sql.call_args_list:
+        assert call[1]["chunksize"] == chunksize
+
+    assert len(result) == 101
+    pd.testing.assert_frame_equal(
+        result.sort_values("b", ignore_index=True),
+        data[data["b"] != 50].reset_index(drop=True),
+    )
+    # Partitions are concatenated in order
+    assert (result["id"].iloc[:10].fillna(0) < 30).all()
+    assert (result["id"].iloc[-10:] >= 70).all()
+
+
+def test_connection_pool_settings_and_stats(
+    tmp_path, sqldatasource_cfg_and_data
+):
+    """Pool settings should be used, and checkouts and connects be counted,
+    also after the engine's pool has been replaced."""
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    cfg, _, _ = sqldatasource_cfg_and_data()
+    cfg["query"] = "SELECT 1 AS a"
+    dbms_cfg = {
+        "type": "sql",
+        "connection_string": "sqlite:///{}".format(tmp_path / "test.db"),
+        # SQLAlchemy<2 defaults to NullPool (no pool_size) for SQLite files
+        "poolclass": sqlalchemy.pool.QueuePool,
+        "pool_size": 3,
+        "pool_pre_ping": True,
+    }
+
+    ds = mllp_ds.SqlDataSource("bla", cfg, dbms_cfg)
+    ds.get_dataframe()
+    ds.get_dataframe()
+
+    assert ds.engine.pool.size() == 3
+    stats = mllp_ds.get_connection_pool_stats()["my_connection"]
+    assert stats["checkouts"] >= 2  # pandas may check out more than once
+    assert stats["connects"] == 1
+    assert 0 < stats["connect_seconds_max"] <= stats["connect_seconds_total"]
+    assert "Pool size: 3" in stats["pool_status"]
+
+    ds.engine.dispose()
+    ds.get_dataframe()
+    stats = mllp_ds.get_connection_pool_stats()["my_connection"]
+    assert stats["connects"] == 2
+
+
+def test_postgres_copy_insert():
+    table = mock.Mock()
+    table.name = "my_table"
+    table.schema = "my_schema"
+    conn = mock.MagicMock()
+    cursor = conn.connection.cursor.return_value.__enter__.return_value
+
+    mllp_ds._postgres_copy_insert(
+        table, conn, ["a", "b"], iter([(1, "x"), (2, None), (3, "")])
+    )
+
+    sql, buffer = cursor.copy_expert.call_args[0]
+    assert sql == (
+        'COPY "my_schema"."my_table" ("a", "b") '
+        "FROM STDIN WITH (FORMAT CSV, NULL '\\N')"
+    )
+    # Empty strings stay distinguishable from NULLs
+    assert buffer.read() == "1,x\r\n2,\\N\r\n3,\r\n"
+
+
 def test_sqldatasink_notimplemented(sqldatasource_cfg_and_data):
     cfg, dbms_cfg, data = sqldatasource_cfg_and_data()
     del cfg["query"]
@@ -580,8 +1158,6 @@ def test_sqldatasink_notimplemented(sqldatasource_cfg_and_data):
     ds = mllp_ds.SqlDataSink("bla", cfg, dbms_cfg)
     with pytest.raises(NotImplementedError):
         ds.put_dataframe(data, params={"a": "hallo"})
-    with pytest.raises(NotImplementedError):
-        ds.put_dataframe(data, chunksize=7)
     with pytest.raises(NotImplementedError, match="put_dataframe"):
         ds.put_raw(data)
 
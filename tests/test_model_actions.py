@@ -2,9 +2,12 @@
 
 # Stdlib imports
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 # Third-party imports
+import pandas as pd
 import pytest
 
 # Project imports
@@ -225,6 +228,92 @@ def test_predict_live_code(gm, ms, imp, config):
     gm.return_value[0].predict.assert_not_called()
 
 
+@pytest.mark.parametrize(
+    "prediction, expected",
+    [
+        ("it worked", {"prediction": ["it worked"] * 7}),
+        ({"a": 1}, {"a": [1] * 7}),
+    ],
+)
+@mock.patch("{}._get_model".format(ma.__name__), autospec=True)
+def test_batch_predict(gm, prediction, expected, config, tmp_path):
+    model_wrapper = MockModelClass()
+    model_wrapper.predict = mock.Mock(return_value=prediction)
+    gm.return_value = (model_wrapper, {})
+    in_path = str(tmp_path / "in.csv")
+    out_path = str(tmp_path / "out.csv")
+    pd.DataFrame({"x": range(7)}).to_csv(in_path, index=False)
+    config["datasources"] = {
+        "in": {"type": "csv", "path": in_path, "expires": 0, "tags": []}
+    }
+    config["datasinks"] = {"out": {"type": "csv", "path": out_path}}
+    # Datasources which are not used for prediction are not created
+    config["datasources"]["unused"] = {
+        "type": "will_not_be_found",
+        "tags": ["train"],
+    }
+
+    stats = ma.batch_predict(config, "in", "out", chunksize=3)
+    ma.clear_caches()
+
+    assert stats["rows"] == 7
+    assert stats["chunks"] == 3
+    assert "rows_per_second" in stats
+    assert model_wrapper.predict.call_count == 7
+    assert model_wrapper.predict.call_args_list[4][0][-1] == {"x": 4}
+    pd.testing.assert_frame_equal(
+        pd.read_csv(out_path), pd.DataFrame(expected)
+    )
+
+    with pytest.raises(ValueError, match="not configured"):
+        ma.batch_predict(config, "in", "nonexistent")
+
+
+def test_batch_predict_workers(config, tmp_path):
+    """Should predict chunks in worker processes, keeping the input order."""
+    config["model_store"]["location"] = str(tmp_path / "model_store")
+    ma.resource.ModelStore(config).dump_trained_model(
+        config, MockModelClass(), {}
+    )
+    in_path = str(tmp_path / "in.csv")
+    out_path = str(tmp_path / "out.csv")
+    pd.DataFrame({"x": range(7)}).to_csv(in_path, index=False)
+    config["datasources"] = {
+        "in": {"type": "csv", "path": in_path, "expires": 0, "tags": []}
+    }
+    config["datasinks"] = {"out": {"type": "csv", "path": out_path}}
+
+    stats = ma.batch_predict(config, "in", "out", chunksize=2, workers=2)
+    ma.clear_caches()
+
+    assert stats["rows"] == 7
+    assert stats["chunks"] == 4
+    pd.testing.assert_frame_equal(
+        pd.read_csv(out_path),
+        pd.DataFrame({"prediction": ["it worked"] * 7}),
+    )
+
+
+def test__map_in_order():
+    def slow_if_even(x):
+        if x % 2 == 0:
+            time.sleep(0.01)
+        return x * 10
+
+    consumed = []
+
+    def items():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = ma._map_in_order(executor, slow_if_even, items(), 3)
+        assert next(results) == 0
+        assert len(consumed) <= 4  # input is not consumed all at once
+        assert list(results) == [x * 10 for x in range(1, 10)]
+
+
 def test_clear_caches():
     # TODO: This is testing the implementation, should test the functionality instead
     ma._cached_model_stores = {"a": 1}
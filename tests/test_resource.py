@@ -1,8 +1,12 @@
 """Tests for `mllaunchpad.resource` module."""
 
 # Stdlib imports
+import datetime
 import json
+import mmap
 import os
+import threading
+import time
 from collections import OrderedDict
 from unittest import mock
 
@@ -56,26 +60,117 @@ def test_modelstore_create(makedirs, path_exists, modelstore_config):
 @mock.patch("{}.os.path.exists".format(r.__name__), return_value=False)
 @mock.patch("{}.os.makedirs".format(r.__name__))
 @mock.patch("{}.shutil.copy".format(r.__name__))
-@mock.patch(
-    "{}.glob.glob".format(r.__name__), return_value=["old.pkl", "old.json"]
-)
-def test_modelstore_dump(glob, copy, makedirs, path_exists, modelstore_config):
+@mock.patch("{}.glob.glob".format(r.__name__))
+@mock.patch("{}.os.path.getsize".format(r.__name__), return_value=123)
+@mock.patch("{}.os.replace".format(r.__name__))
+def test_modelstore_dump(
+    replace, getsize, glob, copy, makedirs, path_exists, modelstore_config
+):
+    model_conf = modelstore_config["model"]
+    base_name = os.path.join(
+        modelstore_config["model_store"]["location"],
+        "{}_{}".format(model_conf["name"], model_conf["version"]),
+    )
+    glob.return_value = [base_name + ".pkl", base_name + ".json"]
     with mock.patch(
         "{}.open".format(r.__name__), mock.mock_open(), create=True
     ) as mo:
         ms = r.ModelStore(modelstore_config)
         ms.dump_trained_model(modelstore_config, {"hi": 1}, {"there": 2})
 
-    model_conf = modelstore_config["model"]
-    base_name = os.path.join(
-        modelstore_config["model_store"]["location"],
-        "{}_{}".format(model_conf["name"], model_conf["version"]),
-    )
+    # Files are written as temporary files and then replaced
     calls = [
-        mock.call("{}.pkl".format(base_name), "wb"),
-        mock.call("{}.json".format(base_name), "w"),
+        mock.call("{}.pkl.{}.tmp".format(base_name, os.getpid()), "wb"),
+        mock.call("{}.json.{}.tmp".format(base_name, os.getpid()), "wb"),
     ]
     mo.assert_has_calls(calls, any_order=True)
+    calls = [
+        mock.call(
+            "{}.pkl.{}.tmp".format(base_name, os.getpid()),
+            "{}.pkl".format(base_name),
+        ),
+        mock.call(
+            "{}.json.{}.tmp".format(base_name, os.getpid()),
+            "{}.json".format(base_name),
+        ),
+    ]
+    replace.assert_has_calls(calls, any_order=True)
+    # Backups could not be linked, so they are copied
+    assert copy.call_count == 2
+
+
+def test_modelstore_backup(tmp_path):
+    ms = r.ModelStore({"model_store": {"location": str(tmp_path)}})
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    ms.dump_trained_model({"model": model_conf}, "old", {"acc": 1})
+    pkl_path = tmp_path / "my_model_1.2.3.pkl"
+    backup_dir = tmp_path / "previous"
+    ms._backup_old_model(str(tmp_path / "my_model_1.2.3"))
+    (backup_pkl_path,) = backup_dir.glob("my_model_1.2.3_*.pkl")
+    assert len(list(backup_dir.glob("my_model_1.2.3_*.json"))) == 1
+    # Backup is a hard link
+    assert pkl_path.stat().st_ino == backup_pkl_path.stat().st_ino
+
+    # The old file is replaced, not overwritten, so the backup is unchanged
+    ms.dump_trained_model({"model": model_conf}, "new", {"acc": 2})
+    assert pkl_path.stat().st_ino != backup_pkl_path.stat().st_ino
+    with backup_pkl_path.open("rb") as f:
+        assert r.pickle.load(f) == "old"
+    assert ms.load_trained_model(model_conf)[0] == "new"
+
+
+@mock.patch("{}.os.link".format(r.__name__), side_effect=OSError("no"))
+@mock.patch("{}._reflink".format(r.__name__), side_effect=OSError("no"))
+def test_modelstore_backup_copy_fallback(reflink, link, tmp_path):
+    ms = r.ModelStore({"model_store": {"location": str(tmp_path)}})
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    ms.dump_trained_model({"model": model_conf}, "old", {"acc": 1})
+    ms.dump_trained_model({"model": model_conf}, "new", {"acc": 2})
+    (backup_pkl_path,) = (tmp_path / "previous").glob("my_model_1.2.3_*.pkl")
+    with backup_pkl_path.open("rb") as f:
+        assert r.pickle.load(f) == "old"
+
+
+@pytest.mark.parametrize(
+    "retention, expected_kept",
+    [
+        ({}, ["2026-10-14", "2026-10-15", "2026-10-16"]),
+        ({"keep_backups": 2}, ["2026-10-15", "2026-10-16"]),
+        ({"keep_backup_days": 1.5}, ["2026-10-15", "2026-10-16"]),
+        ({"keep_backups": 1, "keep_backup_days": 1.5}, ["2026-10-16"]),
+    ],
+)
+def test_modelstore_backup_retention(retention, expected_kept, tmp_path):
+    backup_dir = tmp_path / "previous"
+    backup_dir.mkdir()
+    for day in ["2026-10-14", "2026-10-15"]:
+        for ext in [".pkl", ".json", ".array0.npy"]:
+            name = "my_model_1.2.3_{}_12-00-00{}".format(day, ext)
+            if ext == ".array0.npy":
+                name = "my_model_1.2.3.array0_{}_12-00-00.npy".format(day)
+            (backup_dir / name).write_bytes(b"")
+    other_model = backup_dir / "my_model_1.2.3.4_2026-10-01_12-00-00.pkl"
+    other_model.write_bytes(b"")
+    (tmp_path / "my_model_1.2.3.pkl").write_bytes(b"")
+
+    store_conf = {"location": str(tmp_path), **retention}
+    ms = r.ModelStore({"model_store": store_conf})
+    now = datetime.datetime(2026, 10, 16, 12, 0, 0)
+    with mock.patch("{}.datetime".format(r.__name__)) as datetime_mock:
+        datetime_mock.now.return_value = now
+        ms._backup_old_model(str(tmp_path / "my_model_1.2.3"))
+
+    kept = sorted(
+        {
+            path.name.split("_")[-2]
+            for path in backup_dir.iterdir()
+            if path != other_model
+        }
+    )
+    assert kept == expected_kept
+    assert other_model.exists()
+    if "2026-10-15" in kept:
+        assert len(list(backup_dir.glob("*2026-10-15*"))) == 3
 
 
 @mock.patch("{}.pickle.load".format(r.__name__), return_value="pickle")
@@ -99,6 +194,253 @@ def test_modelstore_load(json, pkl, modelstore_config):
     mo.assert_has_calls(calls, any_order=True)
 
 
+@pytest.mark.parametrize(
+    "serializer, compression",
+    [
+        ("dill", "none"),
+        ("dill", "zlib"),
+        ("dill", "bz2"),
+        ("dill", "lzma"),
+        ("dill", "lz4"),
+        ("dill", "zstd"),
+        ("joblib", "none"),
+        ("joblib", "zlib"),
+    ],
+)
+def test_modelstore_serialization(serializer, compression, tmp_path):
+    if serializer == "joblib":
+        pytest.importorskip("joblib")
+    if compression == "lz4":
+        pytest.importorskip("lz4")
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    store_conf = {
+        "location": str(tmp_path),
+        "serializer": serializer,
+        "compression": compression,
+    }
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    model = {
+        "big": np.arange(r.MODEL_OUT_OF_BAND_BYTES),
+        "df": pd.DataFrame({"a": np.arange(1000)}),
+        "small": [1, "a"],
+    }
+    ms = r.ModelStore({"model_store": store_conf})
+    with mock.patch("{}.MODEL_BLOCK_SIZE".format(r.__name__), 1024 * 1024):
+        ms.dump_trained_model({"model": model_conf}, model, {"acc": 1})
+
+    # Settings are taken from the metadata, not from the model store config
+    ms = r.ModelStore({"model_store": {"location": str(tmp_path)}})
+    loaded, meta = ms.load_trained_model(model_conf)
+    np.testing.assert_array_equal(loaded["big"], model["big"])
+    pd.testing.assert_frame_equal(loaded["df"], model["df"])
+    assert loaded["small"] == model["small"]
+    serialization = meta["serialization"]
+    assert serialization["serializer"] == serializer
+    assert serialization["compression"] == compression
+    assert serialization["size_bytes"] == os.path.getsize(
+        str(tmp_path / "my_model_1.2.3.pkl")
+    )
+    assert serialization["dump_seconds"] >= 0
+    assert serialization["load_seconds"] >= 0
+    if serializer == "dill" and compression != "none":
+        if r._OUT_OF_BAND_PICKLING:
+            # 1 pickle stream, 1 array out of band, split into blocks
+            assert len(serialization["frames"]) == 2
+            assert len(serialization["frames"][1]["blocks"]) == 8
+        else:
+            assert len(serialization["frames"]) == 1
+
+
+def test_modelstore_compression_without_out_of_band(tmp_path):
+    """Should store compressed models using pickle protocol 4 before
+    Python 3.8, without out-of-band arrays."""
+    store_conf = {"location": str(tmp_path), "compression": "zlib"}
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    model = {"big": np.arange(r.MODEL_OUT_OF_BAND_BYTES), "small": [1]}
+    ms = r.ModelStore({"model_store": store_conf})
+    with mock.patch.object(r, "_OUT_OF_BAND_PICKLING", False):
+        ms.dump_trained_model({"model": model_conf}, model, {})
+        loaded, meta = ms.load_trained_model(model_conf)
+    np.testing.assert_array_equal(loaded["big"], model["big"])
+    assert len(meta["serialization"]["frames"]) == 1
+
+    if r._OUT_OF_BAND_PICKLING:
+        # Models with out-of-band arrays can't be loaded before Python 3.8
+        ms.dump_trained_model({"model": model_conf}, model, {})
+        with mock.patch.object(r, "_OUT_OF_BAND_PICKLING", False):
+            with pytest.raises(ValueError, match="Python 3.8"):
+                ms.load_trained_model(model_conf)
+
+
+def test_modelstore_mmap_arrays(tmp_path):
+    store_conf = {"location": str(tmp_path), "mmap_arrays": True}
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    big = np.arange(r.MODEL_OUT_OF_BAND_BYTES)
+    model = {
+        "big": big,
+        "same_big": big,
+        "df": pd.DataFrame({"a": big.astype(float)}),
+        "small": np.arange(3),
+    }
+    ms = r.ModelStore({"model_store": store_conf})
+    (tmp_path / "my_model_1.2.3.array5.npy").write_bytes(b"left over")
+    (tmp_path / "my_model_1.2.3.1.array0.npy").write_bytes(b"other model")
+    ms.dump_trained_model({"model": model_conf}, model, {"acc": 1})
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "my_model_1.2.3.1.array0.npy",
+        "my_model_1.2.3.array0.npy",
+        "my_model_1.2.3.array1.npy",
+        "my_model_1.2.3.json",
+        "my_model_1.2.3.pkl",
+        "previous",
+    ]
+
+    loaded, meta = ms.load_trained_model(model_conf)
+    assert isinstance(loaded["big"], np.memmap)
+    assert not loaded["big"].flags.writeable
+    assert loaded["same_big"] is loaded["big"]
+    np.testing.assert_array_equal(loaded["big"], big)
+    pd.testing.assert_frame_equal(loaded["df"], model["df"])
+    assert not isinstance(loaded["small"], np.memmap)
+    assert meta["serialization"]["mapped_bytes"] == 2 * big.nbytes
+
+
+def test_modelstore_mmap_arrays_backup(tmp_path):
+    """Backups of models with memory-mapped arrays should load their own
+    arrays, and only the model's own files should be backed up.
+    """
+    store_conf = {
+        "location": str(tmp_path),
+        "mmap_arrays": True,
+        "registry": True,
+    }
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    ms = r.ModelStore({"model_store": store_conf})
+    size = r.MODEL_OUT_OF_BAND_BYTES
+    ms.dump_trained_model({"model": model_conf}, np.zeros(size), {})
+    for name in ["my_model_1.2.3.1.json", "my_model_1.2.3.pkl.1.tmp"]:
+        (tmp_path / name).write_text("{}")
+    with mock.patch("{}.datetime".format(r.__name__)) as datetime_mock:
+        datetime_mock.now.return_value = datetime.datetime(2026, 10, 16, 12)
+        ms.dump_trained_model({"model": model_conf}, np.ones(size), {})
+
+    assert sorted(os.listdir(str(tmp_path / "previous"))) == [
+        "my_model_1.2.3.array0_2026-10-16_12-00-00.npy",
+        "my_model_1.2.3_2026-10-16_12-00-00.json",
+        "my_model_1.2.3_2026-10-16_12-00-00.pkl",
+    ]
+    (backup,) = [
+        m for m in ms.find_models(include_backups=True) if m["backup"]
+    ]
+    assert backup["metadata_file"] == (
+        "previous/my_model_1.2.3_2026-10-16_12-00-00.json"
+    )
+    model, meta = ms.load_trained_model(model_conf, backup["backup"])
+    np.testing.assert_array_equal(model, np.zeros(size))
+    assert meta["serialization"]["array_files"] == [
+        "previous/my_model_1.2.3.array0_2026-10-16_12-00-00.npy"
+    ]
+    np.testing.assert_array_equal(
+        ms.load_trained_model(model_conf)[0], np.ones(size)
+    )
+
+
+@pytest.mark.parametrize("mmap_arrays", [False, True])
+def test_modelstore_content_addressed(mmap_arrays, tmp_path):
+    store_conf = {
+        "location": str(tmp_path),
+        "content_addressed": True,
+        "mmap_arrays": mmap_arrays,
+        "keep_backups": 1,
+    }
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    size = r.MODEL_OUT_OF_BAND_BYTES
+    unchanged = np.arange(size)
+    model1 = {"unchanged": unchanged, "changed": np.zeros(size)}
+    model2 = {"unchanged": unchanged.copy(), "changed": np.ones(size)}
+    ms = r.ModelStore({"model_store": store_conf})
+
+    ms.dump_trained_model({"model": model_conf}, model1, {"acc": 1})
+    blobs = list((tmp_path / "blobs").glob("*/*.npy"))
+    assert len(blobs) == 2
+    ms.dump_trained_model({"model": model_conf}, model2, {"acc": 2})
+    # Only the changed array was written, the backup references the old one
+    assert len(list((tmp_path / "blobs").glob("*/*.npy"))) == 3
+    loaded, meta = ms.load_trained_model(model_conf)
+    assert meta["serialization"]["new_bytes"] == model2["changed"].nbytes
+    np.testing.assert_array_equal(loaded["unchanged"], unchanged)
+    np.testing.assert_array_equal(loaded["changed"], model2["changed"])
+    assert isinstance(loaded["changed"], np.memmap) == mmap_arrays
+    assert meta["serialization"]["mapped_bytes"] == (
+        2 * unchanged.nbytes if mmap_arrays else 0
+    )
+
+    # Once no backup uses the old array any more, it can be removed
+    ms.dump_trained_model({"model": model_conf}, model2, {"acc": 2})
+    assert len(list((tmp_path / "blobs").glob("*/*.npy"))) == 3
+    removed_bytes = ms.remove_unused_blobs(min_age_seconds=0)
+    assert removed_bytes > model1["changed"].nbytes  # plus .npy header
+    assert len(list((tmp_path / "blobs").glob("*/*.npy"))) == 2
+    loaded, _ = ms.load_trained_model(model_conf)
+    np.testing.assert_array_equal(loaded["changed"], model2["changed"])
+
+
+def test_hash_array():
+    a = np.arange(12).reshape(3, 4)
+    assert r._hash_array(a) == r._hash_array(a.copy())
+    assert r._hash_array(a) != r._hash_array(a.reshape(4, 3))
+    assert r._hash_array(a) != r._hash_array(a.astype(np.int32))
+    assert r._hash_array(np.asfortranarray(a)) != r._hash_array(a)
+    dates = np.array(["2026-10-16"], dtype="datetime64[ns]")
+    assert r._hash_array(dates) == r._hash_array(dates.copy())
+
+
+@pytest.mark.parametrize(
+    "store_conf, match",
+    [
+        ({"serializer": "pickle"}, "serializer must be"),
+        ({"compression": "snappy"}, "compression must be"),
+        ({"mmap_arrays": True, "compression": "zlib"}, "mmap_arrays"),
+    ],
+)
+def test_modelstore_serialization_config(store_conf, match, tmp_path):
+    store_conf["location"] = str(tmp_path)
+    with pytest.raises(ValueError, match=match):
+        r.ModelStore({"model_store": store_conf})
+
+
+def test_modelstore_dump_metadata_nan(tmp_path):
+    """Should keep NaN metrics in the metadata, also if orjson is installed."""
+    base_name = str(tmp_path / "my_model_1.2.3")
+    r.ModelStore._dump_metadata(
+        base_name, {"metrics": {"a": float("nan"), "b": np.float32(0.5)}}
+    )
+    with open(base_name + ".json") as f:
+        metrics = json.load(f)["metrics"]
+    assert np.isnan(metrics["a"])
+    assert metrics["b"] == 0.5
+
+
+def test_modelstore_get_model_mtime(tmp_path):
+    ms = r.ModelStore({"model_store": {"location": str(tmp_path)}})
+    model_conf = {"name": "my_model", "version": "1.2.3"}
+    assert ms.get_model_mtime(model_conf) is None
+
+    ms.dump_trained_model({"model": model_conf}, {"a": 1}, {"acc": 0.5})
+    pkl_path = tmp_path / "my_model_1.2.3.pkl"
+    os.utime(pkl_path, (1234, 1234))
+    assert ms.get_model_mtime(model_conf) == 1234
+
+    # Only updating the metrics is not a new model
+    ms.update_model_metrics(model_conf, {"acc": 0.6})
+    assert ms.get_model_mtime(model_conf) == 1234
+
+    # The pickle has been replaced, but the metadata not yet
+    os.utime(tmp_path / "my_model_1.2.3.json", (1233, 1233))
+    assert ms.get_model_mtime(model_conf) is None
+
+
 @mock.patch(
     "{}.ModelStore._load_metadata".format(r.__name__),
     return_value={"metrics": {"a": 0}, "metrics_history": {"0123": {"a": 0}}},
@@ -118,6 +460,79 @@ def test_modelstore_update_model_metrics(dump, load, modelstore_config):
     assert hist.popitem()[1] == new_metrics
 
 
+def test_modelstore_registry(tmp_path):
+    store_conf = {"location": str(tmp_path), "registry": True}
+    ms = r.ModelStore({"model_store": {**store_conf, "keep_backups": 1}})
+    conf_a = {"model": {"name": "a", "version": "1"}, "api": {"name": "x"}}
+    conf_b = {"model": {"name": "b", "version": "1"}, "api": {"name": "x"}}
+    conf_c = {"model": {"name": "c", "version": "1"}, "api": {"name": "y"}}
+    start = datetime.datetime(2026, 10, 16, 12, 0, 0)
+    minutes = iter(range(100))
+    with mock.patch("{}.datetime".format(r.__name__)) as datetime_mock:
+        datetime_mock.now.side_effect = lambda: start + datetime.timedelta(
+            minutes=next(minutes)
+        )
+        ms.dump_trained_model(conf_a, "a", {"acc": 0.8})
+        ms.dump_trained_model(conf_b, "b", {"acc": 0.9, "f": {"1": 0.5}})
+        ms.dump_trained_model(conf_c, "c", {"acc": 0.99})
+        ms.dump_trained_model(conf_a, "a", {"acc": 0.7})
+        ms.dump_trained_model(conf_a, "a", {"acc": 0.6, "note": "no"})
+
+    assert ms.get_best_model("x", "acc")["name"] == "b"
+    ms.update_model_metrics(conf_a["model"], {"acc": 0.95})
+    best = ms.get_best_model("x", "acc")
+    assert best["name"] == "a"
+    assert best["metrics"] == {"acc": 0.95}
+    assert ms.get_best_model("x", "acc", higher_is_better=False)["name"] == "b"
+    assert ms.get_best_model("x", "missing") is None
+
+    assert [m["name"] for m in ms.find_models()] == ["a", "c", "b"]
+    (b,) = ms.find_models(order_by_metric="f.1")
+    assert b["metadata_file"] == "b_1.json"
+    assert b["metrics"] == {"acc": 0.9, "f.1": 0.5}
+    assert [m["name"] for m in ms.find_models(api_name="y")] == ["c"]
+    models = ms.find_models(
+        created_until=datetime.datetime(2026, 10, 16, 12, 5)
+    )
+    assert [m["name"] for m in models] == ["b"]
+    # Only one backup is kept
+    models = ms.find_models(name="a", include_backups=True)
+    assert [m["backup"] for m in models] == [None, "2026-10-16_12-12-00"]
+    assert models[1]["metrics"] == {"acc": 0.7}
+    assert (
+        models[1]["metadata_file"] == "previous/a_1_2026-10-16_12-12-00.json"
+    )
+
+    # Existing models are indexed when creating the registry
+    all_models = ms.find_models(include_backups=True)
+    (tmp_path / "registry.sqlite").unlink()
+    ms = r.ModelStore({"model_store": store_conf})
+    assert ms.find_models(include_backups=True) == all_models
+
+
+def test_modelstore_registry_non_finite_metrics(tmp_path):
+    store_conf = {"location": str(tmp_path), "registry": True}
+    ms = r.ModelStore({"model_store": store_conf})
+    conf = {"model": {"name": "a", "version": "1"}, "api": {"name": "x"}}
+    ms.dump_trained_model(
+        conf, "a", {"acc": float("nan"), "f": {"1": np.inf}, "loss": 0.1}
+    )
+    (model,) = ms.find_models()
+    assert model["metrics"] == {"loss": 0.1}
+    assert ms.get_best_model("x", "acc") is None
+
+    # Also when indexing existing models
+    (tmp_path / "registry.sqlite").unlink()
+    ms = r.ModelStore({"model_store": store_conf})
+    assert ms.find_models() == [model]
+
+
+def test_modelstore_registry_disabled(tmp_path):
+    ms = r.ModelStore({"model_store": {"location": str(tmp_path)}})
+    with pytest.raises(ValueError, match="registry"):
+        ms.get_best_model("x", "acc")
+
+
 def test___get_all_classes():
     """Retrieve a type which subclasses the given type"""
     config = {"plugins": ["tests.mock_plugin"]}
@@ -155,6 +570,38 @@ def test_create_data_sources_and_sinks():
         r.create_data_sources_and_sinks(conf)
 
 
+def test_create_data_sources_and_sinks_shared():
+    """Identically configured DataSources/Sinks should be shared if asked to."""
+    ds_conf = {"type": "food", "path": "some/path", "tags": "predict"}
+    conf1 = {
+        "plugins": ["tests.mock_plugin"],
+        "datasources": {"bla": ds_conf},
+        "datasinks": {"foo": {**ds_conf}},
+    }
+    conf2 = {
+        "plugins": ["tests.mock_plugin"],
+        "datasources": {"blu": {**ds_conf}, "bli": {**ds_conf, "path": "x"}},
+        "datasinks": {"foo": {**ds_conf}},
+    }
+    src1, snk1 = r.create_data_sources_and_sinks(conf1, shared=True)
+    src2, snk2 = r.create_data_sources_and_sinks(conf2, shared=True)
+    assert src2["blu"] is src1["bla"]
+    assert src2["bli"] is not src1["bla"]
+    assert snk2["foo"] is snk1["foo"]
+    assert snk1["foo"] is not src1["bla"]
+
+    src3, _ = r.create_data_sources_and_sinks(conf1)
+    assert src3["bla"] is not src1["bla"]
+
+    # Same configuration, but served by another plugin class
+    other_cls = type("OtherFoodSource", (type(src1["bla"]),), {})
+    with mock.patch.object(
+        r, "_get_all_classes", return_value={"food": other_cls}
+    ):
+        src4, _ = r.create_data_sources_and_sinks(conf1, shared=True)
+    assert type(src4["bla"]) is other_cls
+
+
 # Test DataSource caching
 
 # fmt: off
@@ -268,9 +715,9 @@ def test_datasource_memoization_df(datasource_expires_config):
     # 4rth DF read (original params passed again -- it is still in the cache due to size of 2)
     df4 = ds.get_dataframe(params=args1.copy())
     pd.testing.assert_frame_equal(df4, pd.DataFrame(args1))
-    assert df4 is df1  # from cache
+    assert df4 is df1  # from cache, now most recently used
 
-    # 5th DF read (yet unseen params passed -- will be cached, replacing args1)
+    # 5th DF read (yet unseen params passed -- will be cached, replacing the least recently used args3)
     df5 = ds.get_dataframe(params=args4_again_different.copy())
     pd.testing.assert_frame_equal(df5, pd.DataFrame(args4_again_different))
     assert df5 is not df4  # not from cache
@@ -278,14 +725,301 @@ def test_datasource_memoization_df(datasource_expires_config):
     assert df5 is not df2  # not from cache
     assert df5 is not df1  # not from cache
 
-    # 6th DF read (original params passed -- not in cache any more due to cache size limit of 2)
+    # 6th DF read (original params passed -- still in cache as it has been used recently)
     df6 = ds.get_dataframe(params=args1.copy())
     pd.testing.assert_frame_equal(df6, pd.DataFrame(args1))
-    assert df6 is not df5  # not from cache
-    assert df6 is not df4  # not from cache
-    assert df6 is not df3  # not from cache
-    assert df6 is not df2  # not from cache
-    assert df6 is not df1  # not from cache
+    assert df6 is df1  # from cache
+
+    # 7th DF read (args3 params passed -- not in cache any more due to cache size limit of 2)
+    df7 = ds.get_dataframe(params=args3_different.copy())
+    pd.testing.assert_frame_equal(df7, pd.DataFrame(args3_different))
+    assert df7 is not df3  # not from cache
+
+    assert ds.cache_stats()["hits"] == 3
+    assert ds.cache_stats()["misses"] == 4
+    assert ds.cache_stats()["evictions"] == 2
+
+
+def test_datasource_cache_max_bytes(datasource_expires_config):
+    cfg = datasource_expires_config(-1)  # use cache
+    big = {"a": list(range(1000))}
+    small = {"b": [1, 2]}
+    one_big_df_size = r._get_size_in_bytes(pd.DataFrame(big))
+    cfg["cache_max_bytes"] = one_big_df_size + 1000
+    ds = MockDataSource("mock", cfg)
+
+    df_small = ds.get_dataframe(params=small.copy())
+    df_big = ds.get_dataframe(params=big.copy())
+    assert ds.get_dataframe(params=big.copy()) is df_big
+    # Both fit into the cache
+    assert ds.cache_stats()["bytes"] <= cfg["cache_max_bytes"]
+    assert ds.get_dataframe(params=small.copy()) is df_small
+
+    # Two big dfs do not fit: the least recently used one is evicted
+    big2 = {"c": list(range(1000))}
+    df_big2 = ds.get_dataframe(params=big2.copy())
+    assert ds.get_dataframe(params=big2.copy()) is df_big2
+    assert ds.get_dataframe(params=big.copy()) is not df_big
+    assert ds.cache_stats()["evictions"] >= 1
+
+
+class SlowMockDataSource(MockDataSource):
+    serves = ["slowmock"]
+    fetches = 0
+
+    def get_dataframe(self, params=None, chunksize=None):
+        type(self).fetches += 1
+        time.sleep(0.1)
+        if params == "fail":
+            raise IOError("backend down")
+        return pd.DataFrame(params)
+
+
+def test_datasource_single_flight(datasource_expires_config):
+    """Concurrent misses of the same key result in only one fetch"""
+    ds = SlowMockDataSource("mock", datasource_expires_config(-1))
+    results = []
+
+    def get(params):
+        try:
+            results.append(ds.get_dataframe(params=params))
+        except IOError as e:
+            results.append(e)
+
+    threads = [
+        threading.Thread(target=get, args=({"a": [1, 2]},)) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert SlowMockDataSource.fetches == 1
+    assert len(results) == 8
+    assert all(df is results[0] for df in results)
+
+    # Errors are passed to all waiting callers, and nothing is cached
+    results.clear()
+    threads = [threading.Thread(target=get, args=("fail",)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert SlowMockDataSource.fetches == 2
+    assert all(isinstance(e, IOError) for e in results)
+    assert not ds._in_flight
+    ds.get_dataframe(params={"a": [1, 2]})
+    assert SlowMockDataSource.fetches == 2
+
+
+class CountingMockDataSource(MockDataSource):
+    serves = ["countingmock"]
+
+    def get_dataframe(self, params=None, chunksize=None):
+        self.fetches = getattr(self, "fetches", 0) + 1
+        return pd.DataFrame({"fetch": [self.fetches]})
+
+
+@mock.patch("{}.time".format(r.__name__))
+def test_datasource_refresh_background(time_mock, datasource_expires_config):
+    cfg = datasource_expires_config(100)
+    cfg["refresh"] = "background"
+    cfg["refresh_fraction"] = 0.5
+    ds = CountingMockDataSource("mock", cfg)
+    time_mock.return_value = 1000
+    df1 = ds.get_dataframe()
+    time_mock.return_value = 1040  # still fresh
+    assert ds.get_dataframe() is df1
+    time_mock.return_value = 1060  # past refresh fraction
+    assert ds.get_dataframe() is df1
+    for _ in range(100):  # wait for refresh thread
+        if not ds._in_flight and ds.fetches == 2:
+            break
+        time.sleep(0.01)
+    df2 = ds.get_dataframe()
+    assert df2 is not df1
+    assert df2["fetch"][0] == 2
+    time_mock.return_value = 5000  # expired: stale value is still returned
+    assert ds.get_dataframe() is df2
+
+
+def test_datasource_refresher(datasource_expires_config):
+    cfg = datasource_expires_config(1)
+    cfg["refresh"] = "background"
+    ds = CountingMockDataSource("mock", cfg)
+    df1 = ds.get_dataframe()
+    ds.start_refresher()
+    try:
+        for _ in range(300):
+            if ds.fetches >= 2 and not ds._in_flight:
+                break
+            time.sleep(0.01)
+        assert ds.fetches >= 2
+        assert ds.get_dataframe() is not df1
+    finally:
+        ds.stop_refresher()
+
+
+@pytest.mark.parametrize(
+    "expires, refresh, fraction, match",
+    [
+        (100, "sometimes", 1.0, "must be one of"),
+        (0, "background", 1.0, "requires expires"),
+        (-1, "background", 1.0, "requires expires"),
+        (100, "background", 1.5, "refresh_fraction"),
+    ],
+)
+def test_datasource_refresh_config(
+    expires, refresh, fraction, match, datasource_expires_config
+):
+    cfg = datasource_expires_config(expires)
+    cfg["refresh"] = refresh
+    cfg["refresh_fraction"] = fraction
+    with pytest.raises(ValueError, match=match):
+        MockDataSource("mock", cfg)
+    with pytest.raises(ValueError, match="refresh: background"):
+        MockDataSource(
+            "mock", datasource_expires_config(100)
+        ).start_refresher()
+
+
+class VersionedMockDataSource(CountingMockDataSource):
+    serves = ["versionedmock"]
+    version = 1
+
+    def _get_version(self, params):
+        return self.version
+
+
+@pytest.mark.parametrize("refresh", ["sync", "background"])
+def test_datasource_version(refresh, datasource_expires_config):
+    cfg = datasource_expires_config(100)
+    cfg["refresh"] = refresh
+    ds = VersionedMockDataSource("mock", cfg)
+    df1 = ds.get_dataframe()
+    assert ds.get_dataframe() is df1
+    ds.version = 2  # source has changed: reload immediately
+    df2 = ds.get_dataframe()
+    assert df2 is not df1
+    assert df2["fetch"][0] == 2
+    assert ds.get_dataframe() is df2
+
+
+def test_datasource_validate_config(datasource_expires_config):
+    cfg = datasource_expires_config(0)
+    cfg["validate"] = "mtime"
+    with pytest.raises(ValueError, match="validate requires expires"):
+        MockDataSource("mock", cfg)
+
+
+class BytesMockDataSource(MockDataSource):
+    serves = ["bytesmock"]
+
+    def get_raw(self, params=None, chunksize=False):
+        return params.encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "ds_class, getter, params",
+    [
+        (MockDataSource, "get_dataframe", {"a": [1, 2], "b": ["x", "y"]}),
+        (MockDataSource, "get_raw", "some text"),
+        (BytesMockDataSource, "get_raw", "some bytes"),
+    ],
+)
+def test_datasource_disk_cache(
+    ds_class, getter, params, tmp_path, datasource_expires_config
+):
+    if getter == "get_dataframe":
+        pytest.importorskip("pyarrow")
+    cfg = datasource_expires_config(100)
+    cfg["cache_dir"] = str(tmp_path)
+    ds1 = ds_class("mock", cfg)
+    item1 = getattr(ds1, getter)(params=params)
+    assert len(os.listdir(str(tmp_path))) == 1
+
+    # Another process (here: instance) gets the item from disk
+    ds2 = ds_class("mock", cfg)
+    with mock.patch.object(ds2, "_to_disk_cache") as to_disk_mock:
+        item2 = getattr(ds2, getter)(params=params)
+    to_disk_mock.assert_not_called()  # was not gotten from source
+    if getter == "get_dataframe":
+        pd.testing.assert_frame_equal(item1, item2)
+    else:
+        assert item1 == item2
+        assert type(item1) is type(item2)
+
+    # Expired files and changed configurations are not used
+    in_101_secs = time.time() + 101
+    with mock.patch("{}.time".format(r.__name__), return_value=in_101_secs):
+        ds3 = ds_class("mock", cfg)
+        with mock.patch.object(ds3, "_to_disk_cache") as to_disk_mock:
+            getattr(ds3, getter)(params=params)
+        to_disk_mock.assert_called_once()
+    cfg["options"] = {"some": "option"}
+    ds4 = ds_class("mock", cfg)
+    with mock.patch.object(ds4, "_to_disk_cache") as to_disk_mock:
+        getattr(ds4, getter)(params=params)
+    to_disk_mock.assert_called_once()
+
+    # The datasource's name does not matter
+    del cfg["options"]
+    ds5 = ds_class("other_name", cfg)
+    with mock.patch.object(ds5, "_to_disk_cache") as to_disk_mock:
+        getattr(ds5, getter)(params=params)
+    to_disk_mock.assert_not_called()
+
+
+def test_cachedict_lru():
+    cd = r.CacheDict(maxsize=2)
+    cd["a"] = 1
+    cd["b"] = 2
+    assert cd.lookup("a") == 1
+    cd["c"] = 3
+    assert "b" not in cd
+    assert list(cd.keys()) == ["a", "c"]
+    assert cd.lookup("b", "missing") == "missing"
+    assert cd.lookup("c", "invalid", is_valid=lambda v: v < 3) == "invalid"
+    assert "c" not in cd
+    assert cd.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "items": 1,
+        "bytes": 0,
+    }
+
+
+def test_cachedict_maxbytes():
+    cd = r.CacheDict(maxbytes=10)
+    cd["a"] = b"12345"
+    cd["b"] = b"12345"
+    assert cd.nbytes == 10
+    cd["a"] = b"123"  # replacing an item updates its size
+    assert cd.nbytes == 8
+    cd["c"] = b"1234"
+    assert "b" not in cd
+    assert cd.nbytes == 7
+    cd["d"] = b"12345678901"  # larger than maxbytes: is not cached
+    assert "d" not in cd
+    assert list(cd) == ["a", "c"]
+    assert cd.nbytes == 7
+    assert cd.evictions == 1
+    cd["a"] = b"12345678901"  # oversized replacement drops the stale item
+    assert list(cd) == ["c"]
+    assert cd.nbytes == 4
+    cd.clear()
+    cd["e"] = b"1"
+    del cd["e"]
+    assert cd.nbytes == 0
+
+
+def test_get_size_in_bytes_mmap(tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"0123456789")
+    with open(str(path), "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    assert r._get_size_in_bytes(memoryview(mapped)) == 0
+    assert r._get_size_in_bytes(memoryview(b"0123456789")) == 10
 
 
 def test_get_user_pw(caplog):
@@ -375,6 +1109,66 @@ def test_to_plain_python_obj_error():
         json.dumps(output)
 
 
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        yield request.param
+    else:
+        with mock.patch.object(r, "_import_orjson", return_value=None):
+            yield request.param
+
+
+@pytest.mark.parametrize(
+    "test_input", mixed_examples + [e for e, _ in dataframe_examples]
+)
+def test_to_json_bytes_same_as_plain_python_obj(test_input, json_backend):
+    """Test to get the same JSON as with to_plain_python_obj."""
+    expected = json.loads(json.dumps(r.to_plain_python_obj(test_input)))
+    assert json.loads(r.to_json_bytes(test_input)) == expected
+    assert json.loads(r.to_json_bytes(test_input, indent=True)) == expected
+
+
+def test_to_json_bytes_types(json_backend):
+    test_input = {
+        "ints": [np.int8(1), np.int32(2), np.uint64(3)],
+        "floats": (np.float16(0.5), np.float64(1.5)),
+        "bools": np.array([True, False]),
+        "bool": np.bool_(True),
+        "dates": np.array(["2020-01-02", "NaT"], dtype="datetime64[D]"),
+        "date": np.datetime64("2020-01-02T03:04:05"),
+        "nat": np.datetime64("NaT"),
+        "timestamp": pd.Timestamp("2020-01-02 03:04"),
+        "df": pd.DataFrame(
+            {"t": pd.to_datetime(["2020-01-02", None]), "x": [1, 2]}
+        ),
+        "series": pd.Series([1.5, 2.5], index=["a", "b"]),
+        "matrix": np.arange(6).reshape(2, 3)[:, :2],
+    }
+    assert json.loads(r.to_json_bytes(test_input)) == {
+        "ints": [1, 2, 3],
+        "floats": [0.5, 1.5],
+        "bools": [True, False],
+        "bool": True,
+        "dates": ["2020-01-02T00:00:00", None],
+        "date": "2020-01-02T03:04:05",
+        "nat": None,
+        "timestamp": "2020-01-02T03:04:00",
+        "df": {
+            "t": {"0": "2020-01-02T00:00:00", "1": None},
+            "x": {"0": 1, "1": 2},
+        },
+        "series": {"a": 1.5, "b": 2.5},
+        "matrix": [[0, 1], [3, 4]],
+    }
+
+    class FailingObject:
+        pass
+
+    with pytest.raises(TypeError):
+        r.to_json_bytes({"a": FailingObject()})
+
+
 # Tests for order_columns
 
 
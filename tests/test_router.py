@@ -0,0 +1,127 @@
+"""Tests for `mllaunchpad.router` module."""
+
+# Stdlib imports
+import threading
+from collections import Counter
+
+# Third-party imports
+import pytest
+from flask import Flask, request
+from werkzeug.serving import make_server
+from werkzeug.test import Client
+
+# Project imports
+import mllaunchpad.router as router
+
+
+def test_consistent_hash_ring_is_consistent():
+    """The same key should always map to the same node, and keys should be spread."""
+    nodes = ["http://a", "http://b", "http://c"]
+    ring = router.ConsistentHashRing(nodes)
+    assignment = {str(k): ring.candidates(str(k))[0] for k in range(300)}
+    assert assignment == {
+        str(k): ring.candidates(str(k))[0] for k in range(300)
+    }
+    counts = Counter(assignment.values())
+    assert set(counts) == set(nodes)
+    assert min(counts.values()) > 50
+
+    # Adding a node only moves keys to the new node
+    ring2 = router.ConsistentHashRing(nodes + ["http://d"])
+    for k, node in assignment.items():
+        new_node = ring2.candidates(k)[0]
+        assert new_node in (node, "http://d")
+
+
+def test_consistent_hash_ring_bounded_load():
+    """A node should not get more than its share of the load."""
+    ring = router.ConsistentHashRing(["http://a", "http://b"], load_factor=1)
+    first = ring.acquire("same_key")
+    second = ring.acquire("same_key")
+    assert first != second  # first node is at capacity
+    ring.release(first)
+    ring.release(second)
+    assert ring.acquire("same_key") == first
+
+
+def test_consistent_hash_ring_errors():
+    with pytest.raises(ValueError, match="nodes"):
+        router.ConsistentHashRing([])
+    with pytest.raises(ValueError, match="load_factor"):
+        router.ConsistentHashRing(["http://a"], load_factor=0.5)
+
+
+@pytest.fixture()
+def api_nodes():
+    """Two local API nodes which answer with their own name."""
+    servers = []
+    for name in ["node1", "node2"]:
+        app = Flask(name)
+
+        @app.route("/api/v1/things/<thing_id>", methods=["GET", "POST"])
+        def things(thing_id, name=name):
+            return {
+                "node": name,
+                "id": thing_id,
+                "param": request.args.get("p"),
+                "body": request.get_data(as_text=True),
+            }
+
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    yield ["http://127.0.0.1:{}".format(s.server_port) for s in servers]
+    for server in servers:
+        server.shutdown()
+
+
+def test_routing_app_routes_consistently(api_nodes):
+    """Requests with the same resource id should always go to the same node."""
+    app = router.create_application({"router": {"nodes": api_nodes}})
+    client = Client(app)
+
+    nodes_per_id = {}
+    for _ in range(3):
+        for thing_id in range(20):
+            response = client.get("/api/v1/things/{}?p=x".format(thing_id))
+            assert response.status_code == 200
+            result = response.get_json()
+            assert result["id"] == str(thing_id)
+            assert result["param"] == "x"
+            nodes_per_id.setdefault(thing_id, set()).add(result["node"])
+    assert all(len(nodes) == 1 for nodes in nodes_per_id.values())
+    assert set.union(*nodes_per_id.values()) == {"node1", "node2"}
+
+    response = client.post("/api/v1/things/1", data="hello")
+    assert response.get_json()["body"] == "hello"
+    assert client.get("/not/there").status_code == 404
+
+
+def test_routing_app_routing_param(api_nodes):
+    """Requests should be routed by the configured routing parameter."""
+    app = router.RoutingApp({"nodes": api_nodes, "routing_param": "p"})
+    client = Client(app)
+    nodes = {
+        client.get("/api/v1/things/{}?p=same".format(i)).get_json()["node"]
+        for i in range(20)
+    }
+    assert len(nodes) == 1
+
+
+def test_routing_app_failover(api_nodes):
+    """Unreachable nodes should be skipped."""
+    app = router.RoutingApp(
+        {"nodes": ["http://127.0.0.1:1"] + api_nodes[:1], "timeout": 5}
+    )
+    client = Client(app)
+    for i in range(5):
+        response = client.get("/api/v1/things/{}".format(i))
+        assert response.get_json()["node"] == "node1"
+
+    app = router.RoutingApp({"nodes": ["http://127.0.0.1:1"]})
+    assert Client(app).get("/api/v1/things/1").status_code == 502
+
+
+def test_create_application_no_config():
+    with pytest.raises(ValueError, match="router"):
+        router.create_application({"model": {}})
@@ -8,7 +8,7 @@ from unittest.mock import patch
 import pytest
 
 
-@patch("mllaunchpad.config.get_validated_config")
+@patch("mllaunchpad.config.get_validated_configs")
 def test_log_error_on_config_filenotfound(mock_get_cfg, caplog):
     """Test that a FileNotFoundError on loading the config does
     not cause an exception, but only log a 'not found, will fail' error.
@@ -27,13 +27,13 @@ def test_log_error_on_config_filenotfound(mock_get_cfg, caplog):
 
 
 @patch("mllaunchpad.api.ModelApi")
-@patch("mllaunchpad.config.get_validated_config")
+@patch("mllaunchpad.config.get_validated_configs")
 def test_regression_61_misleading(mock_get_cfg, mock_get_api, caplog):
     """Test that a FileNotFoundError on loading the Model does
     cause a proper exception and not merely log a 'config not found' error.
     https://github.com/schuderer/mllaunchpad/issues/61
     """
-    mock_get_cfg.return_value = {"api": {}}
+    mock_get_cfg.return_value = [{"api": {}}]
     mock_get_api.side_effect = FileNotFoundError
 
     # This import is just to make sure the 'wsgi' symbol is known.
@@ -47,3 +47,19 @@ def test_regression_61_misleading(mock_get_cfg, mock_get_api, caplog):
         reload(wsgi)
         assert "will fail".lower() not in caplog.text.lower()
     assert mock_get_cfg.called
+
+
+@patch("mllaunchpad.api.ModelApi")
+@patch("mllaunchpad.config.get_validated_configs")
+def test_several_models(mock_get_cfgs, mock_get_api):
+    """Test that all configured models are served by the same application."""
+    cfgs = [{"api": {"name": "a"}}, {"api": {"name": "b"}}]
+    mock_get_cfgs.return_value = cfgs
+
+    import mllaunchpad.wsgi as wsgi
+
+    reload(wsgi)
+    assert [c[0][0] for c in mock_get_api.call_args_list] == cfgs
+    assert all(
+        c[0][1] is wsgi.application for c in mock_get_api.call_args_list
+    )